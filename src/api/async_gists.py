@@ -0,0 +1,227 @@
+from typing import Any, AsyncIterator, Optional
+
+from src.api.pagination import apaginate, list_params
+from src.async_http_client import AsyncHttpClient
+
+
+class AsyncGistsAPI:
+    def __init__(self, client: AsyncHttpClient, api_version: str = "2022-11-28") -> None:
+        self.client = client
+        self._headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": api_version,
+        }
+
+    async def create_gist(self, payload: dict[str, Any], expected_status: int = 201):
+        return await self.client.post(
+            url="/gists",
+            json=payload,
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def get_gist(self, gist_id: str, expected_status: int = 200):
+        return await self.client.get(
+            url=f"/gists/{gist_id}",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def update_gist(self, gist_id: str, payload: dict[str, Any], expected_status: int = 200):
+        return await self.client.patch(
+            url=f"/gists/{gist_id}",
+            json=payload,
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def delete_gist(self, gist_id: str, expected_status: int = 204):
+        return await self.client.delete(
+            url=f"/gists/{gist_id}",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def list_gists_for_authenticated_user(
+            self,
+            since: Optional[str] = None,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+    ):
+        return await self.client.get(
+            url="/gists",
+            params=list_params(since, per_page, page),
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def list_public_gists(
+            self,
+            since: Optional[str] = None,
+            per_page: int | None = None,
+            expected_status: int = 200,
+            *,
+            page: int | None = None,
+    ):
+        return await self.client.get(
+            url="/gists/public",
+            params=list_params(since, per_page, page),
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def list_starred_gists(
+            self,
+            expected_status: int = 200,
+            *,
+            since: Optional[str] = None,
+            per_page: int | None = None,
+            page: int | None = None,
+    ):
+        return await self.client.get(
+            url="/gists/starred",
+            params=list_params(since, per_page, page),
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def list_gists_for_user(
+            self,
+            username: str,
+            since: Optional[str] = None,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+    ):
+        return await self.client.get(
+            url=f"/users/{username}/gists",
+            params=list_params(since, per_page, page),
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def fork_gist(self, gist_id: str, expected_status: int = 201):
+        return await self.client.post(
+            url=f"/gists/{gist_id}/forks",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def list_gist_forks(
+            self,
+            gist_id: str,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+    ):
+        return await self.client.get(
+            url=f"/gists/{gist_id}/forks",
+            params=list_params(per_page=per_page, page=page),
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def check_starred(self, gist_id: str, expected_status: int = 204):
+        # 204 if starred, 404 if not starred
+        return await self.client.get(
+            url=f"/gists/{gist_id}/star",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def star(self, gist_id: str, expected_status: int = 204):
+        return await self.client.put(
+            url=f"/gists/{gist_id}/star",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def unstar(self, gist_id: str, expected_status: int = 204):
+        return await self.client.delete(
+            url=f"/gists/{gist_id}/star",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def list_gist_commits(
+            self,
+            gist_id: str,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+    ):
+        return await self.client.get(
+            url=f"/gists/{gist_id}/commits",
+            params=list_params(per_page=per_page, page=page),
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    async def get_gist_revision(self, gist_id: str, sha: str, expected_status: int = 200):
+        return await self.client.get(
+            url=f"/gists/{gist_id}/{sha}",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    # Paginated variants: lazily yield items across all pages by following the `Link` header.
+    # With prefetch=True page N+1 is requested in a background task while page N is consumed.
+
+    def iter_gists_for_authenticated_user(
+            self, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        return apaginate(
+            lambda: self.list_gists_for_authenticated_user(since=since, per_page=per_page),
+            self._get_page,
+            prefetch=prefetch,
+        )
+
+    def iter_public_gists(
+            self, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        return apaginate(
+            lambda: self.list_public_gists(since=since, per_page=per_page),
+            self._get_page,
+            prefetch=prefetch,
+        )
+
+    def iter_starred_gists(
+            self, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        return apaginate(
+            lambda: self.list_starred_gists(since=since, per_page=per_page),
+            self._get_page,
+            prefetch=prefetch,
+        )
+
+    def iter_gists_for_user(
+            self, username: str, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        return apaginate(
+            lambda: self.list_gists_for_user(username, since=since, per_page=per_page),
+            self._get_page,
+            prefetch=prefetch,
+        )
+
+    def iter_gist_forks(self, gist_id: str, per_page: int = 100, prefetch: bool = False) -> AsyncIterator[dict[str, Any]]:
+        return apaginate(
+            lambda: self.list_gist_forks(gist_id, per_page=per_page),
+            self._get_page,
+            prefetch=prefetch,
+        )
+
+    def iter_gist_commits(self, gist_id: str, per_page: int = 100, prefetch: bool = False) -> AsyncIterator[dict[str, Any]]:
+        return apaginate(
+            lambda: self.list_gist_commits(gist_id, per_page=per_page),
+            self._get_page,
+            prefetch=prefetch,
+        )
+
+    async def _get_page(self, url: str):
+        # `url` is the absolute next-page link and already carries per_page/since/page
+        return await self.client.get(url=url, headers=self._headers, expected_status=200)
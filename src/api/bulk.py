@@ -0,0 +1,234 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
+
+import requests
+
+from src.rate_limit import THROTTLED_STATUSES, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+DONE = "done"
+ALREADY_DONE = "already_done"
+FAILED = "failed"
+
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one item of a bulk operation."""
+
+    key: Hashable
+    outcome: str
+    status: Optional[int] = None
+    attempts: int = 1
+    response: Optional[requests.Response] = field(default=None, repr=False)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.outcome != FAILED
+
+
+@dataclass
+class BulkReport:
+    """
+    Aggregate of a bulk operation:
+    - succeeded: items applied by this run
+    - already_done: items that needed no change (e.g. a 404 on delete)
+    - retried: items that succeeded or failed only after throttled attempts
+    - failures_by_status: failed items counted by final status ("error" for transport failures)
+    """
+
+    operation: str
+    total: int = 0
+    succeeded: int = 0
+    already_done: int = 0
+    retried: int = 0
+    failures_by_status: dict[str, int] = field(default_factory=dict)
+    failures: list[BulkItemResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+    def add(self, result: BulkItemResult) -> None:
+        self.total += 1
+        if result.attempts > 1:
+            self.retried += 1
+        if result.outcome == DONE:
+            self.succeeded += 1
+        elif result.outcome == ALREADY_DONE:
+            self.already_done += 1
+        else:
+            status = str(result.status) if result.status is not None else "error"
+            self.failures_by_status[status] = self.failures_by_status.get(status, 0) + 1
+            self.failures.append(result)
+
+    def raise_for_failures(self) -> "BulkReport":
+        assert not self.failures, (
+            f"{self.operation}: {self.failed} of {self.total} items failed "
+            f"(by status: {self.failures_by_status}), e.g. {self.failures[:5]}"
+        )
+        return self
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit adapted AIMD-style to secondary rate limits: a throttled response halves the
+    number of requests allowed in flight and pauses new ones for the server's Retry-After; every
+    `increase_after` clean responses raise the limit by one again, up to `max_concurrency`.
+    """
+
+    def __init__(self, max_concurrency: int, increase_after: int = 10, default_pause: float = 1.0) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.increase_after = increase_after
+        self.default_pause = default_pause
+        self._in_flight = 0
+        self._clean = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause <= 0 and self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                self._cond.wait(pause if pause > 0 else None)
+
+    def release(self, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self._clean = 0
+                pause = retry_after if retry_after is not None else self.default_pause
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            else:
+                self._clean += 1
+                if self._clean >= self.increase_after and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._clean = 0
+            self._cond.notify_all()
+
+
+def is_throttled(resp: requests.Response) -> bool:
+    # 403 is also "forbidden": only treat it as throttling when the server says so
+    if resp.status_code not in THROTTLED_STATUSES:
+        return False
+    return (
+        resp.status_code == 429
+        or "Retry-After" in resp.headers
+        or resp.headers.get("X-RateLimit-Remaining") == "0"
+        or "rate limit" in resp.text.lower()
+    )
+
+
+_SENTINEL = object()
+
+
+class BulkRun:
+    """
+    A bulk operation running in the background. Iterate it to receive BulkItemResult objects as
+    they complete (completion order, not input order); report() waits for the rest and returns
+    the BulkReport. Items are consumed lazily from the input iterable, so generators of any size work;
+    if the iterable raises, the items read so far still complete and the error is re-raised once they have.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        items: Iterable[Any],
+        call: Callable[[Any], requests.Response],
+        key: Callable[[Any], Hashable],
+        ok_statuses: frozenset[int],
+        already_done_statuses: frozenset[int],
+        max_workers: int = 8,
+        max_attempts: int = 5,
+    ) -> None:
+        self._report = BulkReport(operation)
+        self._items = items
+        self._call = call
+        self._key = key
+        self._ok = ok_statuses
+        self._already_done = already_done_statuses
+        self._max_attempts = max_attempts
+        self.concurrency = AdaptiveConcurrency(max_workers)
+        self._results: "queue.Queue[Any]" = queue.Queue()
+        # bounds items read ahead of the workers, so huge input iterables are not materialized
+        self._backlog = threading.BoundedSemaphore(2 * max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"bulk-{operation}")
+        self._started = time.monotonic()
+        self._done = threading.Event()
+        self._feed_error: Optional[Exception] = None
+        self._feeder = threading.Thread(target=self._feed, name=f"bulk-{operation}-feeder", daemon=True)
+        self._feeder.start()
+
+    def _feed(self) -> None:
+        try:
+            for item in self._items:
+                self._backlog.acquire()
+                self._executor.submit(self._run_item, item)
+        except Exception as e:
+            logger.error(f"{self._report.operation}: reading input items failed: {e!r}")
+            self._feed_error = e
+        finally:
+            self._executor.shutdown(wait=True)
+            self._report.elapsed = time.monotonic() - self._started
+            self._results.put(_SENTINEL)
+
+    def _run_item(self, item: Any) -> None:
+        try:
+            self._results.put(self._attempt(item))
+        finally:
+            self._backlog.release()
+
+    def _attempt(self, item: Any) -> BulkItemResult:
+        # a slot of the adaptive limit is held only while a request is on the wire
+        key = self._key(item)
+        attempts = 0
+        while True:
+            attempts += 1
+            self.concurrency.acquire()
+            try:
+                resp = self._call(item)
+                throttled = is_throttled(resp)
+            except Exception as e:
+                self.concurrency.release()
+                return BulkItemResult(key, FAILED, attempts=attempts, error=f"{type(e).__name__}: {e}")
+            if throttled and attempts < self._max_attempts:
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                logger.debug(f"{self._report.operation} {key!r} throttled, retrying after {retry_after}s")
+                self.concurrency.release(throttled=True, retry_after=retry_after)
+                continue
+            self.concurrency.release(throttled=throttled)
+            if resp.status_code in self._ok:
+                outcome = DONE
+            elif resp.status_code in self._already_done:
+                outcome = ALREADY_DONE
+            else:
+                outcome = FAILED
+            return BulkItemResult(key, outcome, status=resp.status_code, attempts=attempts, response=resp)
+
+    def __iter__(self) -> Iterator[BulkItemResult]:
+        while not self._done.is_set():
+            result = self._results.get()
+            if result is _SENTINEL:
+                self._done.set()
+                break
+            self._report.add(result)
+            yield result
+        if self._feed_error is not None:
+            raise self._feed_error
+
+    def report(self) -> BulkReport:
+        for _ in self:
+            pass
+        return self._report
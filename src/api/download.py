@@ -0,0 +1,146 @@
+import logging
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import requests
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from src.http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# progress(bytes received so far, total size or None when the server does not say)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+_STREAM_ERRORS = (requests.ConnectionError, requests.exceptions.ChunkedEncodingError, Urllib3HTTPError)
+
+
+class DownloadError(AssertionError):
+    pass
+
+
+def _total_size(resp: requests.Response, start: int) -> Optional[int]:
+    if resp.status_code == 206:
+        match = _CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+        if match and match[3] != "*":
+            return int(match[3])
+    length = resp.headers.get("Content-Length")
+    if length is None:
+        return None
+    return int(length) + (start if resp.status_code == 206 else 0)
+
+
+def iter_raw_chunks(
+    client: HttpClient,
+    raw_url: str,
+    *,
+    start: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    max_resumes: int = 3,
+) -> Iterator[bytes]:
+    """
+    Yields the bytes of `raw_url` from offset `start` in chunks of at most `chunk_size`, holding one chunk
+    in memory at a time. When the connection drops mid-body the download resumes with `Range` (up to
+    `max_resumes` times); a server that ignores `Range` answers 200 and the bytes already seen are skipped.
+    """
+    received = start
+    resumes = 0
+    while True:
+        headers = {"Range": f"bytes={received}-"} if received else {}
+        resp = client.get(url=raw_url, headers=headers, stream=True, expected_status=None)
+        try:
+            if resp.status_code == 416 and received:
+                # the requested offset is the end of the file: nothing left to read
+                match = re.match(r"bytes \*/(\d+)", resp.headers.get("Content-Range", ""))
+                if match and int(match[1]) == received:
+                    return
+            if resp.status_code not in (200, 206):
+                raise DownloadError(f"Unexpected status {resp.status_code} downloading {raw_url}")
+            total = _total_size(resp, received)
+            skip = received if resp.status_code == 200 else 0
+            position = 0 if resp.status_code == 200 else received
+            try:
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            position += len(chunk)
+                            continue
+                        chunk = chunk[skip:]
+                        position += skip
+                        skip = 0
+                    position += len(chunk)
+                    received = position
+                    if progress is not None:
+                        progress(received, total)
+                    yield chunk
+            except _STREAM_ERRORS as e:
+                if resumes >= max_resumes:
+                    raise
+                resumes += 1
+                logger.debug(f"Download of {raw_url} interrupted at {received} bytes ({e!r}), resuming")
+                continue
+            if total is not None and received < total:
+                if resumes >= max_resumes:
+                    raise DownloadError(f"Download of {raw_url} ended at {received} of {total} bytes")
+                resumes += 1
+                continue
+            return
+        finally:
+            resp.close()
+
+
+def download_to_file(
+    client: HttpClient,
+    raw_url: str,
+    dest: str | os.PathLike,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    resume: bool = True,
+) -> Path:
+    """
+    Streams `raw_url` into `dest` through a `<dest>.part` file that is renamed once complete.
+    With resume=True an existing partial file from an interrupted run is continued with `Range`.
+    """
+    dest = Path(dest)
+    part = dest.with_name(dest.name + ".part")
+    start = part.stat().st_size if resume and part.exists() else 0
+    with open(part, "ab" if start else "wb") as f:
+        for chunk in iter_raw_chunks(client, raw_url, start=start, chunk_size=chunk_size, progress=progress):
+            f.write(chunk)
+    os.replace(part, dest)
+    return dest
+
+
+def download_to_mmap(
+    client: HttpClient,
+    raw_url: str,
+    size: int,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> mmap.mmap:
+    """
+    Streams `raw_url` into an anonymous memory map of `size` bytes (e.g. GistFile.size), so large files
+    live in pageable memory instead of a Python bytes object; the map is positioned at offset 0.
+    """
+    buffer = mmap.mmap(-1, max(1, size))
+    written = 0
+    for chunk in iter_raw_chunks(client, raw_url, chunk_size=chunk_size, progress=progress):
+        if written + len(chunk) > size:
+            buffer.close()
+            raise DownloadError(f"{raw_url} is larger than the expected {size} bytes")
+        buffer[written:written + len(chunk)] = chunk
+        written += len(chunk)
+    if written != size:
+        buffer.close()
+        raise DownloadError(f"{raw_url} has {written} bytes, expected {size}")
+    return buffer
@@ -1,7 +1,13 @@
-from typing import Any, Optional
-
-import allure
+import mmap
+import os
+from functools import cached_property, partial
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence
 
+from src.api import download
+from src.api.bulk import BulkRun
+from src.api.models import Fork, Gist, GistCommit, GistFile
+from src.api.pagination import list_params, paginate
 from src.http_client import HttpClient
 
 
@@ -13,6 +19,11 @@ class GistsAPI:
             "X-GitHub-Api-Version": api_version,
         }
 
+    @cached_property
+    def typed(self) -> "TypedGistsAPI":
+        """The same endpoints returning Gist / GistCommit / Fork models instead of responses."""
+        return TypedGistsAPI(self)
+
     def create_gist(self, payload: dict[str, Any], expected_status: int = 201):
         return self.client.post(
             url="/gists",
@@ -43,13 +54,21 @@ class GistsAPI:
             expected_status=expected_status,
         )
 
-    def list_gists_for_authenticated_user(self, since: Optional[str] = None, expected_status: int = 200):
-        params = {"since": since} if since else None
+    def list_gists_for_authenticated_user(
+            self,
+            since: Optional[str] = None,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+            stream: bool = False,
+    ):
         return self.client.get(
             url="/gists",
-            params=params,
+            params=list_params(since, per_page, page),
             headers=self._headers,
             expected_status=expected_status,
+            stream=stream,
         )
 
     def list_public_gists(
@@ -57,34 +76,51 @@ class GistsAPI:
             since: Optional[str] = None,
             per_page: int | None = None,
             expected_status: int = 200,
+            *,
+            page: int | None = None,
+            stream: bool = False,
     ):
-        params = {}
-        if since:
-            params["since"] = since
-        if per_page:
-            params["per_page"] = per_page
-
         return self.client.get(
             url="/gists/public",
-            params=params,
+            params=list_params(since, per_page, page),
             headers=self._headers,
             expected_status=expected_status,
+            stream=stream,
         )
 
-    def list_starred_gists(self, expected_status: int = 200):
+    def list_starred_gists(
+            self,
+            expected_status: int = 200,
+            *,
+            since: Optional[str] = None,
+            per_page: int | None = None,
+            page: int | None = None,
+            stream: bool = False,
+    ):
         return self.client.get(
             url="/gists/starred",
+            params=list_params(since, per_page, page),
             headers=self._headers,
             expected_status=expected_status,
+            stream=stream,
         )
 
-    def list_gists_for_user(self, username: str, since: Optional[str] = None, expected_status: int = 200):
-        params = {"since": since} if since else None
+    def list_gists_for_user(
+            self,
+            username: str,
+            since: Optional[str] = None,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+            stream: bool = False,
+    ):
         return self.client.get(
             url=f"/users/{username}/gists",
-            params=params,
+            params=list_params(since, per_page, page),
             headers=self._headers,
             expected_status=expected_status,
+            stream=stream,
         )
 
     def fork_gist(self, gist_id: str, expected_status: int = 201):
@@ -94,11 +130,21 @@ class GistsAPI:
             expected_status=expected_status,
         )
 
-    def list_gist_forks(self, gist_id: str, expected_status: int = 200):
+    def list_gist_forks(
+            self,
+            gist_id: str,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+            stream: bool = False,
+    ):
         return self.client.get(
             url=f"/gists/{gist_id}/forks",
+            params=list_params(per_page=per_page, page=page),
             headers=self._headers,
             expected_status=expected_status,
+            stream=stream,
         )
 
     def check_starred(self, gist_id: str, expected_status: int = 204):
@@ -123,9 +169,256 @@ class GistsAPI:
             expected_status=expected_status,
         )
 
-    def list_gist_commits(self, gist_id: str, expected_status: int = 200):
+    def list_gist_commits(
+            self,
+            gist_id: str,
+            expected_status: int = 200,
+            *,
+            per_page: int | None = None,
+            page: int | None = None,
+            stream: bool = False,
+    ):
         return self.client.get(
             url=f"/gists/{gist_id}/commits",
+            params=list_params(per_page=per_page, page=page),
             headers=self._headers,
             expected_status=expected_status,
+            stream=stream,
+        )
+
+    def get_gist_revision(self, gist_id: str, sha: str, expected_status: int = 200):
+        # a revision never changes: see src.revisions.RevisionCache for a cache that never revalidates
+        return self.client.get(
+            url=f"/gists/{gist_id}/{sha}",
+            headers=self._headers,
+            expected_status=expected_status,
+        )
+
+    # Streaming file access: `raw_url` bodies are read chunk by chunk and never attached to the report,
+    # so files far above the inline `content` limit are processed in constant memory.
+
+    def iter_file_chunks(
+            self,
+            file: GistFile | str,
+            start: int = 0,
+            chunk_size: int = download.DEFAULT_CHUNK_SIZE,
+            progress: Optional[download.ProgressCallback] = None,
+    ) -> Iterator[bytes]:
+        return download.iter_raw_chunks(
+            self.client, _raw_url(file), start=start, chunk_size=chunk_size, progress=progress
+        )
+
+    def download_file(
+            self,
+            file: GistFile | str,
+            dest: str | os.PathLike,
+            chunk_size: int = download.DEFAULT_CHUNK_SIZE,
+            progress: Optional[download.ProgressCallback] = None,
+            resume: bool = True,
+    ) -> Path:
+        return download.download_to_file(
+            self.client, _raw_url(file), dest, chunk_size=chunk_size, progress=progress, resume=resume
+        )
+
+    def download_file_to_mmap(
+            self,
+            file: GistFile,
+            chunk_size: int = download.DEFAULT_CHUNK_SIZE,
+            progress: Optional[download.ProgressCallback] = None,
+    ) -> mmap.mmap:
+        return download.download_to_mmap(
+            self.client, _raw_url(file), file.size, chunk_size=chunk_size, progress=progress
+        )
+
+    # Paginated variants: lazily yield items across all pages by following the `Link` header.
+    # With prefetch=True page N+1 is requested in the background while page N is consumed.
+    # With stream=True each page is decoded item by item while it downloads instead of being buffered,
+    # and `fields` (e.g. ("id", "updated_at", "files")) keeps only those keys of every item.
+
+    def iter_gists_for_authenticated_user(
+            self, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False,
+            stream: bool = False, fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        return paginate(
+            lambda: self.list_gists_for_authenticated_user(since=since, per_page=per_page, stream=stream),
+            partial(self._get_page, stream=stream),
+            prefetch=prefetch,
+            stream=stream,
+            fields=fields,
         )
+
+    def iter_public_gists(
+            self, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False,
+            stream: bool = False, fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        return paginate(
+            lambda: self.list_public_gists(since=since, per_page=per_page, stream=stream),
+            partial(self._get_page, stream=stream),
+            prefetch=prefetch,
+            stream=stream,
+            fields=fields,
+        )
+
+    def iter_starred_gists(
+            self, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False,
+            stream: bool = False, fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        return paginate(
+            lambda: self.list_starred_gists(since=since, per_page=per_page, stream=stream),
+            partial(self._get_page, stream=stream),
+            prefetch=prefetch,
+            stream=stream,
+            fields=fields,
+        )
+
+    def iter_gists_for_user(
+            self, username: str, since: Optional[str] = None, per_page: int = 100, prefetch: bool = False,
+            stream: bool = False, fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        return paginate(
+            lambda: self.list_gists_for_user(username, since=since, per_page=per_page, stream=stream),
+            partial(self._get_page, stream=stream),
+            prefetch=prefetch,
+            stream=stream,
+            fields=fields,
+        )
+
+    def iter_gist_forks(
+            self, gist_id: str, per_page: int = 100, prefetch: bool = False,
+            stream: bool = False, fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        return paginate(
+            lambda: self.list_gist_forks(gist_id, per_page=per_page, stream=stream),
+            partial(self._get_page, stream=stream),
+            prefetch=prefetch,
+            stream=stream,
+            fields=fields,
+        )
+
+    def iter_gist_commits(
+            self, gist_id: str, per_page: int = 100, prefetch: bool = False,
+            stream: bool = False, fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        return paginate(
+            lambda: self.list_gist_commits(gist_id, per_page=per_page, stream=stream),
+            partial(self._get_page, stream=stream),
+            prefetch=prefetch,
+            stream=stream,
+            fields=fields,
+        )
+
+    def _get_page(self, url: str, stream: bool = False):
+        # `url` is the absolute next-page link and already carries per_page/since/page
+        return self.client.get(url=url, headers=self._headers, expected_status=200, stream=stream)
+
+    # Bulk variants: up to `max_workers` requests in flight, halved on every secondary rate limit hit
+    # (throttled items are retried after Retry-After). They return a running BulkRun: iterate it for
+    # per-item results as they complete, or call report() for the totals. Deleting, starring and
+    # unstarring are idempotent, so a repeated run reports the remaining items as already done.
+
+    def create_many(self, payloads: Iterable[dict[str, Any]], max_workers: int = 4, max_attempts: int = 5) -> BulkRun:
+        # keyed by the position of the payload; creating is not idempotent, a second run creates new gists
+        return BulkRun(
+            "create_many",
+            enumerate(payloads),
+            call=lambda item: self.create_gist(item[1], expected_status=None),
+            key=lambda item: item[0],
+            ok_statuses=frozenset({201}),
+            already_done_statuses=frozenset(),
+            max_workers=max_workers,
+            max_attempts=max_attempts,
+        )
+
+    def delete_many(self, gist_ids: Iterable[str], max_workers: int = 4, max_attempts: int = 5) -> BulkRun:
+        return self._bulk_by_id("delete_many", gist_ids, self.delete_gist, max_workers, max_attempts)
+
+    def star_many(self, gist_ids: Iterable[str], max_workers: int = 4, max_attempts: int = 5) -> BulkRun:
+        # starring twice is a no-op 204 on GitHub; 404 means the gist is gone and is a failure here
+        return self._bulk_by_id("star_many", gist_ids, self.star, max_workers, max_attempts, already_done=())
+
+    def unstar_many(self, gist_ids: Iterable[str], max_workers: int = 4, max_attempts: int = 5) -> BulkRun:
+        return self._bulk_by_id("unstar_many", gist_ids, self.unstar, max_workers, max_attempts)
+
+    def _bulk_by_id(self, operation, gist_ids, method, max_workers, max_attempts, already_done=(404,)) -> BulkRun:
+        return BulkRun(
+            operation,
+            gist_ids,
+            call=lambda gist_id: method(gist_id, expected_status=None),
+            key=lambda gist_id: gist_id,
+            ok_statuses=frozenset({204}),
+            already_done_statuses=frozenset(already_done),
+            max_workers=max_workers,
+            max_attempts=max_attempts,
+        )
+
+
+def _raw_url(file: GistFile | str) -> str:
+    return file if isinstance(file, str) else file.raw_url
+
+
+class TypedGistsAPI:
+    """
+    Model-returning view of GistsAPI (`api.typed`). Responses are decoded once and turned into slotted
+    models; file contents missing from a payload are fetched from `raw_url` on first access.
+    Status expectations are the defaults of the underlying GistsAPI methods.
+    """
+
+    def __init__(self, api: GistsAPI) -> None:
+        self.api = api
+
+    def _load_content(self, raw_url: str) -> str:
+        return self.api.client.get(url=raw_url, expected_status=200).text
+
+    def _gist(self, data: dict[str, Any]) -> Gist:
+        return Gist.from_dict(data, self._load_content)
+
+    def _gists(self, items: Iterable[dict[str, Any]]) -> list[Gist]:
+        return [Gist.from_dict(item, self._load_content) for item in items]
+
+    def create_gist(self, payload: dict[str, Any]) -> Gist:
+        return self._gist(self.api.create_gist(payload).json())
+
+    def get_gist(self, gist_id: str) -> Gist:
+        return self._gist(self.api.get_gist(gist_id).json())
+
+    def update_gist(self, gist_id: str, payload: dict[str, Any]) -> Gist:
+        return self._gist(self.api.update_gist(gist_id, payload).json())
+
+    def fork_gist(self, gist_id: str) -> Gist:
+        return self._gist(self.api.fork_gist(gist_id).json())
+
+    def list_gists_for_authenticated_user(self, **params) -> list[Gist]:
+        return self._gists(self.api.list_gists_for_authenticated_user(**params).json())
+
+    def list_public_gists(self, **params) -> list[Gist]:
+        return self._gists(self.api.list_public_gists(**params).json())
+
+    def list_starred_gists(self, **params) -> list[Gist]:
+        return self._gists(self.api.list_starred_gists(**params).json())
+
+    def list_gists_for_user(self, username: str, **params) -> list[Gist]:
+        return self._gists(self.api.list_gists_for_user(username, **params).json())
+
+    def list_gist_forks(self, gist_id: str, **params) -> list[Fork]:
+        return [Fork.from_dict(item) for item in self.api.list_gist_forks(gist_id, **params).json()]
+
+    def list_gist_commits(self, gist_id: str, **params) -> list[GistCommit]:
+        return [GistCommit.from_dict(item) for item in self.api.list_gist_commits(gist_id, **params).json()]
+
+    def iter_public_gists(self, **params) -> Iterator[Gist]:
+        return map(self._gist, self.api.iter_public_gists(**params))
+
+    def iter_gists_for_authenticated_user(self, **params) -> Iterator[Gist]:
+        return map(self._gist, self.api.iter_gists_for_authenticated_user(**params))
+
+    def iter_starred_gists(self, **params) -> Iterator[Gist]:
+        return map(self._gist, self.api.iter_starred_gists(**params))
+
+    def iter_gists_for_user(self, username: str, **params) -> Iterator[Gist]:
+        return map(self._gist, self.api.iter_gists_for_user(username, **params))
+
+    def iter_gist_forks(self, gist_id: str, **params) -> Iterator[Fork]:
+        return map(Fork.from_dict, self.api.iter_gist_forks(gist_id, **params))
+
+    def iter_gist_commits(self, gist_id: str, **params) -> Iterator[GistCommit]:
+        return map(GistCommit.from_dict, self.api.iter_gist_commits(gist_id, **params))
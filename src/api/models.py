@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+# Fetches the full text behind a file's raw_url; set by TypedGistsAPI so content can be loaded on demand.
+ContentLoader = Callable[[str], str]
+
+
+def _login(user: Optional[dict[str, Any]]) -> Optional[str]:
+    return user.get("login") if user else None
+
+
+@dataclass(slots=True)
+class GistFile:
+    """
+    One file of a gist. List endpoints omit `content` and GitHub truncates large files, so `content`
+    is materialized lazily: the inline text when it is complete, otherwise one fetch of `raw_url`.
+    """
+
+    filename: str
+    raw_url: Optional[str] = None
+    size: int = 0
+    type: Optional[str] = None
+    language: Optional[str] = None
+    truncated: bool = False
+    _content: Optional[str] = field(default=None, repr=False)
+    _loader: Optional[ContentLoader] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], loader: Optional[ContentLoader] = None) -> "GistFile":
+        return cls(
+            filename=data["filename"],
+            raw_url=data.get("raw_url"),
+            size=data.get("size") or 0,
+            type=data.get("type"),
+            language=data.get("language"),
+            truncated=bool(data.get("truncated")),
+            _content=data.get("content"),
+            _loader=loader,
+        )
+
+    @property
+    def content_loaded(self) -> bool:
+        return self._content is not None and not self.truncated
+
+    @property
+    def content(self) -> Optional[str]:
+        if not self.content_loaded and self._loader is not None and self.raw_url:
+            self._content = self._loader(self.raw_url)
+            self.truncated = False
+        return self._content
+
+
+@dataclass(slots=True)
+class GistCommit:
+    version: str
+    committed_at: Optional[str] = None
+    url: Optional[str] = None
+    user: Optional[str] = None
+    additions: int = 0
+    deletions: int = 0
+    total: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "GistCommit":
+        change = data.get("change_status") or {}
+        return cls(
+            version=data["version"],
+            committed_at=data.get("committed_at"),
+            url=data.get("url"),
+            user=_login(data.get("user")),
+            additions=change.get("additions", 0),
+            deletions=change.get("deletions", 0),
+            total=change.get("total", 0),
+        )
+
+
+@dataclass(slots=True)
+class Fork:
+    id: str
+    url: Optional[str] = None
+    owner: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Fork":
+        # embedded forks carry `user`, the forks list endpoint returns full gists with `owner`
+        return cls(
+            id=data["id"],
+            url=data.get("url"),
+            owner=_login(data.get("owner") or data.get("user")),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+        )
+
+
+@dataclass(slots=True)
+class Gist:
+    """
+    Typed view of a gist payload. Only the fields the framework uses are kept: the rest of the decoded
+    dict tree is dropped once the model is built. `forks` and `history` are empty for list items.
+    """
+
+    id: str
+    description: Optional[str] = None
+    public: bool = False
+    owner: Optional[str] = None
+    files: dict[str, GistFile] = field(default_factory=dict)
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    url: Optional[str] = None
+    html_url: Optional[str] = None
+    comments: int = 0
+    truncated: bool = False
+    fork_of: Optional[str] = None
+    forks: list[Fork] = field(default_factory=list)
+    history: list[GistCommit] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], loader: Optional[ContentLoader] = None) -> "Gist":
+        fork_of = data.get("fork_of")
+        return cls(
+            id=data["id"],
+            description=data.get("description"),
+            public=bool(data.get("public")),
+            owner=_login(data.get("owner")),
+            files={name: GistFile.from_dict(f, loader) for name, f in (data.get("files") or {}).items()},
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+            url=data.get("url"),
+            html_url=data.get("html_url"),
+            comments=data.get("comments") or 0,
+            truncated=bool(data.get("truncated")),
+            fork_of=fork_of.get("id") if fork_of else None,
+            forks=[Fork.from_dict(f) for f in data.get("forks") or ()],
+            history=[GistCommit.from_dict(c) for c in data.get("history") or ()],
+        )
@@ -0,0 +1,121 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Iterator, Optional
+
+from src.utils.json_stream import STREAM_CHUNK_SIZE, iter_json_array, project
+
+
+def list_params(
+    since: Optional[str] = None,
+    per_page: int | None = None,
+    page: int | None = None,
+) -> dict[str, Any]:
+    """Builds query params shared by the list endpoints, skipping unset values."""
+    params: dict[str, Any] = {}
+    if since:
+        params["since"] = since
+    if per_page:
+        params["per_page"] = per_page
+    if page:
+        params["page"] = page
+    return params
+
+
+def next_page_url(response: Any) -> Optional[str]:
+    """Returns the absolute URL of the next page from the response `Link` header, if any."""
+    return response.links.get("next", {}).get("url")
+
+
+def page_items(response: Any, stream: bool = False, fields: Optional[Collection[str]] = None) -> Iterator[Any]:
+    """
+    Items of one list page. With stream=True the response must have been requested with stream=True:
+    its body is decoded item by item while it downloads (see src.utils.json_stream) and the connection
+    is released when the page is exhausted or the iterator is closed.
+    """
+    if not stream:
+        items = response.json()
+        yield from (items if fields is None else (project(item, fields) for item in items))
+        return
+    try:
+        yield from iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), fields)
+    finally:
+        response.close()
+
+
+def paginate(
+    first_page: Callable[[], Any],
+    fetch_page: Callable[[str], Any],
+    *,
+    prefetch: bool = False,
+    stream: bool = False,
+    fields: Optional[Collection[str]] = None,
+) -> Iterator[Any]:
+    """
+    Lazily yields items of a paginated list endpoint, following `Link: rel="next"` until the last page.
+
+    Parameters:
+    - first_page: A zero-argument callable that requests the first page (with the caller's per_page/since).
+    - fetch_page: A callable that requests a page by the absolute URL taken from the `Link` header.
+    - prefetch: If True, page N+1 is requested in a background thread while page N is being consumed.
+    - stream: The pages were requested with stream=True; items are decoded as the body arrives.
+    - fields: Keep only these keys of each item.
+
+    At most the current page and one prefetched page are held in memory at any time; with stream=True only
+    the item being decoded and the undecoded tail of the page.
+    """
+    if not prefetch:
+        resp = first_page()
+        while True:
+            url = next_page_url(resp)
+            yield from page_items(resp, stream, fields)
+            if not url:
+                return
+            resp = fetch_page(url)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="gists-prefetch") as executor:
+        pending: Optional[Future] = None
+        try:
+            resp = first_page()
+            while True:
+                url = next_page_url(resp)
+                pending = executor.submit(fetch_page, url) if url else None
+                yield from page_items(resp, stream, fields)
+                if pending is None:
+                    return
+                resp = pending.result()
+                pending = None
+        finally:
+            if pending is not None and not pending.cancel() and stream:
+                # a prefetched streamed page holds its connection until the body is closed
+                pending.add_done_callback(_close_page)
+
+
+def _close_page(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+async def apaginate(
+    first_page: Callable[[], Awaitable[Any]],
+    fetch_page: Callable[[str], Awaitable[Any]],
+    *,
+    prefetch: bool = False,
+) -> AsyncIterator[Any]:
+    """Asyncio counterpart of `paginate`; the prefetch runs as a task on the current event loop."""
+    import asyncio  # not needed by the threaded `paginate`
+
+    pending: Optional[asyncio.Task] = None
+    try:
+        resp = await first_page()
+        while True:
+            url = next_page_url(resp)
+            if url and prefetch:
+                pending = asyncio.ensure_future(fetch_page(url))
+            for item in resp.json():
+                yield item
+            if not url:
+                return
+            resp = await pending if pending is not None else await fetch_page(url)
+            pending = None
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from json import JSONDecodeError
+from pprint import pformat
+from typing import Any, Mapping, Optional
+
+import httpx
+
+from src.http_client import RETRY_ALLOWED_METHODS, RETRY_STATUS_FORCELIST, HttpMethod
+from src.rate_limit import RateLimitScheduler
+from src.reporting import AllureReporter, default_reporter
+from src.retry import MAX_RETRY_AFTER, RETRY_AFTER_STATUS_CODES, SAFE_RETRY_STATUSES, retry_delay
+from src.single_flight import AsyncSingleFlight, flight_key
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_MAX = 120.0
+
+
+class AsyncHttpClient:
+    """
+    Asyncio counterpart of HttpClient built on httpx.AsyncClient with:
+    - base_url handling
+    - default headers and cookies
+    - the same retry policy for transient errors (status and connection/read failures)
+    - expected status code assertion
+    - Allure attachments for request/response, size-capped and sampled per endpoint (see src.reporting)
+    - one bounded keep-alive connection pool shared by all concurrent requests
+    - optional pacing by X-RateLimit-* / Retry-After headers (see src.rate_limit.RateLimitScheduler)
+    - opt-in coalescing of identical concurrent GETs into one request (coalesce_gets=True, see src.single_flight)
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        default_headers: Optional[Mapping[str, str]] = None,
+        default_cookies: Optional[Mapping[str, str]] = None,
+        verify: bool | str = True,
+        timeout: int | float | tuple | None = 30,
+        retries_total: int = 3,
+        backoff_factor: float = 0.3,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        rate_limiter: Optional[RateLimitScheduler] = None,
+        reporter: Optional[AllureReporter] = None,
+        coalesce_gets: bool = False,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.single_flight = AsyncSingleFlight() if coalesce_gets else None
+        self.rate_limiter = rate_limiter
+        self.reporter = reporter or default_reporter()
+        self._default_timeout = timeout
+        self._retries_total = retries_total
+        self._backoff_factor = backoff_factor
+        self.client = httpx.AsyncClient(
+            headers=dict(default_headers or {}),
+            cookies=dict(default_cookies or {}),
+            verify=verify,
+            timeout=self._to_httpx_timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def request(
+        self,
+        *,
+        method: HttpMethod | str,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        cookies: Optional[dict[str, str]] = None,
+        files: Optional[dict[str, Any]] = None,
+        json: Any | None = None,
+        data: Any | None = None,
+        expected_status: int | None = None,
+        allow_redirects: bool = True,
+        timeout: int | float | tuple | None = None,
+    ) -> httpx.Response:
+        if url.startswith(("http://", "https://")):
+            full_url = url
+        else:
+            full_url = f"{self.base_url}{url}"
+
+        method = str(getattr(method, "value", method)).upper()
+        req = self.client.build_request(
+            method=method,
+            url=full_url,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            files=files,
+            json=json,
+            data=data,
+            timeout=self._to_httpx_timeout(timeout or self._default_timeout),
+        )
+
+        if self.single_flight is not None and method == "GET":
+            resp = await self.single_flight.do(
+                flight_key(method, req.url, req.headers),
+                lambda: self._send_with_retries(req, allow_redirects=allow_redirects),
+            )
+        else:
+            resp = await self._send_with_retries(req, allow_redirects=allow_redirects)
+        self.reporter.record(resp, unexpected=expected_status is not None and resp.status_code != expected_status)
+        if expected_status is not None:
+            assert resp.status_code == expected_status, (
+                f"Unexpected status {resp.status_code}, expected {expected_status}.\n"
+                f"URL: {full_url}\nBody: {self._safe_body(resp)}"
+            )
+        return resp
+
+    async def get(self, url: str, **kw) -> httpx.Response:
+        return await self.request(method=HttpMethod.GET, url=url, **kw)
+
+    async def post(self, url: str, **kw) -> httpx.Response:
+        return await self.request(method=HttpMethod.POST, url=url, **kw)
+
+    async def put(self, url: str, **kw) -> httpx.Response:
+        return await self.request(method=HttpMethod.PUT, url=url, **kw)
+
+    async def patch(self, url: str, **kw) -> httpx.Response:
+        return await self.request(method=HttpMethod.PATCH, url=url, **kw)
+
+    async def delete(self, url: str, **kw) -> httpx.Response:
+        return await self.request(method=HttpMethod.DELETE, url=url, **kw)
+
+    async def _send_with_retries(self, req: httpx.Request, *, allow_redirects: bool) -> httpx.Response:
+        # Mirrors the urllib3 Retry used by HttpClient: total/connect/read share one counter,
+        # status retries return the last response once exhausted, transport errors re-raise.
+        # Writes are only repeated when the server cannot have processed them (see src.retry.AdaptiveRetry).
+        idempotent = req.method in RETRY_ALLOWED_METHODS
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(req.method)
+            try:
+                resp = await self.client.send(req, follow_redirects=allow_redirects)
+            except (httpx.ConnectError, httpx.ReadError, httpx.ConnectTimeout, httpx.ReadTimeout) as e:
+                never_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not (idempotent or never_sent) or attempt >= self._retries_total:
+                    raise
+                attempt += 1
+                logger.warning(f"Retrying ({self._retries_total - attempt} left) after {e!r}: {req.url}")
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.update_from_response(resp)
+            retryable = resp.status_code in SAFE_RETRY_STATUSES or idempotent
+            if not retryable or resp.status_code not in RETRY_STATUS_FORCELIST or attempt >= self._retries_total:
+                return resp
+            delay = self._retry_after(resp)
+            if delay is not None and delay > MAX_RETRY_AFTER:
+                return resp
+            attempt += 1
+            await resp.aclose()
+            logger.warning(f"Retrying ({self._retries_total - attempt} left) after status {resp.status_code}: {req.url}")
+            await asyncio.sleep(self._backoff(attempt) if delay is None else delay)
+
+    def _backoff(self, attempt: int) -> float:
+        if attempt <= 1:
+            return 0.0
+        return min(BACKOFF_MAX, self._backoff_factor * (2 ** (attempt - 1)))
+
+    @staticmethod
+    def _retry_after(resp: httpx.Response) -> float | None:
+        if resp.status_code not in RETRY_AFTER_STATUS_CODES:
+            return None
+        return retry_delay(resp.headers)
+
+    @staticmethod
+    def _to_httpx_timeout(timeout: int | float | tuple | None) -> httpx.Timeout:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    @staticmethod
+    def _safe_body(resp: httpx.Response) -> str:
+        try:
+            return pformat(resp.json(), indent=2)
+        except (JSONDecodeError, ValueError, TypeError):
+            try:
+                return resp.text
+            except Exception:
+                return "<unreadable>"
@@ -0,0 +1,14 @@
+from src.bench.cases import CASES, PAYLOADS, BenchCase, BenchContext
+from src.bench.runner import compare, fake_server_process, load_baseline, measure, run_benchmarks
+
+__all__ = [
+    "BenchCase",
+    "BenchContext",
+    "CASES",
+    "PAYLOADS",
+    "compare",
+    "fake_server_process",
+    "load_baseline",
+    "measure",
+    "run_benchmarks",
+]
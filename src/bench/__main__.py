@@ -0,0 +1,86 @@
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from src.api.gists import GistsAPI
+from src.bench.cases import CASES, PAYLOADS
+from src.bench.runner import BASELINE_PATH, THRESHOLDS, compare, fake_server_process, load_baseline, run_benchmarks
+from src.http_client import HttpClient
+from src.reporting import AttachmentPolicy, default_reporter
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.bench",
+        description="Per-call CPU time and memory of GistsAPI methods against a zero-latency local stand-in, "
+        "compared with a stored baseline.",
+    )
+    names = sorted({case.name for case in CASES})
+    parser.add_argument(
+        "--case", dest="cases", action="append", choices=names, metavar="NAME", help="Only this case, repeatable"
+    )
+    parser.add_argument(
+        "--payload", dest="payloads", action="append", choices=list(PAYLOADS), help="Only this payload, repeatable"
+    )
+    parser.add_argument("--iterations", type=int, default=30, help="Timed calls per case (default: 30)")
+    parser.add_argument("--memory-iterations", type=int, default=5, help="Traced calls per case (default: 5)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help=f"Baseline file (default: {BASELINE_PATH})")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to --baseline instead of comparing")
+    parser.add_argument(
+        "--cpu-threshold",
+        type=float,
+        default=THRESHOLDS["cpu_ratio"],
+        help="Allowed relative growth of CPU time over a bare requests GET (default: 0.5)",
+    )
+    parser.add_argument(
+        "--memory-threshold", type=float, default=THRESHOLDS["peak_kb"], help="Allowed relative peak memory regression (default: 0.25)"
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    # no Allure run to attach to: skip capturing responses altogether
+    default_reporter().configure(default=AttachmentPolicy(mode="off"))
+    cases = [case for case in CASES if not args.cases or case.name in args.cases]
+
+    with fake_server_process() as base_url:
+        api = GistsAPI(HttpClient(base_url=base_url, default_headers={"Authorization": "Bearer bench"}))
+        report = run_benchmarks(
+            api,
+            cases,
+            payloads=args.payloads or tuple(PAYLOADS),
+            iterations=args.iterations,
+            memory_iterations=args.memory_iterations,
+        )
+
+    status = 0
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        sys.stderr.write(f"Baseline written to {args.baseline}\n")
+    else:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            sys.stderr.write(f"No baseline at {args.baseline}; run with --update-baseline to create it\n")
+        else:
+            regressions = compare(report, baseline, {"cpu_ratio": args.cpu_threshold, "peak_kb": args.memory_threshold})
+            report["regressions"] = regressions
+            for line in regressions:
+                sys.stderr.write(f"REGRESSION {line}\n")
+            status = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
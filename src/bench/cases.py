@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.api.gists import GistsAPI
+
+# name -> (files, bytes per file)
+PAYLOADS: dict[str, tuple[int, int]] = {
+    "1x1KB": (1, 1024),
+    "100x1KB": (100, 1024),
+    # just under the inline `content` limit, so get_gist still returns the whole file
+    "1x1MB": (1, 1000 * 1000),
+}
+# gists of the benchmark user listed by list_gists_for_authenticated_user / list_starred_gists
+LISTED_GISTS = 30
+STARRED_GISTS = 10
+FORKS = 10
+PER_PAGE = 100
+
+
+def make_payload(payload: str, description: str = "bench") -> dict[str, Any]:
+    files, size = PAYLOADS[payload]
+    line = "0123456789abcdefghijklmnopqrstuvwxyz" * 3 + "\n"
+    content = (line * (size // len(line) + 1))[:size]
+    return {
+        "description": description,
+        "public": False,
+        "files": {f"bench_{i:03}.txt": {"content": content} for i in range(files)},
+    }
+
+
+@dataclass
+class BenchContext:
+    """
+    Fixture data a case runs against, created before measuring:
+    - payload: PAYLOADS key of per-payload cases (None for the payload-independent ones)
+    - gist: a gist of the benchmark user created with `payload` (1x1KB if None) and updated once
+    - public_id / fork_source_id: seeded public gists of another user (the latter already has FORKS forks)
+    - workdir: scratch directory for downloads
+    """
+
+    api: GistsAPI
+    payload: Optional[str]
+    gist: dict[str, Any]
+    public_id: str
+    fork_source_id: str
+    workdir: Path
+
+    @classmethod
+    def create(cls, api: GistsAPI, payload: Optional[str], workdir: Path) -> "BenchContext":
+        gist = api.create_gist(make_payload(payload or "1x1KB")).json()
+        gist = api.update_gist(gist["id"], {"description": "bench updated"}).json()
+        # forks made by an earlier run are public too, and GitHub refuses to fork your own gist
+        owner = gist["owner"]["login"]
+        public = api.list_public_gists(per_page=PER_PAGE).json()
+        others = [item["id"] for item in public if (item.get("owner") or {}).get("login") != owner]
+        public_id, fork_source_id = others[:2]
+        if payload is None:
+            for i in range(LISTED_GISTS):
+                listed = api.create_gist(make_payload("1x1KB", f"bench listed {i}")).json()
+                if i < STARRED_GISTS:
+                    api.star(listed["id"])
+            for _ in range(FORKS):
+                api.fork_gist(fork_source_id)
+        return cls(api, payload, gist, public_id, fork_source_id, workdir)
+
+    @property
+    def raw_url(self) -> str:
+        return next(iter(self.gist["files"].values()))["raw_url"]
+
+    @property
+    def first_revision(self) -> str:
+        return self.gist["history"][-1]["version"]
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """
+    One measured GistsAPI call: `call(ctx, prepared)` is timed, `prepare(ctx)` runs untimed before every
+    call (e.g. creating the gist delete_gist removes). per_payload cases run once per PAYLOADS entry.
+    """
+
+    name: str
+    call: Callable[[BenchContext, Any], Any]
+    prepare: Optional[Callable[[BenchContext], Any]] = None
+    per_payload: bool = False
+
+
+# Payload-independent cases run first, in this order, so the listed collections have the same size on
+# every run: fork_gist comes after the listings it grows.
+CASES: list[BenchCase] = [
+    BenchCase("list_gists_for_authenticated_user", lambda ctx, _: ctx.api.list_gists_for_authenticated_user(per_page=PER_PAGE)),
+    BenchCase("list_public_gists", lambda ctx, _: ctx.api.list_public_gists(per_page=PER_PAGE)),
+    BenchCase("list_starred_gists", lambda ctx, _: ctx.api.list_starred_gists(per_page=PER_PAGE)),
+    BenchCase("list_gists_for_user", lambda ctx, _: ctx.api.list_gists_for_user("octocat", per_page=PER_PAGE)),
+    BenchCase("list_gist_forks", lambda ctx, _: ctx.api.list_gist_forks(ctx.fork_source_id, per_page=PER_PAGE)),
+    BenchCase("list_gist_commits", lambda ctx, _: ctx.api.list_gist_commits(ctx.gist["id"], per_page=PER_PAGE)),
+    BenchCase("iter_public_gists", lambda ctx, _: sum(1 for _ in ctx.api.iter_public_gists(per_page=PER_PAGE))),
+    BenchCase("star", lambda ctx, _: ctx.api.star(ctx.gist["id"])),
+    BenchCase("check_starred", lambda ctx, _: ctx.api.check_starred(ctx.gist["id"])),
+    BenchCase("unstar", lambda ctx, _: ctx.api.unstar(ctx.gist["id"])),
+    BenchCase("fork_gist", lambda ctx, _: ctx.api.fork_gist(ctx.public_id)),
+    BenchCase(
+        "create_gist",
+        lambda ctx, payload: ctx.api.create_gist(payload),
+        prepare=lambda ctx: make_payload(ctx.payload),
+        per_payload=True,
+    ),
+    BenchCase("get_gist", lambda ctx, _: ctx.api.get_gist(ctx.gist["id"]), per_payload=True),
+    BenchCase(
+        "update_gist",
+        lambda ctx, payload: ctx.api.update_gist(ctx.gist["id"], payload),
+        prepare=lambda ctx: make_payload(ctx.payload, "bench update"),
+        per_payload=True,
+    ),
+    BenchCase(
+        "get_gist_revision",
+        lambda ctx, _: ctx.api.get_gist_revision(ctx.gist["id"], ctx.first_revision),
+        per_payload=True,
+    ),
+    BenchCase(
+        "download_file",
+        lambda ctx, _: ctx.api.download_file(ctx.raw_url, ctx.workdir / "download.txt", resume=False),
+        per_payload=True,
+    ),
+    BenchCase(
+        "delete_gist",
+        lambda ctx, gist_id: ctx.api.delete_gist(gist_id),
+        prepare=lambda ctx: ctx.api.create_gist(make_payload(ctx.payload)).json()["id"],
+        per_payload=True,
+    ),
+]
@@ -0,0 +1,199 @@
+import gc
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+import requests
+
+from src.api.gists import GistsAPI
+from src.bench.cases import CASES, PAYLOADS, BenchCase, BenchContext, make_payload
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[2]
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+# allowed relative growth over the baseline, and the absolute slack below which differences are noise
+# (cpu_ratio: CPU time relative to a bare requests.Session GET timed alongside every call)
+THRESHOLDS = {"cpu_ratio": 0.5, "peak_kb": 0.25}
+NOISE_FLOOR = {"cpu_ratio": 0.1, "peak_kb": 16.0}
+
+# the stand-in runs in its own process: its CPU time and allocations stay out of the measurements
+_SERVER = """
+import json, sys
+from src.fake_server import FakeGistsServer, FakeServerOptions
+with FakeGistsServer(FakeServerOptions(**json.loads(sys.argv[1]))) as server:
+    print(server.base_url, flush=True)
+    sys.stdin.read()
+"""
+
+
+@contextmanager
+def fake_server_process(**options: Any) -> Iterator[str]:
+    """Runs src.fake_server with `options` (zero latency by default) in a subprocess and yields its base URL."""
+    options.setdefault("inline_limit", 2 * 1024 * 1024)
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _SERVER, json.dumps(options)],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        base_url = proc.stdout.readline().strip()
+        if not base_url:
+            raise RuntimeError(f"Fake server process exited with {proc.wait()}")
+        yield base_url
+    finally:
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def measure(
+    call: Callable[[Any], Any],
+    prepare: Optional[Callable[[], Any]] = None,
+    reference: Optional[Callable[[], Any]] = None,
+    iterations: int = 30,
+    memory_iterations: int = 5,
+    warmup: int = 2,
+) -> dict[str, float]:
+    """
+    Per-call cost of `call(prepare())`, `prepare` being untimed:
+    - cpu_us: CPU time of this process, fastest call: the least disturbed by the scheduler and the server
+    - wall_us: median wall time, server included
+    - reference_us / cpu_ratio: with a `reference` callable, its fastest CPU time, timed right before every
+      call so that both see the same machine load, and cpu_us relative to it
+    - peak_kb: median of the traced memory peak above the level before the call (tracemalloc), i.e. what
+      the call allocates at its high-water mark; measured in a separate pass since tracing slows calls down
+    """
+    prepare = prepare or (lambda: None)
+    for _ in range(warmup):
+        call(prepare())
+        if reference is not None:
+            reference()
+    gc.collect()
+    cpu, wall, ref = [], [], []
+    for _ in range(iterations):
+        arg = prepare()
+        if reference is not None:
+            started = time.process_time()
+            reference()
+            ref.append(time.process_time() - started)
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        call(arg)
+        cpu.append(time.process_time() - cpu_started)
+        wall.append(time.perf_counter() - wall_started)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(memory_iterations):
+            arg = prepare()
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call(arg)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            del arg
+    finally:
+        tracemalloc.stop()
+    metrics = {
+        "cpu_us": round(min(cpu) * 1e6, 1),
+        "wall_us": round(statistics.median(wall) * 1e6, 1),
+        "peak_kb": round(statistics.median(peaks) / 1024, 1),
+    }
+    if ref:
+        metrics["reference_us"] = round(min(ref) * 1e6, 1)
+        metrics["cpu_ratio"] = round(min(cpu) / max(min(ref), 1e-6), 2)
+    return metrics
+
+
+def case_key(case: BenchCase, payload: Optional[str]) -> str:
+    return f"{case.name}[{payload}]" if payload else case.name
+
+
+def run_benchmarks(
+    api: GistsAPI,
+    cases: Iterable[BenchCase] = CASES,
+    payloads: Iterable[str] = tuple(PAYLOADS),
+    iterations: int = 30,
+    memory_iterations: int = 5,
+    warmup: int = 2,
+) -> dict[str, Any]:
+    """
+    Measures every case against `api` (see measure()): payload-independent cases once, per_payload cases
+    once per payload. Each call is paired with a bare requests.Session GET of a small gist (reference_us):
+    cpu_ratio = cpu_us / reference_us is the client overhead over plain requests, and unlike absolute CPU
+    times it is comparable between machines and between busy and idle moments of the same machine.
+    Returns {"config": ..., "results": {case_key: metrics}}.
+    """
+    cases = list(cases)
+    results: dict[str, dict[str, float]] = {}
+    session = requests.Session()
+    session.headers.update(api.client.session.headers)
+    with tempfile.TemporaryDirectory(prefix="gists-bench-") as workdir:
+        reference_url = f"{api.client.base_url}/gists/{api.create_gist(make_payload('1x1KB')).json()['id']}"
+        for payload in (None, *payloads):
+            selected = [case for case in cases if case.per_payload == (payload is not None)]
+            if not selected:
+                continue
+            ctx = BenchContext.create(api, payload, Path(workdir))
+            for case in selected:
+                key = case_key(case, payload)
+                logger.info(f"Measuring {key}")
+                results[key] = measure(
+                    lambda arg, case=case: case.call(ctx, arg),
+                    (lambda case=case: case.prepare(ctx)) if case.prepare else None,
+                    reference=lambda: session.get(reference_url).content,
+                    iterations=iterations,
+                    memory_iterations=memory_iterations,
+                    warmup=warmup,
+                )
+    session.close()
+    return {
+        "config": {"iterations": iterations, "memory_iterations": memory_iterations, "python": sys.version.split()[0]},
+        "results": results,
+    }
+
+
+def compare(
+    report: Mapping[str, Any],
+    baseline: Mapping[str, Any],
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> list[str]:
+    """
+    Regressions of `report` against `baseline`, one message each: a metric regresses when it exceeds the
+    baseline by more than its threshold (THRESHOLDS) plus NOISE_FLOOR. Cases missing from the baseline
+    are not compared.
+    """
+    thresholds = THRESHOLDS if thresholds is None else thresholds
+    regressions = []
+    for key, metrics in report["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        for metric, threshold in thresholds.items():
+            expected = base[metric]
+            if metrics[metric] > expected * (1 + threshold) + NOISE_FLOOR[metric]:
+                regressions.append(
+                    f"{key}: {metric} {metrics[metric]:.1f} vs {expected:.1f} expected "
+                    f"(+{(metrics[metric] / expected - 1) * 100 if expected else float('inf'):.0f}%, "
+                    f"threshold {threshold * 100:.0f}%)"
+                )
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[dict[str, Any]]:
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Protocol
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.json_codec import ParsedResponse
+
+logger = logging.getLogger(__name__)
+
+# Request headers that change the representation GitHub returns, so they are part of the cache key.
+DEFAULT_VARY_HEADERS = ("Accept", "Authorization", "X-GitHub-Api-Version")
+
+# Headers of a 304 that must not overwrite the ones stored with the cached 200.
+_NOT_MERGED_ON_304 = frozenset(["content-length", "content-encoding", "transfer-encoding", "content-type"])
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """Thread-safe in-memory LRU holding at most `max_entries` responses."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """
+    On-disk backend storing one file per key: a JSON metadata line followed by the raw body.
+    Files are written atomically; the least recently used ones (by mtime) are evicted above `max_entries`.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_entries: int = 10_000) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.cache"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                content = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Dropping unreadable cache file {path}: {e}")
+            self.delete(key)
+            return None
+        return CacheEntry(content=content, **meta)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        meta = asdict(entry)
+        content = meta.pop("content")
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode() + b"\n")
+                f.write(content)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.cache"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        with self._lock:
+            files = list(self.directory.glob("*.cache"))
+            if len(files) <= self.max_entries:
+                return
+            files.sort(key=lambda p: p.stat().st_mtime)
+            for path in files[: len(files) - self.max_entries]:
+                path.unlink(missing_ok=True)
+
+
+class ResponseCache:
+    """
+    Conditional-request (ETag / Last-Modified) cache for GET requests:
+    - responses carrying validators are stored per URL + representation-relevant request headers
+    - subsequent GETs are sent with If-None-Match / If-Modified-Since
+    - a 304 answer is replaced with the cached body, merged with the fresh 304 headers (e.g. rate limits)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        vary_headers: Iterable[str] = DEFAULT_VARY_HEADERS,
+    ) -> None:
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.vary_headers = tuple(vary_headers)
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, prep: requests.PreparedRequest) -> str:
+        h = hashlib.sha256()
+        h.update(f"{prep.method} {prep.url}".encode())
+        for name in self.vary_headers:
+            h.update(f"\n{name.lower()}:{prep.headers.get(name, '')}".encode())
+        return h.hexdigest()
+
+    def prepare(self, prep: requests.PreparedRequest) -> tuple[Optional[str], Optional[CacheEntry]]:
+        """Adds validators of a cached entry to `prep`. Returns (key, entry); key is None if not cacheable."""
+        if prep.method != "GET":
+            return None, None
+        key = self.key_for(prep)
+        entry = self.backend.get(key)
+        if entry is not None:
+            if entry.etag:
+                prep.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                prep.headers["If-Modified-Since"] = entry.last_modified
+        return key, entry
+
+    def resolve(
+        self, key: Optional[str], entry: Optional[CacheEntry], response: requests.Response
+    ) -> requests.Response:
+        """Serves the cached body on 304 and stores fresh 200 responses that carry validators."""
+        if key is None:
+            return response
+        if response.status_code == 304 and entry is not None:
+            self.hits += 1
+            return self._from_entry(entry, response)
+        self.misses += 1
+        if response.status_code in (404, 410):
+            self.backend.delete(key)
+        elif response.status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.backend.set(
+                    key,
+                    CacheEntry(
+                        url=response.url,
+                        status_code=response.status_code,
+                        headers=dict(response.headers),
+                        content=response.content,
+                        encoding=response.encoding,
+                        etag=etag,
+                        last_modified=last_modified,
+                    ),
+                )
+        return response
+
+    @staticmethod
+    def _from_entry(entry: CacheEntry, not_modified: requests.Response) -> requests.Response:
+        resp = ParsedResponse()
+        resp.status_code = entry.status_code
+        resp.reason = "OK"
+        resp._content = entry.content
+        resp.encoding = entry.encoding
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        for name, value in not_modified.headers.items():
+            if name.lower() not in _NOT_MERGED_ON_304:
+                resp.headers[name] = value
+        resp.url = not_modified.url
+        resp.request = not_modified.request
+        resp.elapsed = not_modified.elapsed
+        resp.history = not_modified.history
+        resp.connection = not_modified.connection
+        resp.from_cache = True
+        return resp
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.utils.json_codec import ParsedResponse
+
+logger = logging.getLogger(__name__)
+
+MODES = ("record", "strict", "lenient", "record_missing")
+
+_MAGIC = b"GISTCAS1"
+# frame: meta length, body length, then the JSON meta and the raw body
+_FRAME = struct.Struct(">II")
+# the body is stored decoded, and replayed responses are never chunked on the wire
+_DROPPED_HEADERS = frozenset(["content-encoding", "transfer-encoding", "content-length"])
+
+
+class CassetteMiss(AssertionError):
+    pass
+
+
+def _normalize_url(url: str) -> str:
+    # path and sorted query only: a cassette recorded against one host (or fake server port) replays on another
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{parts.path or '/'}?{query}" if query else parts.path or "/"
+
+
+def _body_hash(prep: requests.PreparedRequest) -> str:
+    body = prep.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    if body and "json" in (prep.headers.get("Content-Type") or ""):
+        # JSON bodies are compared by value, not by key order or whitespace
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+        except ValueError:
+            pass
+    return hashlib.blake2b(body, digest_size=16).hexdigest() if body else "-"
+
+
+def request_key(prep: requests.PreparedRequest) -> str:
+    return f"{prep.method.upper()} {_normalize_url(prep.url)} {_body_hash(prep)}"
+
+
+def _loose_key(key: str) -> str:
+    return key.rsplit(" ", 1)[0]
+
+
+class Cassette:
+    """
+    Recorded request/response pairs replayed at the HttpClient.session.send boundary.
+
+    - storage: one append-only file of length-prefixed frames (JSON meta + raw body); the index
+      (normalized method + path/query + body hash -> frame offsets) is rebuilt from the frame headers on open
+      and replayed bodies are sliced out of a memory map of the file
+    - a key recorded several times replays its responses in recording order; the last one then repeats
+      (polling loops keep seeing the final state)
+    - modes:
+        • "record": every request goes to the network and is appended (an existing file is truncated)
+        • "strict": replay only; a request that was not recorded raises CassetteMiss
+        • "lenient": replay only; falls back to the same method and URL with any body
+        • "record_missing": replays what was recorded and records the rest
+    - hosts: only requests to these host[:port] go through the cassette (default: all)
+
+    Streamed responses are read fully when recorded.
+    """
+
+    def __init__(self, path: str | os.PathLike, mode: str = "strict", hosts: Optional[Iterable[str]] = None) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.hosts = {host.lower() for host in hosts} if hosts is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._index: dict[str, list[int]] = {}
+        self._loose_index: dict[str, list[int]] = {}
+        self._cursors: dict[str, int] = {}
+        self._loose_cursors: dict[str, int] = {}
+        self._map: Optional[mmap.mmap] = None
+        self._mapped = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if mode == "record" or not self.path.exists() or self.path.stat().st_size == 0:
+            if mode in ("strict", "lenient") and not self.path.exists():
+                raise FileNotFoundError(f"Cassette {self.path} does not exist; record it first")
+            self.path.write_bytes(_MAGIC)
+        self._file = open(self.path, "r+b")
+        if self._file.read(len(_MAGIC)) != _MAGIC:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a cassette file")
+        self._size = self._scan()
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self._index.values())
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+    def _scan(self) -> int:
+        self._remap()
+        offset = len(_MAGIC)
+        while offset + _FRAME.size <= self._mapped:
+            meta_len, body_len = _FRAME.unpack_from(self._map, offset)
+            end = offset + _FRAME.size + meta_len + body_len
+            if end > self._mapped:
+                # a frame cut short by an interrupted recording: ignored and overwritten by the next append
+                logger.warning(f"Cassette {self.path}: ignoring a truncated frame at offset {offset}")
+                break
+            key = json.loads(self._map[offset + _FRAME.size:offset + _FRAME.size + meta_len])["key"]
+            self._index.setdefault(key, []).append(offset)
+            self._loose_index.setdefault(_loose_key(key), []).append(offset)
+            offset = end
+        return offset
+
+    def _remap(self) -> None:
+        size = os.fstat(self._file.fileno()).st_size
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        self._mapped = size
+
+    def handles(self, prep: requests.PreparedRequest) -> bool:
+        return self.hosts is None or urlsplit(prep.url).netloc.lower() in self.hosts
+
+    def play(
+        self, prep: requests.PreparedRequest, send: Callable[[], requests.Response]
+    ) -> requests.Response:
+        """Returns the recorded response for `prep`, or calls `send` and records it, depending on the mode."""
+        key = request_key(prep)
+        if self.mode != "record":
+            resp = self._replay(key, prep)
+            if resp is not None:
+                return resp
+            if self.mode != "record_missing":
+                raise CassetteMiss(f"No recorded response for {key} in {self.path} ({self.mode} mode)")
+        resp = send()
+        self._append(key, resp)
+        return resp
+
+    def _replay(self, key: str, prep: requests.PreparedRequest) -> Optional[requests.Response]:
+        with self._lock:
+            offset = self._next(self._index, self._cursors, key)
+            if offset is None and self.mode == "lenient":
+                offset = self._next(self._loose_index, self._loose_cursors, _loose_key(key))
+            if offset is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            meta_len, body_len = _FRAME.unpack_from(self._map, offset)
+            start = offset + _FRAME.size
+            meta = json.loads(self._map[start:start + meta_len])
+            body = self._map[start + meta_len:start + meta_len + body_len]
+        return self._build(meta, body, prep)
+
+    @staticmethod
+    def _next(index: dict[str, list[int]], cursors: dict[str, int], key: str) -> Optional[int]:
+        offsets = index.get(key)
+        if not offsets:
+            return None
+        position = cursors.get(key, 0)
+        cursors[key] = position + 1
+        return offsets[min(position, len(offsets) - 1)]
+
+    @staticmethod
+    def _build(meta: dict[str, Any], body: bytes, prep: requests.PreparedRequest) -> requests.Response:
+        resp = ParsedResponse()
+        resp.status_code = meta["status"]
+        resp.reason = meta["reason"]
+        resp.headers = CaseInsensitiveDict(meta["headers"])
+        resp._content = body
+        resp._content_consumed = True
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = meta["url"]
+        resp.request = prep
+        resp.elapsed = timedelta(0)
+        resp.from_cassette = True
+        return resp
+
+    def _append(self, key: str, resp: requests.Response) -> None:
+        body = resp.content
+        meta = json.dumps(
+            {
+                "key": key,
+                "url": resp.url,
+                "status": resp.status_code,
+                "reason": resp.reason,
+                "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            },
+            separators=(",", ":"),
+        ).encode()
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(_FRAME.pack(len(meta), len(body)) + meta + body)
+            self._file.truncate()
+            self._file.flush()
+            self._size = self._file.tell()
+            self._remap()
+            self._index.setdefault(key, []).append(offset)
+            self._loose_index.setdefault(_loose_key(key), []).append(offset)
+            self.recorded += 1
+            if self.mode == "record_missing":
+                # the response just recorded was used by this request
+                self._cursors[key] = self._cursors.get(key, 0) + 1
+
+
+_active: Optional[Cassette] = None
+
+
+def use_cassette(cassette: Optional[Cassette]) -> None:
+    """Sets the cassette HttpClients created afterwards use when none is passed (None turns it off)."""
+    global _active
+    _active = cassette
+
+
+def active_cassette() -> Optional[Cassette]:
+    return _active
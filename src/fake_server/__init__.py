@@ -0,0 +1,30 @@
+import threading
+from urllib.parse import urlsplit
+
+from src.fake_server.server import FakeGistsServer, FakeServerOptions
+from src.fake_server.store import GistStore
+
+FAKE_SCHEME = "fake://"
+
+_running: dict[str, FakeGistsServer] = {}
+_lock = threading.Lock()
+
+
+def is_fake_url(base_url: str) -> bool:
+    return base_url.startswith(FAKE_SCHEME)
+
+
+def start_from_url(base_url: str) -> FakeGistsServer:
+    """
+    Starts (once per process) the fake server described by a `fake://[?option=value&...]` URL
+    and returns it; repeated calls with the same URL share the same running instance.
+    """
+    with _lock:
+        server = _running.get(base_url)
+        if server is None:
+            server = FakeGistsServer(FakeServerOptions.from_query(urlsplit(base_url).query)).start()
+            _running[base_url] = server
+        return server
+
+
+__all__ = ["FAKE_SCHEME", "FakeGistsServer", "FakeServerOptions", "GistStore", "is_fake_url", "start_from_url"]
@@ -0,0 +1,564 @@
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, fields
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from src.fake_server.store import ApiError, GistRecord, GistStore, Revision
+
+logger = logging.getLogger(__name__)
+
+DOCS_URL = "https://docs.github.com/rest/gists"
+INLINE_CONTENT_LIMIT = 1024 * 1024
+
+
+@dataclass
+class FakeServerOptions:
+    """
+    Behaviour knobs of the fake server; all of them can be passed as query params of a `fake://` BASE_URL,
+    e.g. `fake://?latency=0.02&error_rate=0.01&rate_limit=5000`.
+    - latency / latency_jitter: seconds added to every response (jitter is uniform in [0, latency_jitter])
+    - error_rate / error_status: fraction of requests answered with `error_status` before any processing
+    - error_retry_after: Retry-After seconds sent with those injected errors (none by default)
+    - rate_limit / rate_limit_window: core requests allowed per token per window, exposed via X-RateLimit-* headers
+    - secondary_rate_limit / secondary_window: mutating requests allowed per token per window (403 + Retry-After)
+    - seed_public: number of public gists owned by `seed_owner` created at start-up
+    - default_user: login the server assigns to any bearer token
+    - inline_limit: file size above which `content` is truncated in JSON (only `raw_url` serves the full file)
+    - port: port to bind (0 picks a free one)
+    - random_seed: seed of the error-injection RNG, for reproducible runs
+    """
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    error_retry_after: Optional[float] = None
+    rate_limit: Optional[int] = None
+    rate_limit_window: float = 3600.0
+    secondary_rate_limit: Optional[int] = None
+    secondary_window: float = 60.0
+    seed_public: int = 150
+    seed_owner: str = "octocat"
+    default_user: str = "fake-user"
+    inline_limit: int = INLINE_CONTENT_LIMIT
+    host: str = "127.0.0.1"
+    port: int = 0
+    random_seed: Optional[int] = None
+
+    @classmethod
+    def from_query(cls, query: str) -> "FakeServerOptions":
+        types = {f.name: f.type for f in fields(cls)}
+        kwargs: dict[str, Any] = {}
+        for name, values in parse_qs(query).items():
+            if name not in types:
+                raise ValueError(f"Unknown fake server option: {name}")
+            kwargs[name] = _coerce(types[name], values[-1])
+        return cls(**kwargs)
+
+
+def _coerce(annotation: Any, value: str) -> Any:
+    target = next((t for t in (int, float) if annotation in (t, Optional[t])), str)
+    return target(value)
+
+
+class _Window:
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.used = 0
+        self.reset_at = time.time() + window
+
+    def roll(self, now: float) -> None:
+        if now >= self.reset_at:
+            self.used = 0
+            self.reset_at = now + self.window
+
+
+class RateLimitEmulator:
+    """Per-token primary and secondary rate-limit accounting, GitHub style."""
+
+    def __init__(self, options: FakeServerOptions) -> None:
+        self.options = options
+        self._core: dict[str, _Window] = {}
+        self._secondary: dict[str, _Window] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, mutating: bool) -> tuple[dict[str, str], Optional[ApiError], Optional[float]]:
+        """Returns (headers, error, retry_after); error is set when the request must be rejected."""
+        now = time.time()
+        headers: dict[str, str] = {}
+        with self._lock:
+            if self.options.secondary_rate_limit is not None and mutating:
+                window = self._secondary.setdefault(
+                    key, _Window(self.options.secondary_rate_limit, self.options.secondary_window)
+                )
+                window.roll(now)
+                if window.used >= window.limit:
+                    error = ApiError(403, "You have exceeded a secondary rate limit. Please wait a few minutes.")
+                    return headers, error, max(1.0, window.reset_at - now)
+                window.used += 1
+
+            if self.options.rate_limit is None:
+                return headers, None, None
+            window = self._core.setdefault(key, _Window(self.options.rate_limit, self.options.rate_limit_window))
+            window.roll(now)
+            error = None
+            if window.used >= window.limit:
+                error = ApiError(403, "API rate limit exceeded for user.")
+            else:
+                window.used += 1
+            headers.update(
+                {
+                    "X-RateLimit-Limit": str(window.limit),
+                    "X-RateLimit-Remaining": str(window.limit - window.used),
+                    "X-RateLimit-Used": str(window.used),
+                    # rounded up: a client sleeping until the reported second must find the window rolled over
+                    "X-RateLimit-Reset": str(math.ceil(window.reset_at)),
+                    "X-RateLimit-Resource": "core",
+                }
+            )
+            return headers, error, None
+
+    def refund(self, key: str) -> None:
+        # 304 Not Modified answers do not count against the primary limit.
+        with self._lock:
+            window = self._core.get(key)
+            if window is not None and window.used > 0:
+                window.used -= 1
+
+
+@dataclass
+class Response:
+    status: int
+    body: Any = None
+    headers: Optional[dict[str, str]] = None
+    raw: Optional[bytes] = None
+
+
+_ID = r"(?P<gist_id>[0-9A-Za-z]+)"
+ROUTES: list[tuple[str, re.Pattern, str]] = [
+    (method, re.compile(f"^{pattern}$"), handler)
+    for method, pattern, handler in [
+        ("GET", "/gists", "list_gists"),
+        ("POST", "/gists", "create_gist"),
+        ("GET", "/gists/public", "list_public"),
+        ("GET", "/gists/starred", "list_starred"),
+        ("GET", r"/users/(?P<username>[^/]+)/gists", "list_user_gists"),
+        ("GET", f"/gists/{_ID}", "get_gist"),
+        ("PATCH", f"/gists/{_ID}", "update_gist"),
+        ("DELETE", f"/gists/{_ID}", "delete_gist"),
+        ("GET", f"/gists/{_ID}/commits", "list_commits"),
+        ("GET", f"/gists/{_ID}/forks", "list_forks"),
+        ("POST", f"/gists/{_ID}/forks", "fork_gist"),
+        ("GET", f"/gists/{_ID}/star", "check_star"),
+        ("PUT", f"/gists/{_ID}/star", "star"),
+        ("DELETE", f"/gists/{_ID}/star", "unstar"),
+        ("GET", f"/gists/{_ID}/(?P<sha>[0-9a-f]{{40}})", "get_revision"),
+        ("GET", f"/raw/{_ID}/(?P<sha>[0-9a-f]{{40}})/(?P<filename>.+)", "get_raw"),
+    ]
+]
+
+
+class GistsApp:
+    """Request routing and GitHub-shaped rendering on top of a GistStore."""
+
+    def __init__(self, store: GistStore, options: FakeServerOptions) -> None:
+        self.store = store
+        self.options = options
+        self.limits = RateLimitEmulator(options)
+        self._rng = random.Random(options.random_seed)
+        self._rng_lock = threading.Lock()
+
+    def handle(self, method: str, target: str, headers: Any, body: bytes, base: str) -> Response:
+        if self.options.latency or self.options.latency_jitter:
+            with self._rng_lock:
+                jitter = self._rng.uniform(0, self.options.latency_jitter) if self.options.latency_jitter else 0.0
+            time.sleep(self.options.latency + jitter)
+        if self.options.error_rate:
+            with self._rng_lock:
+                failed = self._rng.random() < self.options.error_rate
+            if failed:
+                status = self.options.error_status
+                resp = Response(status, {"message": HTTPStatus(status).phrase, "documentation_url": DOCS_URL})
+                if self.options.error_retry_after is not None:
+                    resp.headers = {"Retry-After": f"{self.options.error_retry_after:g}"}
+                return resp
+
+        token = _bearer_token(headers.get("Authorization"))
+        limit_key = token or "anonymous"
+        limit_headers, limit_error, retry_after = self.limits.consume(limit_key, method != "GET")
+        if limit_error is not None:
+            resp = self._error(limit_error)
+            resp.headers = dict(limit_headers)
+            if retry_after is not None:
+                resp.headers["Retry-After"] = str(int(retry_after))
+            return resp
+
+        parts = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        user = self.options.default_user if token else None
+        resp = self._dispatch(method, parts.path, query, user, body, base)
+        if method == "GET" and resp.status == 200 and headers.get("Range") and (resp.headers or {}).get("Accept-Ranges"):
+            resp = self._apply_range(resp, headers["Range"])
+
+        if method == "GET" and resp.status == 200 and resp.raw is None:
+            resp.raw = json.dumps(resp.body).encode()
+            etag = f'W/"{hashlib.md5(resp.raw).hexdigest()}"'
+            resp.headers = {**(resp.headers or {}), "ETag": etag}
+            if etag == headers.get("If-None-Match"):
+                self.limits.refund(limit_key)
+                resp = Response(304, headers={"ETag": etag})
+        resp.headers = {**limit_headers, **(resp.headers or {})}
+        return resp
+
+    def _dispatch(self, method: str, path: str, query: dict, user: Optional[str], body: bytes, base: str) -> Response:
+        path = path.rstrip("/") or "/"
+        for route_method, pattern, name in ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                handler: Callable[..., Response] = getattr(self, f"_{name}")
+                try:
+                    return handler(user=user, query=query, body=body, base=base, path=path, **match.groupdict())
+                except ApiError as e:
+                    return self._error(e)
+        return self._error(ApiError(404, "Not Found"))
+
+    @staticmethod
+    def _apply_range(resp: Response, header: str) -> Response:
+        # single byte ranges only, like raw.githubusercontent.com; anything else gets the full body
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+        if not match or not (match[1] or match[2]):
+            return resp
+        size = len(resp.raw)
+        if match[1]:
+            start = int(match[1])
+            end = min(int(match[2]), size - 1) if match[2] else size - 1
+        else:
+            start, end = max(0, size - int(match[2])), size - 1
+        if start >= size or start > end:
+            return Response(416, raw=b"", headers={"Content-Range": f"bytes */{size}"})
+        return Response(
+            206,
+            raw=resp.raw[start:end + 1],
+            headers={**resp.headers, "Content-Range": f"bytes {start}-{end}/{size}"},
+        )
+
+    @staticmethod
+    def _error(error: ApiError) -> Response:
+        return Response(error.status, {"message": error.message, "documentation_url": DOCS_URL})
+
+    @staticmethod
+    def _require_user(user: Optional[str]) -> str:
+        if user is None:
+            raise ApiError(401, "Requires authentication")
+        return user
+
+    @staticmethod
+    def _json_body(body: bytes) -> Any:
+        if not body:
+            return {}
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise ApiError(400, "Problems parsing JSON")
+
+    def _render_user(self, login: str, base: str) -> dict[str, Any]:
+        return {
+            "login": login,
+            "id": zlib.crc32(login.encode()),
+            "type": "User",
+            "url": f"{base}/users/{login}",
+            "html_url": f"https://github.com/{login}",
+        }
+
+    def _render_files(self, record_id: str, version: str, files: dict[str, str], base: str, full: bool) -> dict:
+        limit = self.options.inline_limit
+        rendered = {}
+        for name, content in files.items():
+            raw = content.encode()
+            item = {
+                "filename": name,
+                "type": "text/plain",
+                "language": "Text",
+                "raw_url": f"{base}/raw/{record_id}/{version}/{name}",
+                "size": len(raw),
+            }
+            if full:
+                truncated = len(raw) > limit
+                item["truncated"] = truncated
+                item["content"] = raw[:limit].decode(errors="ignore") if truncated else content
+            rendered[name] = item
+        return rendered
+
+    def _render_revision(self, record: GistRecord, rev: Revision, base: str) -> dict[str, Any]:
+        return {
+            "url": f"{base}/gists/{record.id}/{rev.version}",
+            "version": rev.version,
+            "user": self._render_user(rev.user, base),
+            "change_status": {
+                "total": rev.additions + rev.deletions,
+                "additions": rev.additions,
+                "deletions": rev.deletions,
+            },
+            "committed_at": rev.committed_at,
+        }
+
+    def _render_gist(
+        self, record: GistRecord, base: str, *, full: bool = True, revision: Optional[Revision] = None
+    ) -> dict[str, Any]:
+        history = record.history
+        current = revision or (history[0] if history else None)
+        version = current.version if current else "0" * 40
+        files = current.files if revision is not None else record.files
+        data: dict[str, Any] = {
+            "url": f"{base}/gists/{record.id}" + (f"/{revision.version}" if revision else ""),
+            "forks_url": f"{base}/gists/{record.id}/forks",
+            "commits_url": f"{base}/gists/{record.id}/commits",
+            "id": record.id,
+            "node_id": f"G_{record.id}",
+            "git_pull_url": f"https://gist.github.com/{record.id}.git",
+            "git_push_url": f"https://gist.github.com/{record.id}.git",
+            "html_url": f"https://gist.github.com/{record.owner}/{record.id}",
+            "files": self._render_files(record.id, version, files, base, full),
+            "public": record.public,
+            "created_at": record.created_at,
+            "updated_at": record.updated_at,
+            "description": record.description,
+            "comments": 0,
+            "user": None,
+            "comments_url": f"{base}/gists/{record.id}/comments",
+            "owner": self._render_user(record.owner, base),
+            "truncated": False,
+        }
+        if full:
+            data["forks"] = [
+                {
+                    "id": fork.id,
+                    "url": f"{base}/gists/{fork.id}",
+                    "user": self._render_user(fork.owner, base),
+                    "created_at": fork.created_at,
+                    "updated_at": fork.updated_at,
+                }
+                for fork in self.store.forks(record.id)
+            ]
+            data["history"] = [self._render_revision(record, rev, base) for rev in history]
+        if record.fork_of:
+            data["fork_of"] = {"id": record.fork_of, "url": f"{base}/gists/{record.fork_of}"}
+        return data
+
+    @staticmethod
+    def _page(items: list, query: dict, path: str, base: str) -> tuple[list, dict[str, str]]:
+        try:
+            per_page = min(100, max(1, int(query.get("per_page", 30))))
+            page = max(1, int(query.get("page", 1)))
+        except ValueError:
+            raise ApiError(422, "Invalid pagination parameters")
+        last = max(1, -(-len(items) // per_page))
+        chunk = items[(page - 1) * per_page: page * per_page]
+
+        def link(n: int) -> str:
+            return f"{base}{path}?{urlencode({**query, 'per_page': per_page, 'page': n})}"
+
+        rels = []
+        if page < last:
+            rels += [f'<{link(page + 1)}>; rel="next"', f'<{link(last)}>; rel="last"']
+        if page > 1:
+            rels += [f'<{link(1)}>; rel="first"', f'<{link(min(page - 1, last))}>; rel="prev"']
+        return chunk, ({"Link": ", ".join(rels)} if rels else {})
+
+    def _list(self, records: list[GistRecord], query: dict, path: str, base: str) -> Response:
+        chunk, headers = self._page(records, query, path, base)
+        return Response(200, [self._render_gist(r, base, full=False) for r in chunk], headers)
+
+    def _list_gists(self, *, user, query, base, path, **_) -> Response:
+        if user is None:
+            return self._list_public(query=query, base=base, path=path)
+        return self._list(self.store.query(owner=user, since=query.get("since")), query, path, base)
+
+    def _list_public(self, *, query, base, path, **_) -> Response:
+        return self._list(self.store.query(public_only=True, since=query.get("since")), query, path, base)
+
+    def _list_starred(self, *, user, query, base, path, **_) -> Response:
+        user = self._require_user(user)
+        return self._list(self.store.query(starred_by=user, since=query.get("since")), query, path, base)
+
+    def _list_user_gists(self, *, user, username, query, base, path, **_) -> Response:
+        records = self.store.query(owner=username, public_only=user != username, since=query.get("since"))
+        return self._list(records, query, path, base)
+
+    def _create_gist(self, *, user, body, base, **_) -> Response:
+        user = self._require_user(user)
+        record = self.store.create(user, self._json_body(body))
+        return Response(201, self._render_gist(record, base), {"Location": f"{base}/gists/{record.id}"})
+
+    def _get_gist(self, *, gist_id, base, **_) -> Response:
+        return Response(200, self._render_gist(self.store.get(gist_id), base))
+
+    def _get_revision(self, *, gist_id, sha, base, **_) -> Response:
+        record, rev = self.store.revision(gist_id, sha)
+        return Response(200, self._render_gist(record, base, revision=rev))
+
+    def _get_raw(self, *, gist_id, sha, filename, **_) -> Response:
+        _, rev = self.store.revision(gist_id, sha)
+        if filename not in rev.files:
+            raise ApiError(404, "Not Found")
+        return Response(
+            200,
+            raw=rev.files[filename].encode(),
+            headers={"Content-Type": "text/plain; charset=utf-8", "Accept-Ranges": "bytes"},
+        )
+
+    def _update_gist(self, *, user, gist_id, body, base, **_) -> Response:
+        user = self._require_user(user)
+        return Response(200, self._render_gist(self.store.update(gist_id, user, self._json_body(body)), base))
+
+    def _delete_gist(self, *, user, gist_id, **_) -> Response:
+        self.store.delete(gist_id, self._require_user(user))
+        return Response(204)
+
+    def _list_commits(self, *, gist_id, query, base, path, **_) -> Response:
+        record, history = self.store.commits(gist_id)
+        chunk, headers = self._page(history, query, path, base)
+        return Response(200, [self._render_revision(record, rev, base) for rev in chunk], headers)
+
+    def _list_forks(self, *, gist_id, query, base, path, **_) -> Response:
+        chunk, headers = self._page(self.store.forks(gist_id), query, path, base)
+        return Response(200, [self._render_gist(r, base, full=False) for r in chunk], headers)
+
+    def _fork_gist(self, *, user, gist_id, base, **_) -> Response:
+        fork = self.store.fork(gist_id, self._require_user(user))
+        return Response(201, self._render_gist(fork, base), {"Location": f"{base}/gists/{fork.id}"})
+
+    def _check_star(self, *, user, gist_id, **_) -> Response:
+        starred = self.store.is_starred(gist_id, self._require_user(user))
+        return Response(204) if starred else self._error(ApiError(404, "Not Found"))
+
+    def _star(self, *, user, gist_id, **_) -> Response:
+        self.store.star(gist_id, self._require_user(user), True)
+        return Response(204)
+
+    def _unstar(self, *, user, gist_id, **_) -> Response:
+        self.store.star(gist_id, self._require_user(user), False)
+        return Response(204)
+
+
+def _bearer_token(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    scheme, _, token = value.partition(" ")
+    if scheme.lower() not in ("bearer", "token"):
+        return None
+    return token.strip() or None
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out as separate writes; without TCP_NODELAY keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+    server: "_HTTPServer"
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        base = f"http://{self.headers.get('Host') or '%s:%s' % self.server.server_address[:2]}"
+        try:
+            resp = self.server.app.handle(self.command, self.path, self.headers, body, base)
+        except Exception as e:
+            logger.exception(f"Fake server failed on {self.command} {self.path}: {e}")
+            resp = Response(500, {"message": "Internal Server Error", "documentation_url": DOCS_URL})
+
+        if resp.raw is not None:
+            payload = resp.raw
+        elif resp.body is not None:
+            payload = json.dumps(resp.body).encode()
+        else:
+            payload = b""
+        self.send_response(resp.status)
+        headers = resp.headers or {}
+        if payload and "Content-Type" not in headers:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("fake-gists %s - %s", self.address_string(), format % args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+    app: GistsApp
+
+
+class FakeGistsServer:
+    """
+    In-process stand-in for the GitHub Gists REST API, served over real HTTP on localhost:
+    - CRUD, star/unstar, forks, commits and revisions, public/user/starred listings
+    - `per_page`/`page` with GitHub-style `Link` headers, `since` filtering
+    - 401 without a bearer token on protected endpoints, 404 for unknown/foreign gists, 422 on invalid payloads
+    - raw file downloads (`raw_url`) honouring single `Range: bytes=` requests with 206/416
+    - ETag/304 on GETs, plus optional latency, error-rate and rate-limit emulation (see FakeServerOptions)
+
+    Usage:
+        with FakeGistsServer(FakeServerOptions(latency=0.01)) as server:
+            client = HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer any"})
+    """
+
+    def __init__(self, options: Optional[FakeServerOptions] = None, store: Optional[GistStore] = None) -> None:
+        self.options = options or FakeServerOptions()
+        self.store = store if store is not None else GistStore()
+        if store is None and self.options.seed_public:
+            self.store.seed(self.options.seed_public, owner=self.options.seed_owner)
+        self.app = GistsApp(self.store, self.options)
+        self._httpd: Optional[_HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("Fake server is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGistsServer":
+        if self._httpd is not None:
+            return self
+        self._httpd = _HTTPServer((self.options.host, self.options.port), _RequestHandler)
+        self._httpd.app = self.app
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-gists-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Fake Gists API listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self) -> "FakeGistsServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
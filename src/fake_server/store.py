@@ -0,0 +1,274 @@
+import hashlib
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+
+class ApiError(Exception):
+    """Raised by the store to produce a GitHub-style error response."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Revision:
+    version: str
+    committed_at: str
+    user: str
+    files: dict[str, str]
+    additions: int = 0
+    deletions: int = 0
+
+
+@dataclass
+class GistRecord:
+    id: str
+    owner: str
+    public: bool
+    description: Optional[str]
+    files: dict[str, str]
+    created_at: str
+    updated_at: str
+    history: list[Revision] = field(default_factory=list)
+    forks: list[str] = field(default_factory=list)
+    fork_of: Optional[str] = None
+    starred_by: set[str] = field(default_factory=set)
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_since(since: Optional[str]) -> Optional[datetime]:
+    if not since:
+        return None
+    try:
+        return datetime.fromisoformat(since.replace("Z", "+00:00"))
+    except ValueError:
+        raise ApiError(422, f"Invalid value for 'since': {since}")
+
+
+def _line_count(text: str) -> int:
+    return len(text.splitlines()) or (1 if text else 0)
+
+
+class GistStore:
+    """
+    Thread-safe in-memory state behind the fake Gists API.
+    Mirrors the GitHub semantics the client relies on: owner-only writes, 404 for unknown ids,
+    422 for invalid payloads, per-update revisions, forks and per-user stars.
+    `clock` returns the `created_at` / `updated_at` stamps (default: the current UTC second).
+    """
+
+    def __init__(self, clock: Optional[Callable[[], str]] = None) -> None:
+        self.clock = clock or utc_now
+        self._gists: dict[str, GistRecord] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._gists)
+
+    def _get(self, gist_id: str) -> GistRecord:
+        record = self._gists.get(gist_id)
+        if record is None:
+            raise ApiError(404, "Not Found")
+        return record
+
+    def _get_owned(self, gist_id: str, user: str) -> GistRecord:
+        record = self._get(gist_id)
+        if record.owner != user:
+            raise ApiError(404, "Not Found")
+        return record
+
+    @staticmethod
+    def _validate_files(files: Any, *, allow_null: bool) -> dict[str, Any]:
+        if not isinstance(files, dict) or not files:
+            raise ApiError(422, "Invalid request.\n\n\"files\" wasn't supplied.")
+        for name, spec in files.items():
+            if spec is None and allow_null:
+                continue
+            if not isinstance(spec, dict):
+                raise ApiError(422, f"Invalid request.\n\nInvalid file spec for \"{name}\".")
+            if "content" in spec and not isinstance(spec["content"], str):
+                raise ApiError(422, f"Invalid request.\n\nInvalid content for \"{name}\".")
+            if not allow_null and not spec.get("content"):
+                raise ApiError(422, "Validation Failed: contents can't be blank")
+        return files
+
+    @staticmethod
+    def _new_version(gist_id: str, files: dict[str, str], when: str) -> str:
+        h = hashlib.sha1(gist_id.encode())
+        h.update(when.encode())
+        h.update(uuid.uuid4().bytes)
+        for name in sorted(files):
+            h.update(name.encode())
+            h.update(files[name].encode())
+        return h.hexdigest()
+
+    def _commit(self, record: GistRecord, user: str, previous: dict[str, str]) -> None:
+        added = sum(_line_count(c) for n, c in record.files.items() if previous.get(n) != c)
+        deleted = sum(_line_count(c) for n, c in previous.items() if record.files.get(n) != c)
+        revision = Revision(
+            version=self._new_version(record.id, record.files, record.updated_at),
+            committed_at=record.updated_at,
+            user=user,
+            files=dict(record.files),
+            additions=added,
+            deletions=deleted,
+        )
+        # Replace rather than mutate so concurrent readers rendering the old list stay consistent.
+        record.history = [revision, *record.history]
+
+    def create(self, user: str, payload: Any) -> GistRecord:
+        if not isinstance(payload, dict):
+            raise ApiError(422, "Invalid request.")
+        files = self._validate_files(payload.get("files"), allow_null=False)
+        now = self.clock()
+        record = GistRecord(
+            id=uuid.uuid4().hex,
+            owner=user,
+            public=bool(payload.get("public", False)),
+            description=payload.get("description"),
+            files={name: spec["content"] for name, spec in files.items()},
+            created_at=now,
+            updated_at=now,
+        )
+        self._commit(record, user, {})
+        with self._lock:
+            self._gists[record.id] = record
+        return record
+
+    def get(self, gist_id: str) -> GistRecord:
+        with self._lock:
+            return self._get(gist_id)
+
+    def revision(self, gist_id: str, sha: str) -> tuple[GistRecord, Revision]:
+        with self._lock:
+            record = self._get(gist_id)
+            for rev in record.history:
+                if rev.version == sha:
+                    return record, rev
+        raise ApiError(404, "Not Found")
+
+    def update(self, gist_id: str, user: str, payload: Any) -> GistRecord:
+        if not isinstance(payload, dict):
+            raise ApiError(422, "Invalid request.")
+        with self._lock:
+            record = self._get_owned(gist_id, user)
+            previous = record.files
+            files = dict(previous)
+            if "files" in payload:
+                for name, spec in self._validate_files(payload["files"], allow_null=True).items():
+                    if spec is None:
+                        files.pop(name, None)
+                        continue
+                    content = spec.get("content", files.get(name))
+                    if content is None:
+                        raise ApiError(422, "Validation Failed: contents can't be blank")
+                    new_name = spec.get("filename") or name
+                    if new_name != name:
+                        files.pop(name, None)
+                    files[new_name] = content
+                if not files:
+                    raise ApiError(422, "Validation Failed: files can't be empty")
+            if "description" in payload:
+                record.description = payload["description"]
+            record.files = files
+            record.updated_at = self.clock()
+            if files != previous:
+                self._commit(record, user, previous)
+            return record
+
+    def delete(self, gist_id: str, user: str) -> None:
+        with self._lock:
+            record = self._get_owned(gist_id, user)
+            del self._gists[gist_id]
+            if record.fork_of and record.fork_of in self._gists:
+                forks = self._gists[record.fork_of].forks
+                if gist_id in forks:
+                    forks.remove(gist_id)
+
+    def fork(self, gist_id: str, user: str) -> GistRecord:
+        with self._lock:
+            source = self._get(gist_id)
+            if source.owner == user:
+                raise ApiError(422, "Validation Failed: You cannot fork your own gist")
+            now = self.clock()
+            fork = GistRecord(
+                id=uuid.uuid4().hex,
+                owner=user,
+                public=source.public,
+                description=source.description,
+                files=dict(source.files),
+                created_at=now,
+                updated_at=now,
+                history=list(source.history),
+                fork_of=source.id,
+            )
+            self._gists[fork.id] = fork
+            source.forks.append(fork.id)
+            return fork
+
+    def forks(self, gist_id: str) -> list[GistRecord]:
+        with self._lock:
+            return [self._gists[f] for f in self._get(gist_id).forks if f in self._gists]
+
+    def commits(self, gist_id: str) -> tuple[GistRecord, list[Revision]]:
+        with self._lock:
+            record = self._get(gist_id)
+            return record, list(record.history)
+
+    def is_starred(self, gist_id: str, user: str) -> bool:
+        with self._lock:
+            return user in self._get(gist_id).starred_by
+
+    def star(self, gist_id: str, user: str, starred: bool) -> None:
+        with self._lock:
+            record = self._get(gist_id)
+            if starred:
+                record.starred_by.add(user)
+            else:
+                record.starred_by.discard(user)
+
+    def query(
+        self,
+        *,
+        owner: Optional[str] = None,
+        public_only: bool = False,
+        starred_by: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> list[GistRecord]:
+        since_dt = parse_since(since)
+        with self._lock:
+            records = list(self._gists.values())
+        result = []
+        for record in records:
+            if owner is not None and record.owner != owner:
+                continue
+            if public_only and not record.public:
+                continue
+            if starred_by is not None and starred_by not in record.starred_by:
+                continue
+            if since_dt is not None and parse_since(record.updated_at) < since_dt:
+                continue
+            result.append(record)
+        result.sort(key=lambda r: (r.updated_at, r.created_at), reverse=True)
+        return result
+
+    def seed(self, count: int, owner: str = "octocat", public: bool = True) -> list[GistRecord]:
+        return [
+            self.create(
+                owner,
+                {
+                    "description": f"seed gist {i}",
+                    "public": public,
+                    "files": {f"seed_{i}.txt": {"content": f"seed content {i}\n"}},
+                },
+            )
+            for i in range(count)
+        ]
@@ -1,16 +1,28 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
 from json import JSONDecodeError
 from pprint import pformat
-from typing import Any, Mapping, Optional
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence
 
-import allure
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from src.cache import ResponseCache
+from src.cassette import Cassette, active_cassette
+from src.metrics import RequestTiming
+from src.rate_limit import RateLimitScheduler
+from src.reporting import AllureReporter, default_reporter
+from src.retry import IDEMPOTENT_METHODS, MAX_RETRY_AFTER, AdaptiveRetry, CircuitBreakers, RetryBudget
+from src.single_flight import SingleFlight, flight_key
+from src.transport import InstrumentedHTTPAdapter, track
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+RETRY_ALLOWED_METHODS = IDEMPOTENT_METHODS
+
 
 class HttpMethod(str, Enum):
     GET = "GET"
@@ -20,14 +32,99 @@ class HttpMethod(str, Enum):
     DELETE = "DELETE"
 
 
+@dataclass
+class RequestSpec:
+    """Arguments of one HttpClient.request call, for HttpClient.batch."""
+
+    method: HttpMethod | str
+    url: str
+    params: Optional[dict[str, Any]] = None
+    headers: Optional[Mapping[str, str]] = None
+    cookies: Optional[dict[str, str]] = None
+    json: Any | None = None
+    data: Any | None = None
+    expected_status: int | None = None
+    timeout: int | float | tuple | None = None
+
+
+@dataclass
+class BatchItem:
+    spec: RequestSpec
+    response: Optional[requests.Response] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchError(AssertionError):
+    def __init__(self, failures: list[BatchItem], total: int) -> None:
+        self.failures = failures
+        details = "\n".join(
+            f"- {item.spec.method} {item.spec.url}: {type(item.error).__name__}: {item.error}"
+            for item in failures[:10]
+        )
+        more = f"\n... and {len(failures) - 10} more" if len(failures) > 10 else ""
+        super().__init__(f"{len(failures)} of {total} batched requests failed:\n{details}{more}")
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of HttpClient.batch, one item per spec in the original order:
+    - responses: the responses in order (None for failed items)
+    - failures: items whose request raised (transport error or expected_status mismatch)
+    - raise_for_failures(): raises BatchError listing the failures, if any
+    """
+
+    items: list[BatchItem] = field(default_factory=list)
+
+    def __iter__(self) -> Iterator[BatchItem]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def responses(self) -> list[Optional[requests.Response]]:
+        return [item.response for item in self.items]
+
+    @property
+    def failures(self) -> list[BatchItem]:
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def raise_for_failures(self) -> "BatchResult":
+        failures = self.failures
+        if failures:
+            raise BatchError(failures, len(self.items))
+        return self
+
+
 class HttpClient:
     """
     HTTP client wrapper around requests.Session with:
     - base_url handling
     - default headers and cookies
-    - retries for transient errors
+    - retries for transient errors, limited to idempotent requests, paced by Retry-After / X-RateLimit-Reset
+      and capped by a retry budget (see src.retry.AdaptiveRetry / RetryBudget)
+    - a circuit breaker per URL template that fails fast while an endpoint keeps failing (see src.retry.CircuitBreakers)
     - expected status code assertion
-    - Allure attachments for request/response
+    - Allure attachments for request/response, size-capped and sampled per endpoint (see src.reporting)
+    - optional ETag / Last-Modified revalidation of GET responses (see src.cache.ResponseCache)
+    - optional pacing by X-RateLimit-* / Retry-After headers (see src.rate_limit.RateLimitScheduler)
+    - request hooks receiving per-request phase timings (see src.metrics.RequestTiming / RequestMetrics)
+    - opt-in coalescing of identical concurrent GETs into one request (coalesce_gets=True, see src.single_flight);
+      the callers then share one response object, which must be treated as read-only
+    - optional record/replay of responses (see src.cassette.Cassette; default: src.cassette.active_cassette())
+    - safe to share between threads: per-request headers and cookies never touch the session;
+      batch() / map() fan requests out over a bounded thread pool (size it with pool_maxsize)
+    - keep-alive pools sized per host (pool_host_maxsize), pre-opened with warm_up(), with connections idle
+      for longer than pool_idle_timeout closed, and live opened/reused/discarded/blocked counters in pool_stats()
     """
 
     def __init__(
@@ -40,26 +137,81 @@ class HttpClient:
         timeout: int | float | tuple | None = 30,
         retries_total: int = 3,
         backoff_factor: float = 0.3,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimitScheduler] = None,
+        hooks: Optional[Iterable[Callable[[RequestTiming], None]]] = None,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        pool_host_maxsize: Optional[Mapping[str, int]] = None,
+        pool_idle_timeout: Optional[float] = None,
+        reporter: Optional[AllureReporter] = None,
+        cassette: Optional[Cassette] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        max_retry_after: float = MAX_RETRY_AFTER,
+        coalesce_gets: bool = False,
     ) -> None:
         self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or [])
+        self.reporter = reporter or default_reporter()
+        self.cassette = cassette if cassette is not None else active_cassette()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.circuit_breakers = circuit_breakers or CircuitBreakers()
+        self.single_flight = SingleFlight() if coalesce_gets else None
         self.session = requests.Session()
         self.session.headers.update(default_headers or {})
         self.session.cookies.update(default_cookies or {})
         self.session.verify = verify
         self._default_timeout = timeout
+        self.pool_maxsize = pool_maxsize
 
-        retry = Retry(
+        retry = AdaptiveRetry(
             total=retries_total,
             connect=retries_total,
             read=retries_total,
             backoff_factor=backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]),
+            status_forcelist=list(RETRY_STATUS_FORCELIST),
+            allowed_methods=RETRY_ALLOWED_METHODS,
             raise_on_status=False,
+            budget=self.retry_budget,
+            max_retry_after=max_retry_after,
+        )
+        # pool_maxsize bounds the keep-alive connections per host (pool_host_maxsize overrides it for
+        # "host" / "host:port"); with more concurrent threads the extra connections are opened and thrown
+        # away after use (or waited for when pool_block=True)
+        self.adapter = InstrumentedHTTPAdapter(
+            max_retries=retry,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            host_maxsize=pool_host_maxsize,
+            idle_timeout=pool_idle_timeout,
         )
-        adapter = HTTPAdapter(max_retries=retry)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def warm_up(self, connections: Optional[int] = None, url: Optional[str] = None) -> int:
+        """
+        Opens `connections` (default: pool_maxsize) keep-alive connections to `url` (default: base_url)
+        concurrently, paying DNS + TCP + TLS before traffic starts; no request is sent. Capped by the pool
+        size of the host; returns how many connections were opened. Hosts replayed from a cassette are skipped.
+        """
+        prep = self.session.prepare_request(requests.Request(method="GET", url=url or self.base_url))
+        if self.cassette is not None and self.cassette.handles(prep):
+            return 0
+        pool = self.adapter.pool_for(prep, verify=self.session.verify)
+        opened = pool.warm_up(connections or self.pool_maxsize)
+        logger.debug(f"Warmed up {opened} connections to {pool.host}:{pool.port}")
+        return opened
+
+    def pool_stats(self) -> dict[str, dict[str, Any]]:
+        """Live keep-alive pool counters by scheme://host:port (see src.transport.PoolStats), with `idle` connections."""
+        return self.adapter.pool_stats()
+
+    def reap_idle_connections(self, max_idle: float = 0.0) -> int:
+        """Closes pooled connections idle for more than `max_idle` seconds; returns how many were closed."""
+        return self.adapter.reap_idle(max_idle)
 
     def request(
         self,
@@ -75,40 +227,201 @@ class HttpClient:
         expected_status: int | None = None,
         allow_redirects: bool = True,
         timeout: int | float | tuple | None = None,
+        stream: bool = False,
     ) -> requests.Response:
+        # stream=True leaves the body unread (iterate it with iter_content); such responses bypass the
+        # response cache and are only reported when their status is unexpected
         if url.startswith(("http://", "https://")):
             full_url = url
         else:
             full_url = f"{self.base_url}{url}"
 
-        orig_cookies = None
-        if cookies:
-            orig_cookies = self.session.cookies.copy()
-            self.session.cookies.update(cookies)
-
+        # prepare_request merges per-request headers/cookies into the prepared request only;
+        # the shared session is read, never mutated, so concurrent calls cannot see each other's values
         req = requests.Request(
-            method=method, url=full_url, headers=headers, params=params, json=json, data=data, files=files
+            method=method,
+            url=full_url,
+            headers=headers,
+            cookies=cookies,
+            params=params,
+            json=json,
+            data=data,
+            files=files,
         )
         prep = self.session.prepare_request(req)
+        use_cache = self.cache is not None and not stream
 
-        resp = None
+        def fetch() -> requests.Response:
+            cache_key, cached = self.cache.prepare(prep) if use_cache else (None, None)
+            resp = self._send(
+                prep, allow_redirects=allow_redirects, timeout=timeout or self._default_timeout, stream=stream
+            )
+            if use_cache:
+                resp = self.cache.resolve(cache_key, cached, resp)
+            return resp
+
+        if self.single_flight is not None and prep.method == "GET" and not stream:
+            # keyed before the cache adds its conditional headers
+            resp = self.single_flight.do(flight_key(prep.method, prep.url, prep.headers), fetch)
+        else:
+            resp = fetch()
+        unexpected = expected_status is not None and resp.status_code != expected_status
+        if unexpected or not stream:
+            self.reporter.record(resp, unexpected=unexpected)
+        if expected_status is not None:
+            assert resp.status_code == expected_status, (
+                f"Unexpected status {resp.status_code}, expected {expected_status}.\n"
+                f"URL: {full_url}\nBody: {self._safe_body(resp)}"
+            )
+        return resp
+
+    def batch(self, specs: Sequence[RequestSpec], max_workers: Optional[int] = None) -> BatchResult:
+        """
+        Sends `specs` concurrently on at most `max_workers` threads (default: pool_maxsize) and returns
+        their outcomes in the order of `specs`. A failing request does not cancel the others; inspect
+        BatchResult.failures or call raise_for_failures().
+        """
+        specs = list(specs)
+        if not specs:
+            return BatchResult()
+        workers = max(1, min(max_workers or self.pool_maxsize, len(specs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-batch") as executor:
+            return BatchResult(list(executor.map(self._run_spec, specs)))
+
+    def map(
+        self,
+        method: HttpMethod | str,
+        urls: Iterable[str],
+        max_workers: Optional[int] = None,
+        **kw,
+    ) -> BatchResult:
+        """batch() of one request per URL sharing the remaining request() arguments."""
+        return self.batch([RequestSpec(method=method, url=url, **kw) for url in urls], max_workers=max_workers)
+
+    def _run_spec(self, spec: RequestSpec) -> BatchItem:
         try:
-            resp = self.session.send(
-                prep,
-                allow_redirects=allow_redirects,
-                timeout=timeout or self._default_timeout,
-                verify=self.session.verify,
+            resp = self.request(
+                method=spec.method,
+                url=spec.url,
+                params=spec.params,
+                headers=spec.headers,
+                cookies=spec.cookies,
+                json=spec.json,
+                data=spec.data,
+                expected_status=spec.expected_status,
+                timeout=spec.timeout,
             )
-            self._attach_allure(resp)
-            if expected_status is not None:
-                assert resp.status_code == expected_status, (
-                    f"Unexpected status {resp.status_code}, expected {expected_status}.\n"
-                    f"URL: {full_url}\nBody: {self._safe_body(resp)}"
-                )
+            return BatchItem(spec, response=resp)
+        except Exception as e:
+            logger.debug(f"Batched {spec.method} {spec.url} failed: {e!r}")
+            return BatchItem(spec, error=e)
+
+    def _send(
+        self,
+        prep: requests.PreparedRequest,
+        *,
+        allow_redirects: bool,
+        timeout: int | float | tuple | None,
+        stream: bool = False,
+    ) -> requests.Response:
+        timing = RequestTiming(method=prep.method, url=prep.url) if self.hooks else None
+        started = time.perf_counter()
+        resp = None
+        try:
+            def send() -> requests.Response:
+                return self._send_live(prep, timing, allow_redirects=allow_redirects, timeout=timeout, stream=stream)
+
+            if self.cassette is not None and self.cassette.handles(prep):
+                # replayed responses skip the rate limiter and the network entirely
+                resp = self.cassette.play(prep, send)
+            else:
+                resp = send()
+            return resp
+        except Exception as e:
+            if timing is not None:
+                timing.error = type(e).__name__
+            raise
+        finally:
+            if timing is not None:
+                if stream and resp is not None:
+                    self._emit_timing_on_close(timing, started, resp)
+                else:
+                    self._emit_timing(timing, started, resp)
+
+    def _send_live(
+        self,
+        prep: requests.PreparedRequest,
+        timing: Optional[RequestTiming],
+        *,
+        allow_redirects: bool,
+        timeout: int | float | tuple | None,
+        stream: bool,
+    ) -> requests.Response:
+        breaker = self.circuit_breakers.for_url(prep.url)
+        try:
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(prep.method)
+                if timing is not None:
+                    timing.queue_wait += waited
+            # right before sending: a half-open probe slot taken here is always settled by the outcome below
+            breaker.before_request()
+            self.retry_budget.record_request()
+            try:
+                with track(timing):
+                    resp = self.session.send(
+                        prep,
+                        allow_redirects=allow_redirects,
+                        timeout=timeout,
+                        verify=self.session.verify,
+                        stream=stream,
+                    )
+            except Exception:
+                breaker.record_failure()
+                raise
+            # 5xx left after retries count against the endpoint; 4xx are the caller's problem
+            if resp.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if self.rate_limiter is not None:
+                self.rate_limiter.update_from_response(resp)
             return resp
         finally:
-            if orig_cookies is not None:
-                self.session.cookies = orig_cookies
+            if timing is not None:
+                timing.circuit = breaker.state
+
+    def _emit_timing_on_close(self, timing: RequestTiming, started: float, resp: requests.Response) -> None:
+        # a streamed body is read after request() returns: its download ends when the caller closes the response
+        close = resp.close
+        emitted = False
+
+        def close_and_emit() -> None:
+            nonlocal emitted
+            try:
+                close()
+            finally:
+                if not emitted:
+                    emitted = True
+                    self._emit_timing(timing, started, resp)
+
+        resp.close = close_and_emit
+
+    def _emit_timing(self, timing: RequestTiming, started: float, resp: Optional[requests.Response]) -> None:
+        finished = time.perf_counter()
+        timing.total = finished - started
+        if timing.first_byte_at is not None:
+            if timing.sent_at is not None:
+                timing.ttfb = timing.first_byte_at - timing.sent_at
+            timing.download = finished - timing.first_byte_at
+        if resp is not None:
+            timing.status = resp.status_code
+            retries = getattr(resp.raw, "retries", None)
+            timing.retries = len(retries.history) if retries is not None else 0
+        for hook in self.hooks:
+            try:
+                hook(timing)
+            except Exception as e:
+                logger.debug(f"Request hook {hook!r} failed: {e}")
 
     def get(self, url: str, **kw) -> requests.Response:
         return self.request(method=HttpMethod.GET, url=url, **kw)
@@ -134,39 +447,3 @@ class HttpClient:
                 return resp.text
             except Exception:
                 return "<unreadable>"
-
-    @staticmethod
-    def _attach_allure(response: requests.Response) -> None:
-        try:
-            indent = 2
-            req = response.request
-            try:
-                resp_body = pformat(response.json(), indent=indent)
-            except (JSONDecodeError, ValueError, TypeError):
-                resp_body = response.text
-
-            try:
-                req_body = pformat(req.body, indent=indent)
-            except Exception:
-                req_body = str(req.body)
-
-            allure.attach(
-                body=(
-                    f"Request:\n{req.method} {req.url}\n\n"
-                    f"Headers:\n{pformat(dict(req.headers), indent=indent)}\n\n"
-                    f"Body:\n{req_body}\n"
-                ),
-                name=f"{req.method} {req.url}",
-                attachment_type=allure.attachment_type.TEXT,
-            )
-            allure.attach(
-                body=(
-                    f"Status: {response.status_code} {response.reason}\n\n"
-                    f"Headers:\n{pformat(dict(response.headers), indent=indent)}\n\n"
-                    f"Body:\n{resp_body}\n"
-                ),
-                name=f"Response {response.status_code}",
-                attachment_type=allure.attachment_type.TEXT,
-            )
-        except Exception as e:
-            logger.debug(f"Failed to attach allure data: {e}")
@@ -0,0 +1,4 @@
+from src.loadgen.runner import LoadProfile, Recorder, ScenarioContext, StepFailed, run_load
+from src.loadgen.scenarios import SCENARIOS
+
+__all__ = ["LoadProfile", "Recorder", "SCENARIOS", "ScenarioContext", "StepFailed", "run_load"]
@@ -0,0 +1,78 @@
+import argparse
+import json
+import logging
+import os
+import sys
+
+from src.api.gists import GistsAPI
+from src.http_client import HttpClient
+from src.loadgen.runner import LoadProfile, run_load
+from src.loadgen.scenarios import SCENARIOS
+from src.reporting import AttachmentPolicy, default_reporter
+from src.utils.env import load_settings
+
+
+def _weight(value: str) -> tuple[str, float]:
+    name, _, weight = value.partition(":")
+    if name not in SCENARIOS:
+        raise argparse.ArgumentTypeError(f"unknown scenario {name!r}, choose from {', '.join(SCENARIOS)}")
+    try:
+        return name, float(weight or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid weight in {value!r}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.loadgen",
+        description="Open-model load generator for GistsAPI workflows (fixed arrival rate, latency independent).",
+    )
+    parser.add_argument("--base-url", help="Overrides BASE_URL; fake://?... runs against the in-process stand-in")
+    parser.add_argument("--rps", type=float, required=True, help="Target scenario iterations per second")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds to ramp from 0 to --rps")
+    parser.add_argument("--hold", type=float, default=60.0, help="Seconds to hold --rps")
+    parser.add_argument("--ramp-down", type=float, default=0.0, help="Seconds to ramp from --rps to 0")
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        action="append",
+        type=_weight,
+        metavar="NAME[:WEIGHT]",
+        help=f"Weighted scenario, repeatable. Available: {', '.join(SCENARIOS)} (default: crud:1 list_public:1)",
+    )
+    parser.add_argument("--max-workers", type=int, default=256, help="Upper bound of concurrently running iterations")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the scenario picker")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    if args.base_url:
+        os.environ["BASE_URL"] = args.base_url
+    settings = load_settings()
+    # no Allure run to attach to: skip capturing responses altogether
+    default_reporter().configure(default=AttachmentPolicy(mode="off"))
+    headers = {"Authorization": f"Bearer {settings.token}"} if settings.token else {}
+
+    def api_factory() -> GistsAPI:
+        client = HttpClient(base_url=settings.base_url, default_headers=headers)
+        return GistsAPI(client, api_version=settings.api_version)
+
+    weights = dict(args.scenarios or [("crud", 1.0), ("list_public", 1.0)])
+    profile = LoadProfile(rps=args.rps, hold=args.hold, ramp_up=args.ramp_up, ramp_down=args.ramp_down)
+    report = run_load(api_factory, SCENARIOS, weights, profile, max_workers=args.max_workers, seed=args.seed)
+    report["config"]["base_url"] = settings.base_url
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
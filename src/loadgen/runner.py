@@ -0,0 +1,196 @@
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Mapping
+
+from src.api.gists import GistsAPI
+from src.utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadProfile:
+    """Open-model arrival schedule: linear ramp up to `rps`, hold, then linear ramp down (all in seconds)."""
+
+    rps: float
+    hold: float = 60.0
+    ramp_up: float = 0.0
+    ramp_down: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.ramp_up + self.hold + self.ramp_down
+
+    @property
+    def total_arrivals(self) -> int:
+        return int(self.rps * (self.ramp_up / 2 + self.hold + self.ramp_down / 2))
+
+    def arrivals(self) -> Iterator[float]:
+        """Yields intended start offsets of iterations by inverting the cumulative arrival curve."""
+        up = self.rps * self.ramp_up / 2
+        hold = self.rps * self.hold
+        for k in range(self.total_arrivals):
+            if k < up:
+                yield math.sqrt(2 * k * self.ramp_up / self.rps)
+            elif k < up + hold:
+                yield self.ramp_up + (k - up) / self.rps
+            else:
+                m = k - up - hold
+                s = self.ramp_down * (1 - math.sqrt(max(0.0, 1 - 2 * m / (self.rps * self.ramp_down))))
+                yield self.ramp_up + self.hold + s
+
+
+class StepFailed(Exception):
+    """Aborts the current scenario iteration after a failed call (already recorded)."""
+
+
+@dataclass
+class Stats:
+    latency: Histogram = field(default_factory=Histogram)
+    corrected_latency: Histogram = field(default_factory=Histogram)
+    count: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+
+    def to_dict(self, duration: float) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "throughput_rps": self.count / duration if duration else None,
+            "statuses": dict(self.statuses),
+            "errors": dict(self.errors),
+            "latency": self.latency.to_dict(),
+            "corrected_latency": self.corrected_latency.to_dict(with_buckets=True),
+        }
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, Stats] = {}
+        self.scenarios: dict[str, Stats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, table: dict[str, Stats], name: str) -> Stats:
+        with self._lock:
+            return table.setdefault(name, Stats())
+
+    def observe(
+        self, table: dict[str, Stats], name: str, elapsed: float, lag: float, status: str, error: str | None
+    ) -> None:
+        stats = self._stats(table, name)
+        stats.latency.record(elapsed)
+        stats.corrected_latency.record(elapsed + lag)
+        with self._lock:
+            stats.count += 1
+            stats.statuses[status] += 1
+            if error is not None:
+                stats.errors[error] += 1
+
+
+class ScenarioContext:
+    """
+    Handed to scenario functions; `call` runs one GistsAPI method and records it under the method name.
+    `lag` is how late the iteration started compared to its schedule; it is added to every step's
+    corrected latency, which is what a client arriving on time would have observed (coordinated omission).
+    """
+
+    def __init__(self, api: GistsAPI, recorder: Recorder, lag: float) -> None:
+        self.api = api
+        self.recorder = recorder
+        self.lag = lag
+
+    def call(self, endpoint: str, expected_status: int, *args: Any, **kwargs: Any):
+        method = getattr(self.api, endpoint)
+        started = time.perf_counter()
+        try:
+            resp = method(*args, expected_status=None, **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            self.recorder.observe(self.recorder.endpoints, endpoint, elapsed, self.lag, "exception", type(e).__name__)
+            raise StepFailed(f"{endpoint}: {e!r}") from e
+        elapsed = time.perf_counter() - started
+        status = str(resp.status_code)
+        error = status if resp.status_code != expected_status else None
+        self.recorder.observe(self.recorder.endpoints, endpoint, elapsed, self.lag, status, error)
+        if error is not None:
+            raise StepFailed(f"{endpoint}: unexpected status {status}, expected {expected_status}")
+        return resp
+
+
+def run_load(
+    api_factory: Callable[[], GistsAPI],
+    scenarios: Mapping[str, Callable[[ScenarioContext], None]],
+    weights: Mapping[str, float],
+    profile: LoadProfile,
+    *,
+    max_workers: int = 256,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    """
+    Drives weighted scenarios at the arrival rate of `profile`, independent of response latency:
+    iterations are submitted on schedule even when earlier ones are still running (open model).
+    Each worker thread gets its own GistsAPI from `api_factory`. Returns the JSON-ready report.
+    """
+    names = list(weights)
+    rng = random.Random(seed)
+    recorder = Recorder()
+    local = threading.local()
+
+    def worker_api() -> GistsAPI:
+        api = getattr(local, "api", None)
+        if api is None:
+            api = local.api = api_factory()
+        return api
+
+    def run_iteration(name: str, intended: float) -> None:
+        started = time.perf_counter()
+        lag = max(0.0, started - intended)
+        error = None
+        try:
+            scenarios[name](ScenarioContext(worker_api(), recorder, lag))
+        except StepFailed as e:
+            error = "step_failed"
+            logger.debug(f"Scenario {name} failed: {e}")
+        except Exception as e:
+            error = type(e).__name__
+            logger.warning(f"Scenario {name} crashed: {e!r}")
+        elapsed = time.perf_counter() - started
+        recorder.observe(recorder.scenarios, name, elapsed, lag, "failed" if error else "ok", error)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="loadgen") as executor:
+        for offset in profile.arrivals():
+            intended = t0 + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            executor.submit(run_iteration, name, intended)
+    elapsed = time.perf_counter() - t0
+
+    requests_total = sum(s.count for s in recorder.endpoints.values())
+    errors_total = sum(sum(s.errors.values()) for s in recorder.endpoints.values())
+    return {
+        "config": {
+            "rps": profile.rps,
+            "ramp_up_s": profile.ramp_up,
+            "hold_s": profile.hold,
+            "ramp_down_s": profile.ramp_down,
+            "weights": dict(weights),
+            "max_workers": max_workers,
+        },
+        "duration_s": elapsed,
+        "totals": {
+            "iterations": sum(s.count for s in recorder.scenarios.values()),
+            "requests": requests_total,
+            "errors": errors_total,
+            "throughput_rps": requests_total / elapsed if elapsed else None,
+        },
+        "scenarios": {name: stats.to_dict(elapsed) for name, stats in sorted(recorder.scenarios.items())},
+        "endpoints": {name: stats.to_dict(elapsed) for name, stats in sorted(recorder.endpoints.items())},
+    }
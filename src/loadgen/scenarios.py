@@ -0,0 +1,54 @@
+from typing import Callable
+from uuid import uuid4
+
+from src.loadgen.runner import ScenarioContext
+
+LIST_PAGES = 3
+LIST_PER_PAGE = 30
+
+
+def _payload(tag: str) -> dict:
+    suffix = uuid4().hex[:8]
+    return {
+        "description": f"load-{tag}-{suffix}",
+        "public": False,
+        "files": {f"load_{suffix}.txt": {"content": f"load test {suffix}"}},
+    }
+
+
+def crud(ctx: ScenarioContext) -> None:
+    """create_gist → get_gist → update_gist → delete_gist."""
+    gist = ctx.call("create_gist", 201, _payload("crud")).json()
+    gist_id = gist["id"]
+    filename = next(iter(gist["files"]))
+    try:
+        ctx.call("get_gist", 200, gist_id)
+        ctx.call("update_gist", 200, gist_id, {"files": {filename: {"content": "updated by load test"}}})
+    finally:
+        ctx.call("delete_gist", 204, gist_id)
+
+
+def list_public(ctx: ScenarioContext) -> None:
+    """list_public_gists, following the Link header for up to LIST_PAGES pages."""
+    for page in range(1, LIST_PAGES + 1):
+        resp = ctx.call("list_public_gists", 200, per_page=LIST_PER_PAGE, page=page)
+        if "next" not in resp.links:
+            return
+
+
+def star_cycle(ctx: ScenarioContext) -> None:
+    """create_gist → star → check_starred → unstar → delete_gist."""
+    gist_id = ctx.call("create_gist", 201, _payload("star")).json()["id"]
+    try:
+        ctx.call("star", 204, gist_id)
+        ctx.call("check_starred", 204, gist_id)
+        ctx.call("unstar", 204, gist_id)
+    finally:
+        ctx.call("delete_gist", 204, gist_id)
+
+
+SCENARIOS: dict[str, Callable[[ScenarioContext], None]] = {
+    "crud": crud,
+    "list_public": list_public,
+    "star_cycle": star_cycle,
+}
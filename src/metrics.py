@@ -0,0 +1,212 @@
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from src.utils.histogram import Histogram
+
+PHASES = ("total", "queue_wait", "connect", "tls", "ttfb", "download")
+
+# states of src.retry.CircuitBreaker (not imported: src.retry depends on this module)
+CIRCUIT_STATES = ("closed", "open", "half_open")
+
+# Prometheus `le` bounds in seconds, covering local stand-ins (sub-ms) up to slow GitHub calls.
+PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_TEMPLATES: list[tuple[re.Pattern, str]] = [
+    (re.compile(f"^{pattern}$"), template)
+    for pattern, template in [
+        (r"/gists/(public|starred)", r"/gists/\1"),
+        (r"/gists/[^/]+/(star|forks|commits)", r"/gists/{id}/\1"),
+        (r"/gists/[^/]+/[0-9a-f]{40}", "/gists/{id}/{sha}"),
+        (r"/gists/[^/]+", "/gists/{id}"),
+        (r"/users/[^/]+/gists", "/users/{username}/gists"),
+        (r"/raw/[^/]+/[0-9a-f]{40}/.+", "/raw/{id}/{sha}/{filename}"),
+    ]
+]
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-f]{20,}|\d+)(?=/|$)")
+
+
+def url_template(url: str) -> str:
+    """Maps a concrete URL to its endpoint template, e.g. /gists/aa12.../star -> /gists/{id}/star."""
+    path = urlsplit(url).path.rstrip("/") or "/"
+    for pattern, template in _TEMPLATES:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+@dataclass
+class RequestTiming:
+    """
+    Timings of one HttpClient.request call, in seconds (None when the phase did not happen,
+    e.g. connect/tls on a reused keep-alive connection):
+    - queue_wait: time blocked before the request could be sent: rate limiter, plus waiting for a free
+      pooled connection when the pool blocks (pool_block=True)
+    - connect / tls: TCP connect and TLS handshake of new connections, summed over retries
+    - ttfb: from writing the last attempt's request until its response headers were parsed
+    - download: from the response headers until the body was fully read; with stream=True the body is read
+      by the caller, so the timing is emitted when the response is closed and download/total end there
+    - circuit: state of the endpoint's circuit breaker after the request (see src.retry.CircuitBreaker)
+    """
+
+    method: str
+    url: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    retries: int = 0
+    total: float = 0.0
+    queue_wait: float = 0.0
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    ttfb: Optional[float] = None
+    download: Optional[float] = None
+    circuit: Optional[str] = None
+    sent_at: Optional[float] = field(default=None, repr=False)
+    first_byte_at: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def endpoint(self) -> str:
+        return url_template(self.url)
+
+
+class _EndpointMetrics:
+    def __init__(self) -> None:
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.statuses: dict[str, int] = {}
+        self.retries = 0
+        self.circuit: Optional[str] = None
+
+
+class RequestMetrics:
+    """
+    Request hook for HttpClient aggregating RequestTiming per (method, URL template):
+    phase histograms, status counters, retry counts and the last seen circuit breaker state.
+    Export with to_prometheus() / to_dict().
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: dict[tuple[str, str], _EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, timing: RequestTiming) -> None:
+        self.observe(timing)
+
+    def observe(self, timing: RequestTiming) -> None:
+        key = (timing.method, timing.endpoint)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = _EndpointMetrics()
+            status = str(timing.status) if timing.status is not None else (timing.error or "error")
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.retries += timing.retries
+            if timing.circuit is not None:
+                metrics.circuit = timing.circuit
+        for phase, histogram in metrics.phases.items():
+            value = getattr(timing, phase)
+            if value is not None:
+                histogram.record(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def _snapshot(self) -> list[tuple[tuple[str, str], _EndpointMetrics]]:
+        with self._lock:
+            return sorted(self._endpoints.items())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            f"{method} {endpoint}": {
+                "method": method,
+                "endpoint": endpoint,
+                "statuses": dict(metrics.statuses),
+                "retries": metrics.retries,
+                "circuit": metrics.circuit,
+                "phases": {phase: h.to_dict() for phase, h in metrics.phases.items() if h.count},
+            }
+            for (method, endpoint), metrics in self._snapshot()
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "http_client") -> str:
+        lines = [
+            f"# HELP {prefix}_request_phase_seconds Client-side request timings by phase.",
+            f"# TYPE {prefix}_request_phase_seconds histogram",
+        ]
+        counters = [
+            f"# HELP {prefix}_requests_total Completed requests by final status.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        retries = [
+            f"# HELP {prefix}_retries_total Transparent retries performed.",
+            f"# TYPE {prefix}_retries_total counter",
+        ]
+        circuits = [
+            f"# HELP {prefix}_circuit_state Circuit breaker state of the endpoint (1 for the current state).",
+            f"# TYPE {prefix}_circuit_state gauge",
+        ]
+        for (method, endpoint), metrics in self._snapshot():
+            labels = f'method="{method}",endpoint="{_escape(endpoint)}"'
+            for phase, histogram in metrics.phases.items():
+                if not histogram.count:
+                    continue
+                phase_labels = f'{labels},phase="{phase}"'
+                for bound, count in histogram.cumulative_buckets(PROMETHEUS_BUCKETS):
+                    lines.append(f'{prefix}_request_phase_seconds_bucket{{{phase_labels},le="{bound:g}"}} {count}')
+                lines.append(f'{prefix}_request_phase_seconds_bucket{{{phase_labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{prefix}_request_phase_seconds_sum{{{phase_labels}}} {histogram.total:.6f}")
+                lines.append(f"{prefix}_request_phase_seconds_count{{{phase_labels}}} {histogram.count}")
+            for status, count in sorted(metrics.statuses.items()):
+                counters.append(f'{prefix}_requests_total{{{labels},status="{_escape(status)}"}} {count}')
+            retries.append(f"{prefix}_retries_total{{{labels}}} {metrics.retries}")
+            if metrics.circuit is not None:
+                for state in CIRCUIT_STATES:
+                    circuits.append(f'{prefix}_circuit_state{{{labels},state="{state}"}} {int(state == metrics.circuit)}')
+        return "\n".join(lines + counters + retries + circuits) + "\n"
+
+    def slowest(self, limit: int = 10, phase: str = "total", percentile: float = 95) -> list[dict[str, Any]]:
+        """Endpoints ordered by the given percentile of `phase`, slowest first."""
+        rows = []
+        for (method, endpoint), metrics in self._snapshot():
+            histogram = metrics.phases[phase]
+            if not histogram.count:
+                continue
+            rows.append(
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": histogram.count,
+                    "p50": histogram.percentile(50),
+                    f"p{percentile:g}": histogram.percentile(percentile),
+                    "max": histogram.max,
+                    "total": histogram.total,
+                    "ttfb_p50": metrics.phases["ttfb"].percentile(50),
+                    "retries": metrics.retries,
+                }
+            )
+        rows.sort(key=lambda r: r[f"p{percentile:g}"], reverse=True)
+        return rows[:limit]
+
+    def format_slowest(self, limit: int = 10) -> list[str]:
+        rows = self.slowest(limit)
+        if not rows:
+            return []
+        header = f"{'method':<7} {'endpoint':<32} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'ttfb p50':>9} {'retries':>7}"
+        lines = [header, "-" * len(header)]
+        for r in rows:
+            ttfb = f"{r['ttfb_p50'] * 1000:9.1f}" if r["ttfb_p50"] is not None else f"{'-':>9}"
+            lines.append(
+                f"{r['method']:<7} {r['endpoint']:<32} {r['count']:>6} {r['p50'] * 1000:9.1f} "
+                f"{r['p95'] * 1000:9.1f} {r['max'] * 1000:9.1f} {ttfb} {r['retries']:>7}"
+            )
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
@@ -0,0 +1,332 @@
+import logging
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from src.api.gists import GistsAPI
+from src.api.models import Gist, GistFile
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# allowance for the server clock running ahead of ours when comparing its stamps with sync start times
+CLOCK_SKEW = timedelta(seconds=5)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS gists (
+    scope TEXT NOT NULL,
+    id TEXT NOT NULL,
+    owner TEXT,
+    description TEXT,
+    public INTEGER NOT NULL,
+    created_at TEXT,
+    updated_at TEXT NOT NULL,
+    html_url TEXT,
+    comments INTEGER NOT NULL DEFAULT 0,
+    fork_of TEXT,
+    body_updated_at TEXT,
+    PRIMARY KEY (scope, id)
+);
+CREATE INDEX IF NOT EXISTS gists_owner ON gists (scope, owner, updated_at);
+CREATE INDEX IF NOT EXISTS gists_updated_at ON gists (scope, updated_at);
+CREATE TABLE IF NOT EXISTS files (
+    scope TEXT NOT NULL,
+    gist_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    type TEXT,
+    language TEXT,
+    raw_url TEXT,
+    truncated INTEGER NOT NULL DEFAULT 0,
+    content TEXT,
+    PRIMARY KEY (scope, gist_id, filename),
+    FOREIGN KEY (scope, gist_id) REFERENCES gists (scope, id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_language ON files (scope, language);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    high_water TEXT,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class SyncReport:
+    """
+    Result of one GistMirror.sync run:
+    - listed: gists returned by the list endpoint (only those updated since the previous high-water mark)
+    - fetched: gist bodies (files and content) downloaded because they were new or changed
+    - unchanged: listed gists whose stored body was already up to date
+    - pruned: local gists removed by a full sync because the account no longer lists them
+    """
+
+    scope: str
+    since: Optional[str]
+    high_water: Optional[str]
+    listed: int = 0
+    fetched: int = 0
+    unchanged: int = 0
+    pruned: int = 0
+    failed: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class GistMirror:
+    """
+    Local SQLite mirror of a gist listing, kept up to date incrementally with the `since` parameter.
+
+    - sync(): lists gists updated at or after the stored high-water mark (the first run lists everything),
+      fetches new or changed bodies on up to `max_workers` threads and writes everything in one transaction;
+      the high-water mark only advances when every body was fetched
+    - sync(full=True): lists everything and prunes gists that disappeared (`since` cannot report deletions)
+    - get() / query() / count(): indexed local reads returning src.api.models.Gist objects
+
+    Rows are keyed by scope ("authenticated" or "user:<username>"), so mirrors of different listings can
+    share one database file without a full sync of one pruning the other.
+    """
+
+    def __init__(
+        self,
+        api: GistsAPI,
+        path: str | Path = ":memory:",
+        username: Optional[str] = None,
+        max_workers: int = 8,
+        per_page: int = 100,
+    ) -> None:
+        self.api = api
+        self.username = username
+        self.scope = f"user:{username}" if username else "authenticated"
+        self.max_workers = max_workers
+        self.per_page = per_page
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "GistMirror":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def high_water(self) -> Optional[str]:
+        return self._state()[0]
+
+    def _state(self) -> tuple[Optional[str], Optional[str]]:
+        row = self.db.execute("SELECT high_water, synced_at FROM sync_state WHERE scope = ?", (self.scope,)).fetchone()
+        return (row["high_water"], row["synced_at"]) if row else (None, None)
+
+    def _listing(self, since: Optional[str]) -> Iterator[dict[str, Any]]:
+        if self.username:
+            return self.api.iter_gists_for_user(self.username, since=since, per_page=self.per_page, prefetch=True)
+        return self.api.iter_gists_for_authenticated_user(since=since, per_page=self.per_page, prefetch=True)
+
+    def sync(self, full: bool = False) -> SyncReport:
+        started = time.monotonic()
+        started_at = datetime.now(timezone.utc)
+        since, last_synced_at = (None, None) if full else self._state()
+        # timestamps have one-second resolution: a gist stamped with the previous high-water mark may have
+        # changed again within that second, after its body was fetched, unless that sync started later
+        since_settled = since is not None and last_synced_at is not None and since < _format(
+            _parse(last_synced_at) - CLOCK_SKEW
+        )
+        report = SyncReport(scope=self.scope, since=since, high_water=since)
+        stored = dict(
+            self.db.execute("SELECT id, body_updated_at FROM gists WHERE scope = ?", (self.scope,)).fetchall()
+        )
+        seen: set[str] = set()
+        high_water = since
+
+        with self.db, ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gist-mirror") as executor:
+            in_flight: dict[Future, str] = {}
+            for item in self._listing(since):
+                report.listed += 1
+                seen.add(item["id"])
+                updated_at = item["updated_at"]
+                if high_water is None or updated_at > high_water:
+                    high_water = updated_at
+                self._upsert_gist(item)
+                if stored.get(item["id"]) == updated_at and (updated_at != since or since_settled):
+                    report.unchanged += 1
+                    continue
+                in_flight[executor.submit(self._fetch_body, item["id"])] = item["id"]
+                if len(in_flight) >= 2 * self.max_workers:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._store_bodies(done, in_flight, report)
+            self._store_bodies(list(in_flight), in_flight, report)
+
+            if full:
+                gone = set(stored) - seen
+                self.db.executemany(
+                    "DELETE FROM gists WHERE scope = ? AND id = ?", [(self.scope, gist_id) for gist_id in gone]
+                )
+                report.pruned = len(gone)
+            if not report.failed:
+                report.high_water = high_water
+                self.db.execute(
+                    "INSERT INTO sync_state (scope, high_water, synced_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (scope) DO UPDATE SET high_water = excluded.high_water, synced_at = excluded.synced_at",
+                    (self.scope, high_water, _format(started_at)),
+                )
+        report.elapsed = time.monotonic() - started
+        logger.info(f"Mirror sync of {self.scope}: {report}")
+        return report
+
+    def _fetch_body(self, gist_id: str) -> dict[str, Any]:
+        return self.api.get_gist(gist_id).json()
+
+    def _store_bodies(self, done, in_flight: dict[Future, str], report: SyncReport) -> None:
+        # runs on the syncing thread only: the connection is never written from workers
+        for future in done:
+            gist_id = in_flight.pop(future)
+            try:
+                body = future.result()
+            except Exception as e:
+                report.failed[gist_id] = f"{type(e).__name__}: {e}"
+                continue
+            self._upsert_gist(body)
+            self.db.execute("DELETE FROM files WHERE scope = ? AND gist_id = ?", (self.scope, gist_id))
+            self.db.executemany(
+                "INSERT INTO files (scope, gist_id, filename, size, type, language, raw_url, truncated, content) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.scope,
+                        gist_id,
+                        f["filename"],
+                        f.get("size") or 0,
+                        f.get("type"),
+                        f.get("language"),
+                        f.get("raw_url"),
+                        int(bool(f.get("truncated"))),
+                        f.get("content"),
+                    )
+                    for f in (body.get("files") or {}).values()
+                ],
+            )
+            self.db.execute(
+                "UPDATE gists SET body_updated_at = ? WHERE scope = ? AND id = ?", (body["updated_at"], self.scope, gist_id)
+            )
+            report.fetched += 1
+
+    def _upsert_gist(self, data: dict[str, Any]) -> None:
+        owner = data.get("owner") or {}
+        fork_of = data.get("fork_of") or {}
+        self.db.execute(
+            "INSERT INTO gists (scope, id, owner, description, public, created_at, updated_at, html_url, comments, fork_of) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (scope, id) DO UPDATE SET owner = excluded.owner, description = excluded.description, "
+            "public = excluded.public, updated_at = excluded.updated_at, html_url = excluded.html_url, "
+            "comments = excluded.comments, fork_of = excluded.fork_of",
+            (
+                self.scope,
+                data["id"],
+                owner.get("login"),
+                data.get("description"),
+                int(bool(data.get("public"))),
+                data.get("created_at"),
+                data["updated_at"],
+                data.get("html_url"),
+                data.get("comments") or 0,
+                fork_of.get("id"),
+            ),
+        )
+
+    # Local queries
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM gists WHERE scope = ?", (self.scope,)).fetchone()[0]
+
+    def get(self, gist_id: str) -> Optional[Gist]:
+        row = self.db.execute("SELECT * FROM gists WHERE scope = ? AND id = ?", (self.scope, gist_id)).fetchone()
+        return self._to_models([row])[0] if row else None
+
+    def query(
+        self,
+        owner: Optional[str] = None,
+        updated_since: Optional[str] = None,
+        public: Optional[bool] = None,
+        language: Optional[str] = None,
+        description_like: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[Gist]:
+        """Gists matching every given filter, most recently updated first."""
+        where, params = ["scope = ?"], [self.scope]
+        if owner is not None:
+            where.append("owner = ?")
+            params.append(owner)
+        if updated_since is not None:
+            where.append("updated_at >= ?")
+            params.append(updated_since)
+        if public is not None:
+            where.append("public = ?")
+            params.append(int(public))
+        if language is not None:
+            where.append("id IN (SELECT gist_id FROM files WHERE scope = ? AND language = ?)")
+            params.extend([self.scope, language])
+        if description_like is not None:
+            where.append("description LIKE ?")
+            params.append(description_like)
+        sql = "SELECT * FROM gists WHERE " + " AND ".join(where)
+        sql += " ORDER BY updated_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._to_models(self.db.execute(sql, params).fetchall())
+
+    def _to_models(self, rows: list[sqlite3.Row]) -> list[Gist]:
+        if not rows:
+            return []
+        ids = [row["id"] for row in rows]
+        files: dict[str, dict[str, GistFile]] = {gist_id: {} for gist_id in ids}
+        loader = self.api.typed._load_content
+        # chunked to stay below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for f in self.db.execute(
+                f"SELECT * FROM files WHERE scope = ? AND gist_id IN ({placeholders})", [self.scope, *chunk]
+            ):
+                files[f["gist_id"]][f["filename"]] = GistFile(
+                    filename=f["filename"],
+                    raw_url=f["raw_url"],
+                    size=f["size"],
+                    type=f["type"],
+                    language=f["language"],
+                    truncated=bool(f["truncated"]),
+                    _content=f["content"],
+                    _loader=loader,
+                )
+        return [
+            Gist(
+                id=row["id"],
+                description=row["description"],
+                public=bool(row["public"]),
+                owner=row["owner"],
+                files=files[row["id"]],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+                html_url=row["html_url"],
+                comments=row["comments"],
+                fork_of=row["fork_of"],
+            )
+            for row in rows
+        ]
+
+
+def _parse(timestamp: str) -> datetime:
+    return datetime.strptime(timestamp, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def _format(moment: datetime) -> str:
+    return moment.strftime(TIMESTAMP_FORMAT)
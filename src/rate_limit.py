@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+CORE = "core"
+SECONDARY = "secondary"
+
+# GitHub applies its secondary (content-creation) limits to mutating requests.
+SECONDARY_METHODS = frozenset(["POST", "PATCH", "PUT", "DELETE"])
+THROTTLED_STATUSES = frozenset([403, 429])
+
+
+@dataclass
+class RateLimitBudget:
+    resource: str
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    used: Optional[int] = None
+    reset: Optional[float] = None
+    blocked_until: Optional[float] = None
+    rate: Optional[float] = None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `rate` is tokens per second (None disables pacing, 0 leaves only block_for()
+    in effect), `capacity` is the burst size.
+    Tokens may go negative: each caller reserves its slot and sleeps outside the lock, which keeps FIFO-ish order.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: float = 10) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, rate: Optional[float], capacity: Optional[float] = None) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+                self._tokens = min(self._tokens, capacity)
+
+    def block_for(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def blocked_for(self) -> float:
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def reserve(self) -> float:
+        """Takes one token and returns how many seconds the caller must wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._blocked_until - now)
+            if not self.rate:
+                # unpaced, or no budget left (rate 0): only the block until the reset applies
+                return wait
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+
+class RateLimitScheduler:
+    """
+    Paces outgoing requests using the rate-limit state GitHub reports on every response:
+    - X-RateLimit-Limit/-Remaining/-Used/-Reset feed the core bucket, whose rate spreads the
+      remaining budget evenly until the reset time (bursts up to `burst` requests)
+    - mutating requests (create_gist, fork_gist, ...) additionally draw from a secondary bucket
+      paced at `secondary_per_minute`, since GitHub throttles content creation separately
+    - Retry-After (or an exhausted budget) on 403/429 blocks the affected bucket until it expires
+
+    `budgets()` exposes the current state for callers that want to adapt their own concurrency.
+    """
+
+    def __init__(self, *, burst: int = 100, secondary_per_minute: float = 80, secondary_burst: int = 10) -> None:
+        self._buckets = {
+            CORE: TokenBucket(rate=None, capacity=burst),
+            SECONDARY: TokenBucket(rate=secondary_per_minute / 60, capacity=secondary_burst),
+        }
+        self._budgets = {CORE: RateLimitBudget(CORE), SECONDARY: RateLimitBudget(SECONDARY)}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def buckets_for(method: str) -> tuple[str, ...]:
+        return (CORE, SECONDARY) if method.upper() in SECONDARY_METHODS else (CORE,)
+
+    def _reserve(self, method: str) -> float:
+        return max(self._buckets[name].reserve() for name in self.buckets_for(method))
+
+    def acquire(self, method: str) -> float:
+        """Blocks until a request with `method` may be sent. Returns the time spent waiting."""
+        wait = self._reserve(method)
+        if wait > 0:
+            logger.debug(f"Rate limiter delays {method} by {wait:.3f}s")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, method: str) -> float:
+        import asyncio  # only async clients need it; keeps the sync import path light
+
+        wait = self._reserve(method)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def update(self, method: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """Feeds rate-limit headers of a response back into the buckets."""
+        now = time.time()
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        if remaining is not None:
+            with self._lock:
+                budget = self._budgets[CORE]
+                budget.limit = _int_header(headers, "X-RateLimit-Limit")
+                budget.remaining = remaining
+                budget.used = _int_header(headers, "X-RateLimit-Used")
+                budget.reset = float(reset) if reset is not None else None
+                window = max(1.0, (reset - now)) if reset is not None else 3600.0
+                budget.rate = remaining / window
+                # under the lock: a concurrent update could otherwise configure the bucket with a newer rate first
+                self._buckets[CORE].configure(budget.rate)
+                if remaining == 0 and reset is not None:
+                    self._buckets[CORE].block_for(max(0.0, reset - now))
+
+        if status_code in THROTTLED_STATUSES:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                bucket = SECONDARY if method.upper() in SECONDARY_METHODS else CORE
+                logger.warning(f"Throttled with {status_code}; pausing {bucket} requests for {retry_after:.1f}s")
+                self._buckets[bucket].block_for(retry_after)
+
+    def update_from_response(self, response: Any) -> None:
+        self.update(response.request.method, response.status_code, response.headers)
+
+    def budgets(self) -> dict[str, RateLimitBudget]:
+        """Snapshot of the core and secondary budgets."""
+        now = time.time()
+        with self._lock:
+            snapshot = {name: replace(budget) for name, budget in self._budgets.items()}
+        for name, budget in snapshot.items():
+            blocked = self._buckets[name].blocked_for()
+            budget.blocked_until = now + blocked if blocked else None
+            budget.rate = self._buckets[name].rate
+        return snapshot
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header (delta-seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
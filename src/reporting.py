@@ -0,0 +1,252 @@
+import contextlib
+import functools
+import json
+import logging
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, ContextManager, Mapping, Optional
+
+from src.metrics import url_template
+
+logger = logging.getLogger(__name__)
+
+# always: format and attach right away (the historical behaviour)
+# deferred: capture raw bytes, pretty-print on a background thread, attach when the test ends
+# on_failure: capture raw bytes, format and attach only when the test fails
+# off: capture nothing (unexpected statuses are still attached)
+MODES = ("always", "deferred", "on_failure", "off")
+
+
+@functools.lru_cache(maxsize=None)
+def allure_module() -> Any:
+    """
+    The allure package, imported on first use: clients only load it once a response is actually reported.
+    None when allure-pytest (a test extra) is not installed, which turns reporting into a no-op.
+    """
+    try:
+        import allure
+    except ImportError:
+        return None
+    return allure
+
+
+def step(title: str) -> ContextManager:
+    """allure.step(title), or a no-op context manager without allure."""
+    allure = allure_module()
+    return allure.step(title) if allure is not None else contextlib.nullcontext()
+
+
+@dataclass(frozen=True)
+class AttachmentPolicy:
+    """
+    How responses of an endpoint are reported:
+    - mode: one of MODES
+    - sample_rate: fraction of responses captured at all (1.0 = every response)
+    - max_body_bytes: request/response bodies are truncated to this many bytes
+    """
+
+    mode: str = "always"
+    sample_rate: float = 1.0
+    max_body_bytes: int = 64 * 1024
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown attachment mode {self.mode!r}, expected one of {MODES}")
+
+
+@dataclass
+class _Capture:
+    method: str
+    url: str
+    request_headers: dict[str, str]
+    request_body: bytes
+    request_size: int
+    status: int
+    reason: str
+    response_headers: dict[str, str]
+    response_body: bytes
+    response_size: int
+    mode: str
+    formatted: Optional[Future] = None
+
+
+def _as_bytes(body: Any) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode()
+    return repr(body).encode()  # streamed/multipart bodies: do not read them
+
+
+def _format_body(body: bytes, size: int) -> str:
+    if not body:
+        return ""
+    truncated = size > len(body)
+    if not truncated:
+        try:
+            return json.dumps(json.loads(body), indent=2, ensure_ascii=False)
+        except (ValueError, UnicodeDecodeError):
+            pass
+    text = body.decode("utf-8", errors="replace")
+    if truncated:
+        text += f"\n... [truncated, {size - len(body)} of {size} bytes not shown]"
+    return text
+
+
+def _format_headers(headers: Mapping[str, str]) -> str:
+    return "\n".join(f"{name}: {value}" for name, value in headers.items())
+
+
+def _format(capture: _Capture) -> tuple[str, str]:
+    request_text = (
+        f"Request:\n{capture.method} {capture.url}\n\n"
+        f"Headers:\n{_format_headers(capture.request_headers)}\n\n"
+        f"Body:\n{_format_body(capture.request_body, capture.request_size)}\n"
+    )
+    response_text = (
+        f"Status: {capture.status} {capture.reason}\n\n"
+        f"Headers:\n{_format_headers(capture.response_headers)}\n\n"
+        f"Body:\n{_format_body(capture.response_body, capture.response_size)}\n"
+    )
+    return request_text, response_text
+
+
+class AllureReporter:
+    """
+    Request/response attachments for HttpClient and AsyncHttpClient with per-endpoint policies.
+
+    - policies are looked up by "METHOD /template" first, then "/template" (see src.metrics.url_template),
+      falling back to `default`
+    - captures keep raw, size-capped bytes; JSON is pretty-printed only when an attachment is written
+    - responses with an unexpected status are always attached, with `failure_max_body_bytes`
+    - deferred/on_failure captures are buffered (at most `max_buffered`) until flush(failed) at the end
+      of a test, which the test suite calls from a pytest hook
+    """
+
+    def __init__(
+        self,
+        default: Optional[AttachmentPolicy] = None,
+        endpoints: Optional[Mapping[str, AttachmentPolicy]] = None,
+        failure_max_body_bytes: int = 1024 * 1024,
+        max_buffered: int = 200,
+    ) -> None:
+        self.default = default or AttachmentPolicy()
+        self.endpoints = dict(endpoints or {})
+        self.failure_max_body_bytes = failure_max_body_bytes
+        self._buffer: deque[_Capture] = deque(maxlen=max_buffered)
+        self._lock = threading.Lock()
+        self._formatter: Optional[ThreadPoolExecutor] = None
+
+    def configure(
+        self,
+        default: Optional[AttachmentPolicy] = None,
+        endpoints: Optional[Mapping[str, AttachmentPolicy]] = None,
+    ) -> None:
+        if default is not None:
+            self.default = default
+        if endpoints is not None:
+            self.endpoints.update(endpoints)
+
+    def policy_for(self, method: str, url: str) -> AttachmentPolicy:
+        if not self.endpoints:
+            return self.default
+        template = url_template(url)
+        return self.endpoints.get(f"{method} {template}") or self.endpoints.get(template) or self.default
+
+    def record(self, response: Any, unexpected: bool = False) -> None:
+        """Reports a requests.Response or httpx.Response according to its endpoint policy."""
+        try:
+            request = response.request
+            method, url = str(request.method), str(request.url)
+            policy = self.policy_for(method, url)
+            if unexpected:
+                policy = replace(policy, mode="always", max_body_bytes=self.failure_max_body_bytes)
+            elif policy.mode == "off" or (policy.sample_rate < 1.0 and random.random() >= policy.sample_rate):
+                return
+            if allure_module() is None:
+                return
+            capture = self._capture(response, policy)
+            if policy.mode == "always":
+                self._attach(_format(capture), capture)
+                return
+            if policy.mode == "deferred":
+                capture.formatted = self._formatter_pool().submit(_format, capture)
+            with self._lock:
+                self._buffer.append(capture)
+        except Exception as e:
+            logger.debug(f"Failed to report response: {e}")
+
+    def flush(self, failed: bool) -> None:
+        """Attaches buffered captures (on_failure ones only when `failed`) to the current Allure item."""
+        with self._lock:
+            captures = list(self._buffer)
+            self._buffer.clear()
+        for capture in captures:
+            if capture.mode == "on_failure" and not failed:
+                continue
+            try:
+                texts = capture.formatted.result() if capture.formatted is not None else _format(capture)
+                self._attach(texts, capture)
+            except Exception as e:
+                logger.debug(f"Failed to attach allure data: {e}")
+
+    def pending_count(self) -> int:
+        return len(self._buffer)
+
+    def _formatter_pool(self) -> ThreadPoolExecutor:
+        if self._formatter is None:
+            with self._lock:
+                if self._formatter is None:
+                    self._formatter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="allure-format")
+        return self._formatter
+
+    @staticmethod
+    def _capture(response: Any, policy: AttachmentPolicy) -> _Capture:
+        request = response.request
+        cap = policy.max_body_bytes
+        # requests keeps the sent body on PreparedRequest.body, httpx on Request.content
+        request_body = _as_bytes(request.body if hasattr(request, "body") else request.content)
+        response_body = response.content or b""
+        return _Capture(
+            method=str(request.method),
+            url=str(request.url),
+            request_headers=dict(request.headers),
+            request_body=request_body[:cap],
+            request_size=len(request_body),
+            status=response.status_code,
+            reason=getattr(response, "reason", None) or getattr(response, "reason_phrase", "") or "",
+            response_headers=dict(response.headers),
+            response_body=response_body[:cap],
+            response_size=len(response_body),
+            mode=policy.mode,
+        )
+
+    @staticmethod
+    def _attach(texts: tuple[str, str], capture: _Capture) -> None:
+        request_text, response_text = texts
+        allure = allure_module()
+        allure.attach(
+            body=request_text,
+            name=f"{capture.method} {capture.url}",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+        allure.attach(
+            body=response_text,
+            name=f"Response {capture.status}",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+
+
+# off until enabled (the test suite configures it in pytest_configure): scripts and workers using the
+# client attach nothing except responses with an unexpected status, and only when allure is installed
+_default_reporter = AllureReporter(default=AttachmentPolicy(mode="off"))
+
+
+def default_reporter() -> AllureReporter:
+    """Process-wide reporter used by clients created without an explicit `reporter`."""
+    return _default_reporter
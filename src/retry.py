@@ -0,0 +1,261 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Mapping, Optional
+
+import requests
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+from urllib3.util.util import reraise
+
+from src.metrics import CIRCUIT_STATES, url_template
+from src.rate_limit import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# 5xx responses and read errors may come after the server acted on the request: only these are repeated
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+# the server refused the request without processing it, so repeating is safe for any method (POST included)
+SAFE_RETRY_STATUSES = frozenset([429])
+RETRY_AFTER_STATUS_CODES = frozenset([413, 429, 503])
+# server-requested waits longer than this are not slept through; the response goes back to the caller
+MAX_RETRY_AFTER = 60.0
+
+CLOSED, OPEN, HALF_OPEN = CIRCUIT_STATES
+
+
+def retry_delay(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Seconds the server asks the client to wait: Retry-After, or the time until X-RateLimit-Reset when
+    X-RateLimit-Remaining is 0. None when the response carries neither hint.
+    """
+    retry_after = parse_retry_after(headers.get("Retry-After"))
+    if retry_after is not None:
+        return retry_after
+    if headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            return max(0.0, float(headers.get("X-RateLimit-Reset", "")) - time.time())
+        except ValueError:
+            return None
+    return None
+
+
+class RetryBudget:
+    """
+    Caps transparent retries at `ratio` of the requests sent during the last `window` seconds, so that
+    an unhealthy upstream sees at most (1 + ratio) times the normal traffic instead of (1 + retries) times.
+    `min_retries` per window are always allowed, so a client sending few requests can still retry.
+
+    Shared by every request of a client (or several clients): record_request() for each request sent,
+    try_acquire() before each retry.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10, window: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.exhausted = 0
+        self._slots: deque[list] = deque()  # [second, requests, retries], oldest first
+        self._requests = 0
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    def _slot(self) -> list:
+        now = int(time.monotonic())
+        while self._slots and self._slots[0][0] <= now - self.window:
+            _, requests_, retries = self._slots.popleft()
+            self._requests -= requests_
+            self._retries -= retries
+        if not self._slots or self._slots[-1][0] != now:
+            self._slots.append([now, 0, 0])
+        return self._slots[-1]
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._slot()[1] += 1
+            self._requests += 1
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            slot = self._slot()
+            if self._retries >= max(self.min_retries, self.ratio * self._requests):
+                self.exhausted += 1
+                return False
+            slot[2] += 1
+            self._retries += 1
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._slot()
+            return {"requests": self._requests, "retries": self._retries, "exhausted": self.exhausted}
+
+
+class AdaptiveRetry(Retry):
+    """
+    urllib3 Retry used by HttpClient:
+    - 5xx responses and read errors are retried for idempotent methods only; POST and PATCH (create_gist,
+      fork_gist, ...) are retried only when the server cannot have processed them: the connection was never
+      established, or the answer was 429
+    - waits as long as Retry-After says, or until X-RateLimit-Reset when the rate limit is exhausted; a wait
+      longer than `max_retry_after` is not slept through and the response is returned as is
+    - every retry draws from the shared `budget` (RetryBudget); once it is exhausted the last response is
+      returned (or the last error raised) without retrying
+    """
+
+    RETRY_AFTER_STATUS_CODES = RETRY_AFTER_STATUS_CODES
+
+    def __init__(
+        self, *args, budget: Optional[RetryBudget] = None, max_retry_after: float = MAX_RETRY_AFTER, **kw
+    ) -> None:
+        super().__init__(*args, **kw)
+        self.budget = budget
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kw) -> "AdaptiveRetry":
+        kw.setdefault("budget", self.budget)
+        kw.setdefault("max_retry_after", self.max_retry_after)
+        return super().new(**kw)
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code in SAFE_RETRY_STATUSES and self.status_forcelist and status_code in self.status_forcelist:
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_retry_after(self, response) -> Optional[float]:
+        if response.status not in self.RETRY_AFTER_STATUS_CODES:
+            return None
+        return retry_delay(response.headers)
+
+    def increment(
+        self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None
+    ) -> "AdaptiveRetry":
+        redirect = response is not None and response.get_redirect_location()
+        if (
+            error is not None
+            and not self._is_connection_error(error)
+            and not self._is_read_error(error)
+            and method is not None
+            and not self._is_method_retryable(method)
+        ):
+            # an unclassified failure of a write may have happened after the server acted on it
+            raise reraise(type(error), error, _stacktrace)
+        if response is not None and not redirect:
+            delay = self.get_retry_after(response)
+            if delay is not None and delay > self.max_retry_after:
+                logger.warning(f"{method} {url}: server asks to wait {delay:.0f}s, not retrying")
+                raise MaxRetryError(_pool, url, ResponseError(f"Retry-After {delay:.0f}s exceeds {self.max_retry_after:.0f}s"))
+        new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if not redirect and self.budget is not None and not self.budget.try_acquire():
+            logger.warning(f"Retry budget exhausted, not retrying {method} {url}")
+            reason = error or ResponseError(f"retry budget exhausted after status {getattr(response, 'status', None)}")
+            raise MaxRetryError(_pool, url, reason) from reason
+        return new_retry
+
+
+class CircuitOpenError(requests.ConnectionError):
+    def __init__(self, breaker: "CircuitBreaker", retry_in: float) -> None:
+        self.breaker = breaker
+        self.retry_in = retry_in
+        super().__init__(
+            f"Circuit for {breaker.name} is open after {breaker.failures} consecutive failures; "
+            f"next attempt allowed in {retry_in:.1f}s"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one endpoint:
+    - closed: requests pass; `failure_threshold` consecutive failures (transport errors or 5xx after
+      retries) open the circuit
+    - open: requests fail fast with CircuitOpenError for `recovery_time` seconds
+    - half_open: up to `half_open_max` probe requests pass; a success closes the circuit, a failure reopens it
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_time: float = 30.0, half_open_max: int = 1) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_max = half_open_max
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_time:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def before_request(self) -> None:
+        """Raises CircuitOpenError unless a request may be sent now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self._opened_at + self.recovery_time - time.monotonic())
+        raise CircuitOpenError(self, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self._state = CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or (state == CLOSED and self.failures >= self.failure_threshold):
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per URL template (see src.metrics.url_template), created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0, half_open_max: int = 1) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_max = half_open_max
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        endpoint = url_template(url)
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    endpoint,
+                    CircuitBreaker(endpoint, self.failure_threshold, self.recovery_time, self.half_open_max),
+                )
+        return breaker
+
+    def states(self) -> dict[str, str]:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {endpoint: breaker.state for endpoint, breaker in breakers}
+
+    def reset(self) -> None:
+        """Forgets every breaker: all endpoints start closed again."""
+        with self._lock:
+            self._breakers.clear()
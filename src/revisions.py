@@ -0,0 +1,180 @@
+import difflib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from src.api.gists import GistsAPI
+from src.api.models import Gist, GistCommit
+from src.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class ContentAddressedStore:
+    """
+    On-disk blob store keyed by an immutable id (a commit SHA): blobs are written once and never
+    revalidated. Once the total size exceeds `max_bytes` the least recently used blobs are evicted;
+    recency is tracked in memory and persisted as mtime, which orders the blobs on start-up.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        blobs = [
+            (stat.st_mtime, path.name, stat.st_size)
+            for path in self.directory.glob("??/*")
+            if path.suffix != ".tmp" and (stat := path.stat())
+        ]
+        # least recently used first
+        self._sizes: OrderedDict[str, int] = OrderedDict((key, size) for _, key, size in sorted(blobs))
+        self.total_bytes = sum(self._sizes.values())
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sizes
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                self.total_bytes -= self._sizes.pop(key, 0)
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._sizes:
+                self._sizes.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        _atomic_write(self._path(key), data)
+        with self._lock:
+            self.total_bytes += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            self._sizes.move_to_end(key)
+            over = self.total_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self) -> None:
+        # evict down to 90% so that a full cache does not evict on every write
+        target = self.max_bytes * 0.9
+        with self._lock:
+            while self._sizes and self.total_bytes > target:
+                key, size = self._sizes.popitem(last=False)
+                self._path(key).unlink(missing_ok=True)
+                self.total_bytes -= size
+
+
+class RevisionCache:
+    """
+    Immutable gist revisions (`/gists/{id}/{sha}`) and commit histories, cached on disk.
+
+    - revision(): one revision as a Gist model, downloaded at most once per SHA
+    - history(): the commit list, newest first; later calls walk `list_gist_commits` pages only until
+      they reach the newest commit already known, so an unchanged history costs a single page request
+    - revisions(): every revision of a gist, fetching only missing ones, concurrently
+    - diff(): unified diff of the files of two revisions
+    """
+
+    def __init__(
+        self,
+        api: GistsAPI,
+        directory: str | os.PathLike,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_workers: int = 8,
+        per_page: int = 100,
+    ) -> None:
+        self.api = api
+        self.per_page = per_page
+        self.blobs = ContentAddressedStore(Path(directory) / "revisions", max_bytes=max_bytes)
+        self.history_dir = Path(directory) / "history"
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+
+    def revision_bytes(self, gist_id: str, sha: str) -> bytes:
+        data = self.blobs.get(sha)
+        if data is None:
+            data = self.api.get_gist_revision(gist_id, sha).content
+            self.blobs.put(sha, data)
+        return data
+
+    def revision(self, gist_id: str, sha: str) -> Gist:
+        return Gist.from_dict(json_codec.loads(self.revision_bytes(gist_id, sha)), self.api.typed._load_content)
+
+    def _load_history(self, gist_id: str) -> list[dict[str, Any]]:
+        try:
+            return json_codec.loads((self.history_dir / f"{gist_id}.json").read_bytes())
+        except FileNotFoundError:
+            return []
+
+    def history(self, gist_id: str) -> list[GistCommit]:
+        known = self._load_history(gist_id)
+        newest_known = known[0]["version"] if known else None
+        new: list[dict[str, Any]] = []
+        # commits are listed newest first and never rewritten: stop at the first one already stored
+        commits = self.api.iter_gist_commits(gist_id, per_page=self.per_page)
+        try:
+            for commit in commits:
+                if commit["version"] == newest_known:
+                    break
+                new.append(commit)
+        finally:
+            commits.close()
+        if new:
+            known = new + known
+            _atomic_write(self.history_dir / f"{gist_id}.json", json_codec.dumps(known))
+            logger.debug(f"History of {gist_id}: {len(new)} new commit(s), {len(known)} total")
+        return [GistCommit.from_dict(c) for c in known]
+
+    def revisions(self, gist_id: str) -> Iterator[Gist]:
+        """Every revision of the gist, newest first; missing revisions are downloaded concurrently."""
+        shas = [c.version for c in self.history(gist_id)]
+        missing = [sha for sha in shas if sha not in self.blobs]
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gist-revisions") as executor:
+                list(executor.map(lambda sha: self.revision_bytes(gist_id, sha), missing))
+        return (self.revision(gist_id, sha) for sha in shas)
+
+    def diff(self, gist_id: str, old_sha: str, new_sha: str, context: int = 3) -> str:
+        old, new = self.revision(gist_id, old_sha), self.revision(gist_id, new_sha)
+        chunks = []
+        for name in sorted(set(old.files) | set(new.files)):
+            before = old.files[name].content if name in old.files else ""
+            after = new.files[name].content if name in new.files else ""
+            chunks.extend(
+                difflib.unified_diff(
+                    (before or "").splitlines(keepends=True),
+                    (after or "").splitlines(keepends=True),
+                    fromfile=f"{old_sha[:7]}/{name}",
+                    tofile=f"{new_sha[:7]}/{name}",
+                    n=context,
+                )
+            )
+        return "".join(chunks)
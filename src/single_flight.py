@@ -0,0 +1,109 @@
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Hashable, Mapping, TypeVar
+
+T = TypeVar("T")
+
+# request headers that can change what the server answers; other headers do not split a flight
+KEY_HEADERS = (
+    "Authorization",
+    "Cookie",
+    "Accept",
+    "X-GitHub-Api-Version",
+    "Range",
+    "If-None-Match",
+    "If-Modified-Since",
+)
+
+
+def flight_key(method: str, url: str, headers: Mapping[str, str]) -> tuple:
+    """Key of a request for coalescing: method, full URL (query included) and the KEY_HEADERS values."""
+    values = []
+    for name in KEY_HEADERS:
+        value = headers.get(name)
+        if value is not None and name in ("Authorization", "Cookie"):
+            # credentials are only compared, never kept in the key
+            value = hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+        values.append(value)
+    return (method.upper(), str(url), *values)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key across threads: the first caller runs the function,
+    callers arriving while it is in flight wait and receive the same result (or exception).
+    Nothing is cached: a call made after the flight finished runs the function again.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines of one event loop: followers await the leader's future."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Any] = {}  # key -> asyncio.Future
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        import asyncio  # imported here so that the threaded client does not load it
+
+        self.calls += 1
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # shielded: a cancelled follower must not cancel the request the others wait for
+            return await asyncio.shield(future)
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # marks it retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._calls[key]
+        future.set_result(result)
+        return result
@@ -0,0 +1,304 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from src.utils.json_codec import parse_once
+
+_current = threading.local()
+
+
+@contextmanager
+def track(timing: Any) -> Iterator[None]:
+    """
+    Makes `timing` (a src.metrics.RequestTiming) the target of connection-level measurements for
+    requests sent from the current thread; requests/urllib3 send synchronously in the caller's thread.
+    """
+    previous = getattr(_current, "timing", None)
+    _current.timing = timing
+    try:
+        yield
+    finally:
+        _current.timing = previous
+
+
+def _active() -> Optional[Any]:
+    return getattr(_current, "timing", None)
+
+
+def _add(timing: Any, phase: str, seconds: float) -> None:
+    setattr(timing, phase, (getattr(timing, phase) or 0.0) + seconds)
+
+
+class PoolStats:
+    """
+    Live keep-alive counters of one connection pool (one scheme://host:port):
+    - opened: connections established (DNS + TCP, plus TLS for https)
+    - reused: requests sent on a connection that was already open
+    - discarded: connections closed after use instead of being kept: pool full or closed, the server
+      closed it, or the request failed
+    - reaped: idle connections closed by the idle timeout or InstrumentedHTTPAdapter.reap_idle
+    - blocked / blocked_seconds: checkouts that waited for a free connection (pool_block=True) and the time spent
+    """
+
+    COUNTERS = ("opened", "reused", "discarded", "reaped", "blocked", "blocked_seconds")
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+        self.reaped = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, counter: str, value: float = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            counters = {name: getattr(self, name) for name in self.COUNTERS}
+        return {"maxsize": self.maxsize, **counters}
+
+
+class _TimedConnectionMixin:
+    _tcp_seconds = 0.0
+    # set by the owning _InstrumentedPoolMixin
+    pool_stats: Optional[PoolStats] = None
+    idle_since = 0.0
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._new_conn()
+            if self.pool_stats is not None:
+                self.pool_stats.add("opened")
+            return conn
+        finally:
+            self._tcp_seconds = time.perf_counter() - started
+            timing = _active()
+            if timing is not None:
+                _add(timing, "connect", self._tcp_seconds)
+
+    def request(self, *args, **kwargs):
+        timing = _active()
+        if timing is not None:
+            timing.sent_at = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self):
+        response = super().getresponse()
+        timing = _active()
+        if timing is not None:
+            timing.first_byte_at = time.perf_counter()
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        started = time.perf_counter()
+        self._tcp_seconds = 0.0
+        super().connect()
+        timing = _active()
+        if timing is not None:
+            _add(timing, "tls", max(0.0, time.perf_counter() - started - self._tcp_seconds))
+
+
+class _InstrumentedPoolMixin:
+    """Keeps PoolStats for its connections and closes the ones idle for longer than `idle_timeout`."""
+
+    stats: PoolStats
+    idle_timeout: Optional[float] = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.pool_stats = self.stats
+        return conn
+
+    def _get_conn(self, timeout: Optional[float] = None):
+        if self.idle_timeout is not None:
+            self.reap_idle(self.idle_timeout)
+        # the queue holds open connections and None placeholders for the ones not opened yet:
+        # it is only empty when all `maxsize` connections are checked out
+        waiting = self.block and self.pool is not None and self.pool.empty()
+        started = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        if waiting:
+            blocked = time.perf_counter() - started
+            self.stats.add("blocked")
+            self.stats.add("blocked_seconds", blocked)
+            timing = _active()
+            if timing is not None:
+                _add(timing, "queue_wait", blocked)
+        if conn.sock is not None:
+            self.stats.add("reused")
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        if conn is not None:
+            conn.idle_since = time.monotonic()
+        super()._put_conn(conn)
+        # None is put back for a connection closed after an error; a returned connection without a socket
+        # was closed because the pool is full or closed, or because the server ended the keep-alive
+        if conn is None or conn.sock is None:
+            self.stats.add("discarded")
+
+    def reap_idle(self, max_idle: float) -> int:
+        """Closes pooled connections idle for more than `max_idle` seconds; returns how many were closed."""
+        if self.pool is None:
+            return 0
+        cutoff = time.monotonic() - max_idle
+        reaped = 0
+        with self.pool.mutex:
+            slots = self.pool.queue
+            for i, conn in enumerate(slots):
+                if conn is not None and conn.sock is not None and conn.idle_since < cutoff:
+                    conn.close()
+                    slots[i] = None
+                    reaped += 1
+        if reaped:
+            self.stats.add("reaped", reaped)
+        return reaped
+
+    def idle_connections(self) -> int:
+        if self.pool is None:
+            return 0
+        with self.pool.mutex:
+            return sum(1 for conn in self.pool.queue if conn is not None and conn.sock is not None)
+
+    def warm_up(self, connections: int) -> int:
+        """
+        Opens up to `connections` keep-alive connections (at most maxsize) concurrently and parks them in
+        the pool without sending a request; returns how many were opened.
+        """
+        # check out the pooled connections directly (no reuse/blocked accounting); idle ones come first
+        conns = []
+        for _ in range(max(0, min(connections, self.stats.maxsize))):
+            conns.append(super()._get_conn())
+
+        def connect(conn) -> bool:
+            if conn.sock is not None:
+                return False
+            conn.connect()
+            return True
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(conns)), thread_name_prefix="pool-warm-up") as executor:
+                return sum(executor.map(connect, conns))
+        finally:
+            for conn in conns:
+                self._put_conn(conn)
+
+
+class TimedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class InstrumentedPoolManager(PoolManager):
+    """
+    PoolManager creating instrumented pools, sized per host by `host_maxsize` ("host" or "host:port" keys,
+    default: the adapter's pool_maxsize), with their PoolStats collected in `stats` by scheme://host:port.
+    """
+
+    def __init__(
+        self,
+        *args,
+        host_maxsize: Optional[Mapping[str, int]] = None,
+        idle_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+        self.host_maxsize = dict(host_maxsize or {})
+        self.idle_timeout = idle_timeout
+        self.stats: dict[str, PoolStats] = {}
+
+    def _new_pool(self, scheme: str, host: str, port: int, request_context: Optional[dict[str, Any]] = None):
+        context = dict(self.connection_pool_kw if request_context is None else request_context)
+        maxsize = self.host_maxsize.get(f"{host}:{port}", self.host_maxsize.get(host))
+        if maxsize is not None:
+            context["maxsize"] = maxsize
+        pool = super()._new_pool(scheme, host, port, context)
+        # called under the manager's lock; a pool recreated for the same host keeps counting
+        pool.stats = self.stats.setdefault(f"{scheme}://{host}:{port}", PoolStats(pool.pool.maxsize))
+        pool.idle_timeout = self.idle_timeout
+        return pool
+
+    def instrumented_pools(self) -> list[_InstrumentedPoolMixin]:
+        # read the LRU container directly: indexing it would reorder pools for eviction
+        with self.pools.lock:
+            return list(self.pools._container.values())
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pools use connections that report connect/TLS/TTFB timings via `track`,
+    and whose responses decode their JSON body only once (see src.utils.json_codec.ParsedResponse).
+    Pools are sized per host (`host_maxsize`), reap connections idle for longer than `idle_timeout`
+    and keep PoolStats (see pool_stats()).
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["_host_maxsize", "_idle_timeout"]
+
+    def __init__(
+        self,
+        *args,
+        host_maxsize: Optional[Mapping[str, int]] = None,
+        idle_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        # read by init_poolmanager, which HTTPAdapter.__init__ calls
+        self._host_maxsize = dict(host_maxsize or {})
+        self._idle_timeout = idle_timeout
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False, **pool_kwargs) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = InstrumentedPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            host_maxsize=self._host_maxsize,
+            idle_timeout=self._idle_timeout,
+            **pool_kwargs,
+        )
+
+    def pool_for(self, request, verify: bool | str = True):
+        """The (instrumented) connection pool that would serve `request`, a PreparedRequest."""
+        return self.get_connection_with_tls_context(request, verify)
+
+    def pool_stats(self) -> dict[str, dict[str, Any]]:
+        """PoolStats.to_dict() by scheme://host:port, plus the number of `idle` open connections."""
+        idle: dict[str, int] = {}
+        for pool in self.poolmanager.instrumented_pools():
+            key = f"{pool.scheme}://{pool.host}:{pool.port}"
+            idle[key] = idle.get(key, 0) + pool.idle_connections()
+        return {key: {**stats.to_dict(), "idle": idle.get(key, 0)} for key, stats in list(self.poolmanager.stats.items())}
+
+    def reap_idle(self, max_idle: float = 0.0) -> int:
+        """Closes connections idle for more than `max_idle` seconds in every pool; returns how many were closed."""
+        return sum(pool.reap_idle(max_idle) for pool in self.poolmanager.instrumented_pools())
+
+    def build_response(self, req, resp):
+        return parse_once(super().build_response(req, resp))
@@ -1,18 +1,33 @@
 import os
 from dataclasses import dataclass
-from dotenv import load_dotenv
+from functools import lru_cache
 
+FAKE_TOKEN = "fake-token"
 
-@dataclass
+
+@dataclass(frozen=True)
 class Settings:
     base_url: str
     token: str | None
     api_version: str
 
 
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
+    """
+    Settings from the environment and `.env`, resolved once per process (a `fake://` BASE_URL starts
+    a single server). Call load_settings.cache_clear() to pick up changed variables.
+    """
+    from dotenv import load_dotenv
+
     load_dotenv()
     base_url = os.getenv("BASE_URL", "https://api.github.com")
     token = os.getenv("GITHUB_TOKEN")
     api_version = os.getenv("GITHUB_API_VERSION", "2022-11-28")
+    if base_url.startswith("fake://"):
+        # `fake://?latency=...` runs the in-process stand-in server (see src.fake_server) instead of GitHub
+        from src.fake_server import start_from_url
+
+        base_url = start_from_url(base_url).base_url
+        token = token or FAKE_TOKEN
     return Settings(base_url=base_url, token=token, api_version=api_version)
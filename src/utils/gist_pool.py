@@ -0,0 +1,175 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from src.api.gists import GistsAPI
+
+logger = logging.getLogger(__name__)
+
+BASELINE_CONTENT = "Hello from automated tests"
+OVERFLOW_POLICIES = ("create", "wait", "fail")
+
+
+class GistPoolExhausted(RuntimeError):
+    pass
+
+
+class GistPool:
+    """
+    Pre-warmed pool of private gists handed out to tests instead of a create/delete pair per test.
+
+    - fill(): creates `size` gists in parallel up front
+    - acquire(): hands out a gist in its baseline state; when the pool is empty the overflow policy applies:
+        • "create": create an extra gist that is deleted again on release
+        • "wait": block until another test releases one (up to `wait_timeout` seconds)
+        • "fail": raise GistPoolExhausted
+    - release(): resets the gist with a single update_gist (baseline description and file content)
+      and returns it to the pool; a gist that was deleted or is marked dirty is replaced in the background
+    - close(): deletes every gist the pool owns, concurrently; a gist released after close() is deleted
+      right away instead of being reset
+
+    `new_suffix` returns the unique part of gist descriptions and file names (default: random hex).
+
+    Star state and revision history are not reset: tests that depend on them need a fresh gist.
+    """
+
+    def __init__(
+        self,
+        api: GistsAPI,
+        size: int = 4,
+        overflow: str = "create",
+        max_workers: int = 8,
+        wait_timeout: float = 60,
+        prefix: str = "api-test-pool",
+        new_suffix: Optional[Callable[[], str]] = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {OVERFLOW_POLICIES}")
+        self.api = api
+        self.size = size
+        self.overflow = overflow
+        self.wait_timeout = wait_timeout
+        self.prefix = prefix
+        self.new_suffix = new_suffix or (lambda: uuid4().hex[:8])
+        self._idle: list[dict[str, Any]] = []
+        self._owned: dict[str, dict[str, Any]] = {}
+        self._baselines: dict[str, dict[str, Any]] = {}
+        self._overflow_ids: set[str] = set()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gist-pool")
+
+    def _baseline_payload(self) -> dict[str, Any]:
+        suffix = self.new_suffix()
+        return {
+            "description": f"{self.prefix}-{suffix}",
+            "public": False,
+            "files": {f"test_{suffix}.txt": {"content": BASELINE_CONTENT}},
+        }
+
+    def _create(self) -> dict[str, Any]:
+        payload = self._baseline_payload()
+        gist = self.api.create_gist(payload).json()
+        with self._cond:
+            self._owned[gist["id"]] = gist
+            self._baselines[gist["id"]] = payload
+        return gist
+
+    def _put_back(self, gist: dict[str, Any]) -> None:
+        with self._cond:
+            self._idle.append(gist)
+            self._cond.notify()
+
+    def fill(self) -> "GistPool":
+        missing = self.size - len(self._owned)
+        for gist in self._executor.map(lambda _: self._create(), range(max(0, missing))):
+            self._put_back(gist)
+        return self
+
+    def acquire(self) -> dict[str, Any]:
+        with self._cond:
+            if not self._idle and self.overflow == "wait":
+                self._cond.wait_for(lambda: self._idle, timeout=self.wait_timeout)
+            if self._idle:
+                return self._idle.pop()
+            if self.overflow == "fail" or self.overflow == "wait":
+                raise GistPoolExhausted(f"No idle gist in a pool of {self.size} ({self.overflow} policy)")
+        gist = self._create()
+        with self._cond:
+            self._overflow_ids.add(gist["id"])
+        return gist
+
+    def release(self, gist: dict[str, Any], dirty: bool = False) -> None:
+        gist_id = gist["id"]
+        with self._cond:
+            is_overflow = gist_id in self._overflow_ids
+            self._overflow_ids.discard(gist_id)
+            closed = self._closed
+        if is_overflow or dirty or closed:
+            self._discard(gist_id, replace=not is_overflow)
+            return
+        try:
+            self._put_back(self._reset(gist_id))
+        except Exception as e:
+            logger.debug(f"Pool gist {gist_id} could not be reset ({e}); replacing it")
+            self._discard(gist_id, replace=True)
+
+    def _reset(self, gist_id: str) -> dict[str, Any]:
+        baseline = self._baselines[gist_id]
+        gist = self.api.update_gist(
+            gist_id, {"description": baseline["description"], "files": baseline["files"]}
+        ).json()
+        extra = set(gist.get("files", {})) - set(baseline["files"])
+        if extra:
+            # only when the test added files: a second call removes them
+            gist = self.api.update_gist(gist_id, {"files": {name: None for name in extra}}).json()
+        with self._cond:
+            self._owned[gist_id] = gist
+        return gist
+
+    def _discard(self, gist_id: str, replace: bool) -> None:
+        with self._cond:
+            self._owned.pop(gist_id, None)
+            self._baselines.pop(gist_id, None)
+            # submitted under the lock, so close() cannot shut the executor down in between
+            if not self._closed:
+                self._executor.submit(self._delete_quietly, gist_id)
+                if replace:
+                    self._executor.submit(lambda: self._put_back(self._create()))
+                return
+        self._delete_quietly(gist_id)
+
+    def _delete_quietly(self, gist_id: str) -> None:
+        try:
+            self.api.delete_gist(gist_id, expected_status=None)
+        except Exception as e:
+            logger.debug(f"Failed to delete pool gist {gist_id}: {e}")
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        with self._cond:
+            ids = set(self._owned) | self._overflow_ids
+            self._owned.clear()
+            self._idle.clear()
+            self._overflow_ids.clear()
+        with ThreadPoolExecutor(max_workers=8, thread_name_prefix="gist-pool-cleanup") as executor:
+            list(executor.map(self._delete_quietly, ids))
+
+    def __enter__(self) -> "GistPool":
+        try:
+            return self.fill()
+        except BaseException:
+            # __exit__ does not run when __enter__ raises: delete the gists created before the failure
+            self.close()
+            raise
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
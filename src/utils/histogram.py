@@ -0,0 +1,101 @@
+import math
+import threading
+from typing import Any, Iterable, Optional
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """
+    Thread-safe log-bucketed histogram of non-negative values (seconds for latencies).
+    Bucket boundaries grow geometrically by `precision` (1% by default), so percentiles are accurate
+    to that relative error while memory stays bounded by the dynamic range, not by the sample count.
+    """
+
+    def __init__(self, precision: float = 0.01, lowest: float = 1e-6) -> None:
+        self.precision = precision
+        self.lowest = lowest
+        self._log_base = math.log1p(precision)
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return int(math.log(value / self.lowest) / self._log_base) + 1
+
+    def _upper_bound(self, index: int) -> float:
+        return self.lowest * (1 + self.precision) ** index
+
+    def record(self, value: float, count: int = 1) -> None:
+        value = max(0.0, value)
+        index = self._index(value)
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + count
+            self.count += count
+            self.total += value * count
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        with other._lock:
+            buckets = dict(other._buckets)
+            count, total, lo, hi = other.count, other.total, other.min, other.max
+        with self._lock:
+            for index, n in buckets.items():
+                self._buckets[index] = self._buckets.get(index, 0) + n
+            self.count += count
+            self.total += total
+            if lo is not None:
+                self.min = lo if self.min is None else min(self.min, lo)
+            if hi is not None:
+                self.max = hi if self.max is None else max(self.max, hi)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(self.count * pct / 100))
+            seen = 0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen >= rank:
+                    # clamp to the observed extremes so p100 == max and tiny samples stay exact-ish
+                    return min(max(self._upper_bound(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def cumulative_buckets(self, bounds: Iterable[float]) -> list[tuple[float, int]]:
+        """Counts of samples <= each bound (Prometheus-style `le` buckets); bounds must be ascending."""
+        with self._lock:
+            items = sorted(self._buckets.items())
+        result = []
+        seen = 0
+        i = 0
+        for bound in bounds:
+            while i < len(items) and self._upper_bound(items[i][0]) <= bound * (1 + self.precision):
+                seen += items[i][1]
+                i += 1
+            result.append((bound, seen))
+        return result
+
+    def to_dict(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES, with_buckets: bool = False) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.mean,
+            "max": self.max,
+        }
+        for pct in percentiles:
+            data[f"p{pct:g}"] = self.percentile(pct)
+        if with_buckets:
+            with self._lock:
+                data["buckets"] = [[self._upper_bound(i), n] for i, n in sorted(self._buckets.items())]
+        return data
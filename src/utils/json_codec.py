@@ -0,0 +1,79 @@
+import json
+import logging
+import os
+from typing import Any, Callable
+
+import requests
+from requests.exceptions import JSONDecodeError as RequestsJSONDecodeError
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+BACKENDS: dict[str, tuple[Callable[[bytes | str], Any], Callable[[Any], bytes]]] = {
+    "stdlib": (_stdlib_loads, _stdlib_dumps),
+}
+if orjson is not None:
+    BACKENDS["orjson"] = (orjson.loads, orjson.dumps)
+
+_backend_name = ""
+loads: Callable[[bytes | str], Any] = _stdlib_loads
+dumps: Callable[[Any], bytes] = _stdlib_dumps
+
+
+def set_backend(name: str) -> None:
+    """Selects the JSON implementation used by `loads` / `dumps` ("orjson" when installed, or "stdlib")."""
+    global _backend_name, loads, dumps
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown or unavailable JSON backend {name!r}, available: {sorted(BACKENDS)}")
+    _backend_name = name
+    loads, dumps = BACKENDS[name]
+
+
+def backend() -> str:
+    return _backend_name
+
+
+set_backend(os.getenv("JSON_BACKEND") or ("orjson" if orjson is not None else "stdlib"))
+
+
+class ParsedResponse(requests.Response):
+    """
+    requests.Response whose json() decodes the body once, with the selected backend, and then returns
+    the same object on every call (treat it as read-only). Keyword arguments fall back to requests.
+    """
+
+    _decoded: Any
+
+    def json(self, **kwargs) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        try:
+            return self._decoded
+        except AttributeError:
+            pass
+        try:
+            self._decoded = loads(self.content)
+        except ValueError as e:
+            text = self.content.decode("utf-8", errors="replace") if self.content else ""
+            raise RequestsJSONDecodeError(str(e), text, 0) from e
+        return self._decoded
+
+
+def parse_once(response: requests.Response) -> requests.Response:
+    """Upgrades a plain requests.Response in place so that json() decodes its body only once."""
+    if type(response) is requests.Response:
+        response.__class__ = ParsedResponse
+    return response
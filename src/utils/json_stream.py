@@ -0,0 +1,90 @@
+import codecs
+import json
+import re
+from typing import Any, Collection, Iterable, Iterator, Optional
+
+# bytes read per iter_content() call in streaming list mode: small enough that items are decoded
+# while the rest of the page is still arriving
+STREAM_CHUNK_SIZE = 16 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = (",", "]", " ", "\t", "\n", "\r")
+_decoder = json.JSONDecoder()
+
+_BEFORE_ARRAY, _FIRST_ITEM, _NEXT_ITEM, _AFTER_ITEM, _DONE = range(5)
+
+
+def project(item: Any, fields: Optional[Collection[str]]) -> Any:
+    """Keeps only `fields` of a JSON object (other values pass through unchanged)."""
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {key: item[key] for key in fields if key in item}
+
+
+def iter_json_array(chunks: Iterable[bytes], fields: Optional[Collection[str]] = None) -> Iterator[Any]:
+    """
+    Decodes a top-level JSON array from `chunks` of UTF-8 bytes (e.g. Response.iter_content) and yields
+    each element as soon as it is complete, optionally projected to `fields`. Only the undecoded tail of
+    the input and the current element are held in memory. Raises ValueError on malformed input.
+
+    Elements are decoded with the stdlib C scanner (`raw_decode`); an element split across chunks is
+    retried once more data has arrived.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    state = _BEFORE_ARRAY
+    final = False
+    chunks = iter(chunks)
+    while True:
+        progressed = True
+        while progressed:
+            progressed = False
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            char = buf[pos]
+            if state == _BEFORE_ARRAY:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {buf[pos:pos + 20]!r}")
+                pos += 1
+                state = _FIRST_ITEM
+                progressed = True
+            elif state == _AFTER_ITEM:
+                if char == ",":
+                    state = _NEXT_ITEM
+                elif char == "]":
+                    state = _DONE
+                else:
+                    raise ValueError(f"Expected ',' or ']' at {buf[pos:pos + 20]!r}")
+                pos += 1
+                progressed = state != _DONE
+            elif state == _FIRST_ITEM and char == "]":
+                pos += 1
+                state = _DONE
+            else:
+                try:
+                    item, end = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # incomplete element: wait for more data
+                if not final and not isinstance(item, (dict, list, str)) and buf[end:end + 1] not in _DELIMITERS:
+                    break  # a number may continue in the next chunk ("2" of "2.5")
+                pos = end
+                state = _AFTER_ITEM
+                progressed = True
+                yield project(item, fields)
+        if state == _DONE:
+            if buf[pos:].strip() or any(chunk.strip() for chunk in chunks):
+                raise ValueError("Unexpected data after the JSON array")
+            return
+        if final:
+            raise ValueError("Truncated JSON array")
+        chunk = next(chunks, None)
+        if chunk is None:
+            final = True
+            buf = buf[pos:] + text.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + text.decode(chunk)
+        pos = 0
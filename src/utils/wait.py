@@ -1,7 +1,79 @@
+import asyncio
+import inspect
+import logging
+import random
+import threading
 import time
-from typing import Any, Callable, Optional
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional
 
-import allure
+from src.rate_limit import parse_retry_after
+from src.reporting import step
+
+logger = logging.getLogger(__name__)
+
+
+class _PollSchedule:
+    """
+    Computes sleeps between polls: exponential backoff with multiplicative jitter, raised to any
+    server hint (Retry-After) and capped so that the last sleep never overshoots the monotonic deadline.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        poll_interval: float,
+        backoff: float,
+        max_interval: Optional[float],
+        jitter: float,
+        retry_after: Optional[Callable[[Any], Optional[float]]],
+    ) -> None:
+        self.deadline = time.monotonic() + timeout
+        self._interval = poll_interval
+        self._backoff = backoff
+        self._max_interval = max_interval
+        self._jitter = jitter
+        self._retry_after = retry_after
+
+    def next_sleep(self, last_result: Any) -> Optional[float]:
+        """Returns seconds to sleep before the next poll, or None once the deadline has passed."""
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        delay = self._interval
+        if self._jitter:
+            delay *= random.uniform(1 - self._jitter, 1 + self._jitter)
+        hint = self._hint(last_result)
+        if hint is not None:
+            delay = max(delay, hint)
+        self._interval *= self._backoff
+        if self._max_interval is not None:
+            self._interval = min(self._interval, self._max_interval)
+        return max(0.0, min(delay, remaining))
+
+    def _hint(self, last_result: Any) -> Optional[float]:
+        if self._retry_after is not None:
+            return self._retry_after(last_result)
+        headers = getattr(last_result, "headers", None)
+        if headers is not None:
+            return parse_retry_after(headers.get("Retry-After"))
+        return None
+
+
+def _is_reached(result: Any, expected_value: Optional[Any]) -> bool:
+    if expected_value is not None:
+        return result == expected_value
+    return bool(result)
+
+
+def _timeout_error(condition_summary: str, timeout: float, last_result: Any, expected_value: Optional[Any]) -> str:
+    error_message = (
+        f"Condition was not met within {timeout} seconds. Condition: {condition_summary}. "
+        f"Last result: \"{last_result}\"."
+    )
+    if expected_value is not None:
+        error_message = f"{error_message} Expected: \"{expected_value}\"."
+    return error_message
 
 
 def wait_until_condition_reached(
@@ -10,6 +82,10 @@ def wait_until_condition_reached(
     timeout: int = 15,
     poll_interval: float = 1,
     expected_value: Optional[Any] = None,
+    backoff: float = 1.0,
+    max_interval: Optional[float] = None,
+    jitter: float = 0.0,
+    retry_after: Optional[Callable[[Any], Optional[float]]] = None,
 ) -> Any:
     """
     Polls `condition` until it becomes truthy (or equals `expected_value`) or times out.
@@ -18,10 +94,17 @@ def wait_until_condition_reached(
     - condition_summary: Human-readable description of what we are waiting for (shown as an Allure step).
     - condition: A zero-argument callable that returns the current value/state to check.
     - timeout: Maximum number of seconds to wait before failing with an AssertionError.
-    - poll_interval: Number of seconds to sleep between polls.
+        The deadline is measured on the monotonic clock and the last sleep is cut short to hit it.
+    - poll_interval: Number of seconds to sleep before the second poll.
     - expected_value: Optional target value to match against condition().
         • If provided, the wait succeeds as soon as condition() == expected_value.
         • If omitted (None), any truthy result from condition() is treated as success.
+    - backoff: Multiplier applied to the interval after every poll (1.0 keeps a fixed interval).
+    - max_interval: Optional upper bound of the interval when backing off.
+    - jitter: Relative random spread of each sleep, e.g. 0.2 sleeps 80%..120% of the interval,
+        so many concurrent waiters do not poll in lockstep.
+    - retry_after: Optional callable mapping the last result to a minimal delay in seconds (server hint).
+        If omitted and the last result is a response, its `Retry-After` header is honored.
 
     Example:
         wait_until_condition_reached(
@@ -31,26 +114,237 @@ def wait_until_condition_reached(
             ),
             expected_value=True,
             timeout=15,
-            poll_interval=2,
+            poll_interval=0.5,
+            backoff=2,
+            max_interval=4,
+            jitter=0.2,
         )
     """
-    with allure.step(condition_summary):
-        until_time = time.time() + timeout
-        last_result: Any = None
-        while time.time() < until_time:
+    with step(condition_summary):
+        schedule = _PollSchedule(timeout, poll_interval, backoff, max_interval, jitter, retry_after)
+        while True:
             last_result = condition()
-            if expected_value is not None:
-                if last_result == expected_value:
-                    return last_result
+            if _is_reached(last_result, expected_value):
+                return last_result
+            delay = schedule.next_sleep(last_result)
+            if delay is None:
+                raise AssertionError(_timeout_error(condition_summary, timeout, last_result, expected_value))
+            time.sleep(delay)
+
+
+async def async_wait_until_condition_reached(
+    condition_summary: str,
+    condition: Callable[[], Any],
+    timeout: int = 15,
+    poll_interval: float = 1,
+    expected_value: Optional[Any] = None,
+    backoff: float = 1.0,
+    max_interval: Optional[float] = None,
+    jitter: float = 0.0,
+    retry_after: Optional[Callable[[Any], Optional[float]]] = None,
+) -> Any:
+    """
+    Asyncio variant of `wait_until_condition_reached` with the same parameters.
+    `condition` may be a plain or an async callable; sleeps yield to the event loop instead of
+    blocking a thread, so hundreds of concurrent waits cost almost nothing.
+    """
+    with step(condition_summary):
+        schedule = _PollSchedule(timeout, poll_interval, backoff, max_interval, jitter, retry_after)
+        while True:
+            last_result = condition()
+            if inspect.isawaitable(last_result):
+                last_result = await last_result
+            if _is_reached(last_result, expected_value):
+                return last_result
+            delay = schedule.next_sleep(last_result)
+            if delay is None:
+                raise AssertionError(_timeout_error(condition_summary, timeout, last_result, expected_value))
+            await asyncio.sleep(delay)
+
+
+class _PendingCondition:
+    __slots__ = ("future", "predicate", "expected_value", "deadline", "timeout", "summary", "last_result")
+
+    def __init__(self, predicate, expected_value, timeout, summary) -> None:
+        self.future: Future = Future()
+        self.predicate = predicate
+        self.expected_value = expected_value
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+        self.summary = summary
+        self.last_result: Any = None
+
+
+class _SharedResource:
+    __slots__ = ("fetch", "pending", "next_poll", "interval")
+
+    def __init__(self, fetch: Callable[[], Any], interval: float) -> None:
+        self.fetch = fetch
+        self.pending: list[_PendingCondition] = []
+        self.next_poll = time.monotonic()
+        self.interval = interval
+
+
+class BatchWaiter:
+    """
+    Resolves many pending conditions from one shared poll per resource.
+
+    Conditions are registered against a resource key and a fetcher; every poll cycle calls each
+    fetcher once and evaluates all predicates registered on it against that single result, so N
+    waiters on the same gist cost one request per cycle instead of N. Each condition resolves or
+    times out independently through the `Future` returned by `register`. Polling runs on a daemon
+    thread that exists only while something is pending.
+
+    Example:
+        waiter = BatchWaiter(poll_interval=0.5, backoff=2, max_interval=4)
+        futures = [
+            waiter.register(
+                resource=("forks", source_id),
+                fetch=lambda: api.list_gist_forks(source_id).json(),
+                predicate=lambda forks, fork_id=fork_id: any(f["id"] == fork_id for f in forks),
+                timeout=15,
+                condition_summary=f"fork {fork_id} appears in forks list",
+            )
+            for fork_id in fork_ids
+        ]
+        results = [f.result() for f in futures]  # raises AssertionError for timed-out conditions
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = 1,
+        backoff: float = 1.0,
+        max_interval: Optional[float] = None,
+        jitter: float = 0.0,
+    ) -> None:
+        self.poll_interval = poll_interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.polls = 0
+        self._resources: dict[Hashable, _SharedResource] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(
+        self,
+        resource: Hashable,
+        fetch: Callable[[], Any],
+        predicate: Callable[[Any], Any],
+        timeout: float = 15,
+        expected_value: Optional[Any] = None,
+        condition_summary: Optional[str] = None,
+    ) -> Future:
+        """
+        Adds a condition evaluated as `predicate(fetch())` on every shared poll of `resource`.
+        The first fetcher registered for a resource is the one used for all of its conditions.
+        """
+        pending = _PendingCondition(predicate, expected_value, timeout, condition_summary or repr(resource))
+        with self._cond:
+            shared = self._resources.get(resource)
+            if shared is None:
+                shared = self._resources[resource] = _SharedResource(fetch, self.poll_interval)
+            shared.pending.append(pending)
+            shared.next_poll = min(shared.next_poll, pending.deadline)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="batch-waiter", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return pending.future
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return sum(len(r.pending) for r in self._resources.values())
+
+    def close(self) -> None:
+        """Cancels every pending condition."""
+        with self._cond:
+            for shared in self._resources.values():
+                for pending in shared.pending:
+                    pending.future.cancel()
+            self._resources.clear()
+            self._cond.notify()
+
+    def __enter__(self) -> "BatchWaiter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self._resources:
+                        self._thread = None
+                        return
+                    now = time.monotonic()
+                    due = [(key, r) for key, r in self._resources.items() if r.next_poll <= now]
+                    if due:
+                        break
+                    wake_at = min(r.next_poll for r in self._resources.values())
+                    self._cond.wait(max(0.0, wake_at - now))
+
+            for key, shared in due:
+                self._poll(key, shared)
+
+    def _poll(self, key: Hashable, shared: _SharedResource) -> None:
+        with self._cond:
+            self.polls += 1
+        try:
+            result, error = shared.fetch(), None
+        except Exception as e:
+            result, error = None, e
+            logger.debug(f"Shared poll of {key!r} failed: {e!r}")
+
+        resolved: list[tuple[_PendingCondition, Any, Optional[BaseException]]] = []
+        with self._cond:
+            for pending in list(shared.pending):
+                if error is not None:
+                    pending.last_result = error
+                    continue
+                try:
+                    value = pending.predicate(result)
+                except Exception as e:
+                    resolved.append((pending, None, e))
+                    continue
+                pending.last_result = value
+                if _is_reached(value, pending.expected_value):
+                    resolved.append((pending, value, None))
+            for pending, _, _ in resolved:
+                shared.pending.remove(pending)
+
+            now = time.monotonic()
+            self._expire(key, shared, now)
+            delay = shared.interval
+            if self.jitter:
+                delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            shared.interval *= self.backoff
+            if self.max_interval is not None:
+                shared.interval = min(shared.interval, self.max_interval)
+            # poll once more right at the earliest deadline instead of letting it expire unchecked
+            earliest_deadline = min((p.deadline for p in shared.pending), default=now + delay)
+            shared.next_poll = min(now + delay, earliest_deadline)
+
+        for pending, value, exc in resolved:
+            # marks the future running unless it was cancelled, so a concurrent close() can no longer cancel it
+            if not pending.future.set_running_or_notify_cancel():
+                continue
+            if exc is not None:
+                pending.future.set_exception(exc)
             else:
-                if last_result:
-                    return last_result
-            time.sleep(poll_interval)
+                pending.future.set_result(value)
 
-        error_message = (
-            f"Condition was not met within {timeout} seconds. Condition: {condition_summary}. "
-            f"Last result: \"{last_result}\"."
-        )
-        if expected_value is not None:
-            error_message = f"{error_message} Expected: \"{expected_value}\"."
-        raise AssertionError(error_message)
+    def _expire(self, key: Hashable, shared: _SharedResource, now: float) -> None:
+        # Called with the lock held, right after a poll: fails conditions whose deadline has passed.
+        for pending in list(shared.pending):
+            if pending.deadline <= now:
+                shared.pending.remove(pending)
+                if pending.future.set_running_or_notify_cancel():
+                    pending.future.set_exception(
+                        AssertionError(
+                            _timeout_error(pending.summary, pending.timeout, pending.last_result, pending.expected_value)
+                        )
+                    )
+        if not shared.pending and self._resources.get(key) is shared:
+            del self._resources[key]
@@ -1,12 +1,111 @@
 import contextlib
-from typing import Generator
-from uuid import uuid4
+import random
+from pathlib import Path
+from typing import Callable, Generator, Optional
+from urllib.parse import urlsplit
 
 import pytest
 
 from src.http_client import HttpClient
 from src.api.gists import GistsAPI
+from src.cassette import MODES as CASSETTE_MODES, Cassette, use_cassette
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.metrics import RequestMetrics
+from src.reporting import MODES, AttachmentPolicy, default_reporter
 from src.utils.env import load_settings
+from src.utils.gist_pool import OVERFLOW_POLICIES, GistPool
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("gists")
+    group.addoption(
+        "--gist-pool-size",
+        type=int,
+        default=4,
+        help="Number of gists pre-created for the temp_gist fixture (default: 4)",
+    )
+    group.addoption(
+        "--gist-pool-overflow",
+        choices=OVERFLOW_POLICIES,
+        default="create",
+        help="What temp_gist does when the pool is empty (default: create)",
+    )
+    group.addoption(
+        "--http-metrics",
+        metavar="PATH",
+        default=None,
+        help="Write per-endpoint request timings to PATH (Prometheus text format if PATH ends with .prom, JSON otherwise)",
+    )
+    group.addoption(
+        "--allure-http",
+        choices=MODES,
+        default="deferred",
+        help="Request/response attachments: always, deferred (formatted off the request path, default), "
+        "on_failure or off. Responses with an unexpected status are always attached.",
+    )
+    group.addoption(
+        "--allure-http-sample",
+        type=float,
+        default=1.0,
+        help="Fraction of responses captured for attachments (default: 1.0)",
+    )
+    group.addoption(
+        "--allure-http-max-bytes",
+        type=int,
+        default=64 * 1024,
+        help="Bodies in attachments are truncated to this many bytes (default: 65536)",
+    )
+    group.addoption(
+        "--cassette",
+        metavar="PATH",
+        default=None,
+        help="Record/replay requests to BASE_URL through the cassette file at PATH (see src.cassette)",
+    )
+    group.addoption(
+        "--cassette-mode",
+        choices=CASSETTE_MODES,
+        default="record_missing",
+        help="record, strict or lenient replay, or record_missing (default: replay what is recorded, record the rest)",
+    )
+
+
+REQUEST_METRICS = RequestMetrics()
+
+
+def _hex_source(rng: random.Random) -> Callable[..., str]:
+    return lambda length=8: f"{rng.getrandbits(4 * length):0{length}x}"
+
+
+def pytest_configure(config):
+    default_reporter().configure(
+        default=AttachmentPolicy(
+            mode=config.getoption("--allure-http"),
+            sample_rate=config.getoption("--allure-http-sample"),
+            max_body_bytes=config.getoption("--allure-http-max-bytes"),
+        )
+    )
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    lines = REQUEST_METRICS.format_slowest(limit=10)
+    if lines:
+        terminalreporter.write_sep("-", "slowest endpoints (http_client)")
+        for line in lines:
+            terminalreporter.write_line(line)
+    path = config.getoption("--http-metrics")
+    if path:
+        path = Path(path)
+        path.write_text(REQUEST_METRICS.to_prometheus() if path.suffix == ".prom" else REQUEST_METRICS.to_json())
+        terminalreporter.write_line(f"request metrics written to {path}")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    # deferred/on_failure attachments of this phase go to the test now that its outcome is known
+    default_reporter().flush(failed=report.failed)
 
 
 @pytest.fixture(scope="session")
@@ -14,12 +113,50 @@ def settings():
     return load_settings()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cassette(request) -> Generator[Optional[Cassette], None, None]:
+    path = request.config.getoption("--cassette")
+    if not path:
+        yield None
+        return
+    settings = request.getfixturevalue("settings")
+    mode = request.config.getoption("--cassette-mode")
+    # also used by clients the tests build themselves; local fake servers of other tests stay live
+    with Cassette(path, mode=mode, hosts=[urlsplit(settings.base_url).netloc]) as tape:
+        use_cassette(tape)
+        try:
+            yield tape
+        finally:
+            use_cassette(None)
+
+
+@pytest.fixture()
+def test_rng(request, cassette) -> random.Random:
+    # Source of generated test data. While a cassette is active it is seeded by the test id, so that a replay
+    # sends the requests that were recorded; the global `random` module is never reseeded.
+    return random.Random(request.node.nodeid if cassette is not None else None)
+
+
+@pytest.fixture()
+def unique_suffix(test_rng) -> Callable[..., str]:
+    """unique_suffix(length=8): random hex string for names and ids of test data, drawn from test_rng."""
+    return _hex_source(test_rng)
+
+
 @pytest.fixture(scope="session")
-def http_client(settings) -> HttpClient:
+def http_client(settings, cassette) -> HttpClient:
     headers = {}
     if settings.token:
         headers["Authorization"] = f"Bearer {settings.token}"
-    return HttpClient(base_url=settings.base_url, default_headers=headers)
+    return HttpClient(base_url=settings.base_url, default_headers=headers, hooks=[REQUEST_METRICS], cassette=cassette)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_circuit_breakers(request):
+    # the session client is shared: failures driven by one test must not leave a circuit open for the next
+    if "http_client" in request.fixturenames:
+        request.getfixturevalue("http_client").circuit_breakers.reset()
+    yield
 
 
 @pytest.fixture(scope="session")
@@ -27,14 +164,55 @@ def gists_api(http_client, settings) -> GistsAPI:
     return GistsAPI(http_client, api_version=settings.api_version)
 
 
+@pytest.fixture(scope="session")
+def fake_server() -> Generator[FakeGistsServer, None, None]:
+    # Dedicated local stand-in, independent of BASE_URL, for tests of client-side behaviour
+    with FakeGistsServer(FakeServerOptions(seed_public=45)) as server:
+        yield server
+
+
+@pytest.fixture()
+def fake_gists_api(fake_server) -> GistsAPI:
+    client = HttpClient(base_url=fake_server.base_url, default_headers={"Authorization": "Bearer fake-token"})
+    return GistsAPI(client)
+
+
+@pytest.fixture(scope="session")
+def gist_pool(gists_api, cassette, request) -> Generator[GistPool, None, None]:
+    pool = GistPool(
+        gists_api,
+        size=request.config.getoption("--gist-pool-size"),
+        overflow=request.config.getoption("--gist-pool-overflow"),
+        # with a cassette the pool works sequentially on seeded names: replayed gists are then created and
+        # handed out in recording order
+        max_workers=1 if cassette is not None else 8,
+        new_suffix=_hex_source(random.Random("gist-pool")) if cassette is not None else None,
+    )
+    with pool:
+        yield pool
+
+
+@pytest.fixture()
+def temp_gist(gist_pool: GistPool, request) -> Generator[dict, None, None]:
+    # Recycled from the session pool: reset to its baseline description/content after each test.
+    # Gists of failed tests are replaced, since their star state may be left behind.
+    gist = gist_pool.acquire()
+    try:
+        yield gist
+    finally:
+        rep_call = getattr(request.node, "rep_call", None)
+        gist_pool.release(gist, dirty=rep_call is None or rep_call.failed)
+
+
 @pytest.fixture()
-def temp_gist(gists_api: GistsAPI) -> Generator[dict, None, None]:
-    unique_suffix = uuid4().hex[:8]
+def fresh_gist(gists_api: GistsAPI, unique_suffix) -> Generator[dict, None, None]:
+    # Brand-new gist for tests that depend on an untouched revision history
+    suffix = unique_suffix()
     payload = {
-        "description": f"api-test-temp-{unique_suffix}",
+        "description": f"api-test-temp-{suffix}",
         "public": False,
         "files": {
-            f"test_{unique_suffix}.txt": {
+            f"test_{suffix}.txt": {
                 "content": "Hello from automated tests"
             }
         }
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from contextlib import contextmanager
+
+import allure
+import httpx
+import pytest
+
+from src.api.async_gists import AsyncGistsAPI
+from src.async_http_client import AsyncHttpClient
+from src.fake_server import FakeGistsServer
+
+
+@contextmanager
+def _emulate(server: FakeGistsServer, **options):
+    """Temporarily changes error/latency emulation of the shared fake server."""
+    previous = {name: getattr(server.options, name) for name in options}
+    for name, value in options.items():
+        setattr(server.options, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(server.options, name, value)
+
+
+def _client(server: FakeGistsServer, sent: list[str], **kw) -> AsyncHttpClient:
+    """Client recording the method of every request put on the wire in `sent`."""
+    client = AsyncHttpClient(
+        base_url=server.base_url, default_headers={"Authorization": "Bearer async"}, backoff_factor=0, **kw
+    )
+
+    async def record(request: httpx.Request) -> None:
+        sent.append(request.method)
+
+    client.client.event_hooks["request"].append(record)
+    return client
+
+
+@allure.title("Async client retries only requests the server cannot have processed")
+def test_async_retry_only_idempotent(fake_server):
+    async def run(status: int) -> list[str]:
+        sent: list[str] = []
+        async with _client(fake_server, sent) as client:
+            await client.get("/gists/public", expected_status=status)
+            await client.post("/gists", json={"files": {"a.txt": {"content": "a"}}}, expected_status=status)
+        return sent
+
+    with allure.step("GET is retried on 503, POST is not"):
+        with _emulate(fake_server, error_rate=1.0, error_status=503):
+            assert asyncio.run(run(503)) == ["GET"] * 4 + ["POST"]
+
+    with allure.step("429 means the request was rejected unprocessed: POST is retried too"):
+        with _emulate(fake_server, error_rate=1.0, error_status=429):
+            assert asyncio.run(run(429)) == ["GET"] * 4 + ["POST"] * 4
+
+
+@allure.title("Async client sleeps for Retry-After, and gives up on waits above MAX_RETRY_AFTER")
+def test_async_retry_after(fake_server):
+    async def run(**kw) -> tuple[list[str], float]:
+        sent: list[str] = []
+        async with _client(fake_server, sent, **kw) as client:
+            started = time.monotonic()
+            await client.get("/gists/public", expected_status=429)
+        return sent, time.monotonic() - started
+
+    with allure.step("Each retry waits the requested 0.2s"):
+        with _emulate(fake_server, error_rate=1.0, error_status=429, error_retry_after=0.2):
+            sent, elapsed = asyncio.run(run(retries_total=2))
+            assert sent == ["GET"] * 3
+            assert 0.4 <= elapsed < 1.5, elapsed
+
+    with allure.step("A Retry-After beyond MAX_RETRY_AFTER returns the response without retrying"):
+        with _emulate(fake_server, error_rate=1.0, error_status=429, error_retry_after=3600):
+            sent, elapsed = asyncio.run(run())
+            assert sent == ["GET"] and elapsed < 1, elapsed
+
+
+@allure.title("Async client maps (connect, read) timeouts and retries read timeouts of GETs")
+def test_async_tuple_timeout(fake_server):
+    timeout = AsyncHttpClient._to_httpx_timeout((2, 0.05))
+    assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (2, 0.05, 0.05, 0.05)
+    assert AsyncHttpClient._to_httpx_timeout(5) == httpx.Timeout(5)
+
+    async def run() -> list[str]:
+        sent: list[str] = []
+        async with _client(fake_server, sent, timeout=(2, 0.05), retries_total=1) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.get("/gists/public")
+            with allure.step("A per-request timeout overrides the default"):
+                await client.get("/gists/public", timeout=(2, 5), expected_status=200)
+        return sent
+
+    with _emulate(fake_server, latency=0.3):
+        assert asyncio.run(run()) == ["GET"] * 3
+
+
+@allure.title("Async client asserts the expected status with URL and body in the message")
+def test_async_expected_status(fake_server):
+    async def run() -> None:
+        async with AsyncHttpClient(base_url=fake_server.base_url, default_headers={"Authorization": "Bearer async"}) as client:
+            api = AsyncGistsAPI(client)
+            await api.get_gist("missing", expected_status=404)
+            with pytest.raises(AssertionError) as error:
+                await api.get_gist("missing")
+            message = str(error.value)
+            assert "Unexpected status 404, expected 200" in message, message
+            assert f"{fake_server.base_url}/gists/missing" in message and "Not Found" in message, message
+            resp = await api.list_public_gists(None, 5)
+            assert resp.status_code == 200 and len(resp.json()) == 5
+
+    asyncio.run(run())
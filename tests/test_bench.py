@@ -0,0 +1,65 @@
+import allure
+
+from src.api.gists import GistsAPI
+from src.bench import CASES, PAYLOADS, compare, fake_server_process, load_baseline, run_benchmarks
+from src.bench.runner import case_key
+from src.http_client import HttpClient
+
+SMOKE_CASES = [case for case in CASES if case.name in ("list_public_gists", "get_gist", "delete_gist")]
+
+
+def _report(**results) -> dict:
+    return {"results": results}
+
+
+@allure.title("Benchmark comparison flags CPU and memory regressions beyond threshold and noise")
+def test_bench_compare():
+    baseline = _report(get_gist={"cpu_ratio": 1.2, "peak_kb": 20.0}, star={"cpu_ratio": 1.0, "peak_kb": 19.0})
+
+    with allure.step("Within threshold plus noise floor, or missing from the baseline: no regression"):
+        current = _report(get_gist={"cpu_ratio": 1.8, "peak_kb": 40.0}, new={"cpu_ratio": 9.0, "peak_kb": 1e6})
+        assert compare(current, baseline) == []
+
+    with allure.step("CPU ratio and peak memory are gated separately, with configurable thresholds"):
+        current = _report(get_gist={"cpu_ratio": 2.0, "peak_kb": 20.0}, star={"cpu_ratio": 1.0, "peak_kb": 60.0})
+        regressions = compare(current, baseline)
+        assert regressions == [
+            "get_gist: cpu_ratio 2.0 vs 1.2 expected (+67%, threshold 50%)",
+            "star: peak_kb 60.0 vs 19.0 expected (+216%, threshold 25%)",
+        ], regressions
+        assert compare(current, baseline, {"cpu_ratio": 1.0}) == []
+
+
+@allure.title("Stored baseline covers every benchmark case and payload")
+def test_bench_baseline_covers_cases():
+    baseline = load_baseline()
+    assert baseline is not None, "Run `python -m src.bench --update-baseline` to create src/bench/baseline.json"
+    expected = {
+        case_key(case, payload)
+        for case in CASES
+        for payload in (PAYLOADS if case.per_payload else [None])
+    }
+    assert set(baseline["results"]) == expected, set(baseline["results"]) ^ expected
+
+
+@allure.title("Benchmarks against the zero-latency stand-in detect added per-call overhead")
+def test_bench_detects_overhead():
+    def burn_cpu(timing) -> None:
+        sum(i * i for i in range(100_000))
+
+    with fake_server_process() as base_url:
+
+        def run(**client_kw) -> dict:
+            api = GistsAPI(HttpClient(base_url=base_url, default_headers={"Authorization": "Bearer bench"}, **client_kw))
+            return run_benchmarks(api, SMOKE_CASES, payloads=["1x1KB"], iterations=5, memory_iterations=2, warmup=1)
+
+        with allure.step("Every case reports CPU, wall, reference and peak memory"):
+            clean = run()
+            assert set(clean["results"]) == {"list_public_gists", "get_gist[1x1KB]", "delete_gist[1x1KB]"}
+            for metrics in clean["results"].values():
+                assert set(metrics) == {"cpu_us", "wall_us", "peak_kb", "reference_us", "cpu_ratio"}, metrics
+                assert metrics["cpu_us"] > 0 and metrics["peak_kb"] > 0, metrics
+
+        with allure.step("A request hook burning CPU is reported as a regression of every case"):
+            regressions = compare(run(hooks=[burn_cpu]), clean)
+            assert len([line for line in regressions if "cpu_ratio" in line]) == 3, regressions
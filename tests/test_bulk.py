@@ -0,0 +1,66 @@
+import allure
+import pytest
+
+from src.api.gists import GistsAPI
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+
+
+@allure.title("Bulk create/delete adapts to the secondary rate limit and is safe to repeat")
+def test_bulk_create_delete_under_secondary_limit():
+    options = FakeServerOptions(seed_public=0, secondary_rate_limit=8, secondary_window=1)
+    with FakeGistsServer(options) as server:
+        api = GistsAPI(HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer bulk"}))
+        payloads = [{"files": {f"bulk_{i}.txt": {"content": str(i)}}} for i in range(12)]
+
+        with allure.step("Create 12 gists with at most 8 mutating requests per second"):
+            run = api.create_many(payloads, max_workers=6)
+            created = {result.key: result.response.json()["id"] for result in run if result.ok}
+            report = run.report().raise_for_failures()
+            assert report.succeeded == 12 and sorted(created) == list(range(12)), report
+            assert report.retried > 0, f"Expected throttled and retried items: {report}"
+
+        with allure.step("Delete them plus an unknown id, twice"):
+            ids = list(created.values()) + ["0000unknown"]
+            first = api.delete_many(ids, max_workers=6).report().raise_for_failures()
+            assert (first.succeeded, first.already_done) == (12, 1), first
+            second = api.delete_many(ids, max_workers=6).report().raise_for_failures()
+            assert (second.succeeded, second.already_done) == (0, 13), second
+
+
+@allure.title("Bulk star reports failures by status")
+def test_bulk_star_failures(fake_gists_api):
+    gist = fake_gists_api.create_gist({"files": {"s.txt": {"content": "star"}}}).json()
+    try:
+        report = fake_gists_api.star_many([gist["id"], "0000unknown"]).report()
+        assert (report.succeeded, report.failed) == (1, 1), report
+        assert report.failures_by_status == {"404": 1}
+        assert fake_gists_api.unstar_many([gist["id"]] * 2, max_workers=1).report().failed == 0
+    finally:
+        fake_gists_api.delete_gist(gist["id"])
+
+
+@allure.title("An input iterable that raises partway fails the run after the items read so far")
+def test_bulk_input_error_is_raised(fake_gists_api):
+    gists = [fake_gists_api.create_gist({"files": {f"in_{i}.txt": {"content": str(i)}}}).json() for i in range(2)]
+
+    def gist_ids():
+        for gist in gists:
+            yield gist["id"]
+        raise ConnectionError("listing failed")
+
+    try:
+        with allure.step("report() raises the input error"):
+            run = fake_gists_api.star_many(gist_ids())
+            with pytest.raises(ConnectionError, match="listing failed"):
+                run.report()
+            assert run._report.succeeded == 2, run._report
+
+        with allure.step("Iterating yields the completed items, then raises"):
+            results = []
+            with pytest.raises(ConnectionError):
+                for result in fake_gists_api.unstar_many(gist_ids()):
+                    results.append(result)
+            assert sorted(result.key for result in results) == sorted(gist["id"] for gist in gists)
+    finally:
+        fake_gists_api.delete_many([gist["id"] for gist in gists]).report().raise_for_failures()
@@ -0,0 +1,100 @@
+import os
+
+import allure
+import requests
+
+from src.api.gists import GistsAPI
+from src.cache import CacheEntry, DiskCacheBackend, MemoryCacheBackend, ResponseCache
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+
+
+def _api(base_url: str, cache: ResponseCache, token: str = "cache") -> GistsAPI:
+    return GistsAPI(HttpClient(base_url=base_url, default_headers={"Authorization": f"Bearer {token}"}, cache=cache))
+
+
+def _entry(content: bytes) -> CacheEntry:
+    return CacheEntry(url="http://x/gists", status_code=200, headers={}, content=content, etag='W/"x"')
+
+
+@allure.title("Cache answers a 304 with the stored body and the fresh rate-limit headers")
+def test_cache_serves_304_with_merged_headers():
+    with FakeGistsServer(FakeServerOptions(seed_public=0, rate_limit=100)) as server:
+        cache = ResponseCache()
+        api = _api(server.base_url, cache)
+        gist_id = api.create_gist({"files": {"a.txt": {"content": "cached"}}}).json()["id"]
+
+        first = api.get_gist(gist_id)
+        assert not getattr(first, "from_cache", False) and (cache.hits, cache.misses) == (0, 1)
+
+        with allure.step("Revalidation hits: body and content headers from the cache, the rest from the 304"):
+            second = api.get_gist(gist_id)
+            assert second.from_cache and second.status_code == 200 and cache.hits == 1
+            assert second.json() == first.json()
+            assert second.headers["Content-Type"] == first.headers["Content-Type"]
+            assert second.headers["ETag"] == first.headers["ETag"]
+            remaining = int(first.headers["X-RateLimit-Remaining"])
+            assert second.headers["X-RateLimit-Remaining"] == str(remaining - 1), second.headers
+
+        with allure.step("A changed gist is fetched and stored again"):
+            api.update_gist(gist_id, {"files": {"a.txt": {"content": "changed"}}})
+            third = api.get_gist(gist_id)
+            assert not getattr(third, "from_cache", False) and third.json()["files"]["a.txt"]["content"] == "changed"
+            assert api.get_gist(gist_id).from_cache
+
+
+@allure.title("Cache keys differ per Accept and Authorization")
+def test_cache_key_varies_by_representation_headers():
+    def key(**headers) -> str:
+        return cache.key_for(requests.Request("GET", "http://x/gists", headers=headers).prepare())
+
+    cache = ResponseCache()
+    base = key(Accept="application/json", Authorization="Bearer a")
+    assert base == key(Accept="application/json", Authorization="Bearer a", **{"User-Agent": "other"})
+    assert base != key(Accept="application/vnd.github.raw", Authorization="Bearer a")
+    assert base != key(Accept="application/json", Authorization="Bearer b")
+
+    with FakeGistsServer(FakeServerOptions(seed_public=0)) as server:
+        first = _api(server.base_url, cache, token="a")
+        gist_id = first.create_gist({"files": {"a.txt": {"content": "shared"}}}).json()["id"]
+        first.get_gist(gist_id)
+        with allure.step("Another token does not reuse the entry"):
+            other = _api(server.base_url, cache, token="b").get_gist(gist_id)
+            assert not getattr(other, "from_cache", False) and cache.hits == 0
+            assert first.get_gist(gist_id).from_cache and cache.hits == 1
+
+
+@allure.title("A 404 evicts the cached entry")
+def test_cache_evicts_on_404():
+    with FakeGistsServer(FakeServerOptions(seed_public=0)) as server:
+        backend = MemoryCacheBackend()
+        api = _api(server.base_url, ResponseCache(backend))
+        gist_id = api.create_gist({"files": {"a.txt": {"content": "gone"}}}).json()["id"]
+        api.get_gist(gist_id)
+        assert len(backend) == 1
+        api.delete_gist(gist_id)
+        api.get_gist(gist_id, expected_status=404)
+        assert len(backend) == 0
+
+
+@allure.title("Disk cache survives a restart and evicts the least recently used files")
+def test_disk_cache_backend(tmp_path):
+    with FakeGistsServer(FakeServerOptions(seed_public=0)) as server:
+        api = _api(server.base_url, ResponseCache(DiskCacheBackend(tmp_path)))
+        gist_id = api.create_gist({"files": {"a.txt": {"content": "on disk"}}}).json()["id"]
+        body = api.get_gist(gist_id).json()
+
+        with allure.step("A new backend over the same directory revalidates the stored entry"):
+            restarted = _api(server.base_url, ResponseCache(DiskCacheBackend(tmp_path)))
+            resp = restarted.get_gist(gist_id)
+            assert resp.from_cache and resp.json() == body
+
+    with allure.step("Above max_entries the oldest files are removed"):
+        backend = DiskCacheBackend(tmp_path / "lru", max_entries=2)
+        for i, key in enumerate(["a", "b"]):
+            backend.set(key, _entry(key.encode()))
+            os.utime(backend._path(key), (1000 + i, 1000 + i))
+        backend.get("a")  # touched: now the most recently used
+        backend.set("c", _entry(b"c"))
+        assert backend.get("b") is None
+        assert backend.get("a").content == b"a" and backend.get("c").content == b"c"
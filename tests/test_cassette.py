@@ -0,0 +1,58 @@
+import allure
+import pytest
+
+from src.api.gists import GistsAPI
+from src.cassette import Cassette, CassetteMiss
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+
+
+def _api(base_url: str, cassette: Cassette) -> GistsAPI:
+    return GistsAPI(HttpClient(base_url=base_url, default_headers={"Authorization": "Bearer tape"}, cassette=cassette))
+
+
+@allure.title("Cassettes record responses and replay them offline in strict, lenient and record_missing modes")
+def test_cassette_record_and_replay(tmp_path):
+    path = tmp_path / "gists.cas"
+    payload = {"description": "taped", "public": False, "files": {"a.txt": {"content": "one"}}}
+
+    with FakeGistsServer(FakeServerOptions(seed_public=3)) as server:
+        with Cassette(path, mode="record") as tape:
+            api = _api(server.base_url, tape)
+            gist_id = api.create_gist(payload).json()["id"]
+            before = api.get_gist(gist_id).json()
+            api.update_gist(gist_id, {"files": {"a.txt": {"content": "two"}}})
+            after = api.get_gist(gist_id).json()
+            assert tape.recorded == 4
+        dead_url = server.base_url
+
+    with allure.step("Strict replay needs no server and answers repeated requests in recording order"):
+        with Cassette(path, mode="strict") as tape:
+            assert len(tape) == 4
+            api = _api(dead_url, tape)
+            resp = api.create_gist({"public": False, "files": {"a.txt": {"content": "one"}}, "description": "taped"})
+            assert resp.json()["id"] == gist_id and getattr(resp, "from_cassette", False)
+            assert api.get_gist(gist_id).json() == before
+            api.update_gist(gist_id, {"files": {"a.txt": {"content": "two"}}})
+            assert api.get_gist(gist_id).json() == after
+            assert api.get_gist(gist_id).json() == after, "The last recorded response repeats"
+            with pytest.raises(CassetteMiss):
+                api.update_gist(gist_id, {"files": {"a.txt": {"content": "three"}}})
+
+    with allure.step("Lenient replay ignores request bodies"):
+        with Cassette(path, mode="lenient") as tape:
+            api = _api(dead_url, tape)
+            assert api.create_gist({"files": {"b.txt": {"content": "other"}}}).json()["id"] == gist_id
+            with pytest.raises(CassetteMiss):
+                api.get_gist("not-recorded")
+
+    with allure.step("record_missing appends new interactions to the same file"):
+        with FakeGistsServer(FakeServerOptions(seed_public=3)) as server:
+            with Cassette(path, mode="record_missing") as tape:
+                api = _api(server.base_url, tape)
+                assert api.create_gist(payload).json()["id"] == gist_id
+                api.list_public_gists()
+                assert (tape.hits, tape.recorded) == (1, 1)
+        with Cassette(path, mode="strict") as tape:
+            assert len(tape) == 5
+            assert len(_api(dead_url, tape).list_public_gists().json()) == 3
@@ -0,0 +1,60 @@
+import time
+from urllib.parse import urlsplit
+
+import allure
+
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+
+
+def _stats(client: HttpClient) -> dict:
+    (stats,) = client.pool_stats().values()
+    return stats
+
+
+@allure.title("Warmed-up keep-alive connections are reused and pool churn is counted")
+def test_pool_warm_up_and_stats():
+    with FakeGistsServer(FakeServerOptions(seed_public=3, latency=0.2)) as server:
+        client = HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer t"}, pool_maxsize=4)
+
+        with allure.step("warm_up opens connections before any request, capped by the pool size"):
+            assert client.warm_up(3) == 3
+            assert client.warm_up(10) == 1
+            stats = _stats(client)
+            assert (stats["opened"], stats["idle"], stats["reused"]) == (4, 4, 0), stats
+
+        with allure.step("Sequential requests reuse the warm connections"):
+            for _ in range(3):
+                client.get("/gists/public", expected_status=200)
+            stats = _stats(client)
+            assert (stats["opened"], stats["reused"]) == (4, 3), stats
+
+        with allure.step("More concurrent requests than pooled connections open and discard extras"):
+            client.map("GET", ["/gists/public"] * 8, max_workers=8).raise_for_failures()
+            stats = _stats(client)
+            assert stats["opened"] == 8 and stats["discarded"] == 4 and stats["idle"] == 4, stats
+
+        with allure.step("reap_idle_connections closes the idle connections"):
+            assert client.reap_idle_connections() == 4
+            assert _stats(client)["idle"] == 0
+
+
+@allure.title("Per-host pool size, blocking checkouts and the idle timeout")
+def test_pool_sizing_and_idle_timeout():
+    with FakeGistsServer(FakeServerOptions(seed_public=3, latency=0.2)) as server:
+        host = urlsplit(server.base_url).hostname
+
+        with allure.step("A blocking pool sized 2 for the host never opens more and reports the wait"):
+            client = HttpClient(base_url=server.base_url, pool_block=True, pool_host_maxsize={host: 2})
+            client.map("GET", ["/gists/public"] * 6, max_workers=6).raise_for_failures()
+            stats = _stats(client)
+            assert stats["maxsize"] == 2 and stats["opened"] == 2 and stats["discarded"] == 0, stats
+            assert stats["blocked"] >= 4 and stats["blocked_seconds"] > 0.2, stats
+
+        with allure.step("Connections idle longer than pool_idle_timeout are reaped on the next checkout"):
+            client = HttpClient(base_url=server.base_url, pool_idle_timeout=0.1)
+            client.get("/gists/public", expected_status=200)
+            time.sleep(0.2)
+            client.get("/gists/public", expected_status=200)
+            stats = _stats(client)
+            assert stats["reaped"] == 1 and stats["opened"] == 2 and stats["reused"] == 0, stats
@@ -0,0 +1,53 @@
+import hashlib
+
+import allure
+
+from src.api.gists import GistsAPI
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+from src.reporting import AllureReporter
+
+
+@allure.title("Large gist files stream in bounded chunks, into files and memory maps, with Range resume")
+def test_streaming_download(tmp_path, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(AllureReporter, "record", lambda self, resp, unexpected=False: recorded.append(resp))
+    content = "".join(f"line {i:07d}\n" for i in range(250_000))  # ~3.2 MB
+    expected = hashlib.sha256(content.encode()).hexdigest()
+
+    with FakeGistsServer(FakeServerOptions(seed_public=0, inline_limit=1024)) as server:
+        api = GistsAPI(HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer dl"}))
+        gist_id = api.create_gist({"files": {"big.log": {"content": content}}}).json()["id"]
+        file = api.typed.get_gist(gist_id).files["big.log"]
+        assert file.truncated and file.size == len(content)
+        recorded.clear()
+
+        with allure.step("Chunks never exceed chunk_size and progress reaches the total"):
+            progress = []
+            digest = hashlib.sha256()
+            for chunk in api.iter_file_chunks(file, chunk_size=32 * 1024, progress=lambda n, t: progress.append((n, t))):
+                assert len(chunk) <= 32 * 1024
+                digest.update(chunk)
+            assert digest.hexdigest() == expected
+            assert progress[-1] == (file.size, file.size) and len(progress) >= file.size // (32 * 1024)
+            assert not recorded, "Streamed bodies must not be captured for the report"
+
+        with allure.step("An interrupted download resumes from its partial file"):
+            dest = tmp_path / "big.log"
+            (tmp_path / "big.log.part").write_bytes(content.encode()[:1_000_000])
+            progress.clear()
+            api.download_file(file, dest, progress=lambda n, t: progress.append(n))
+            assert progress[0] > 1_000_000, "Download should continue after the bytes already on disk"
+            assert hashlib.sha256(dest.read_bytes()).hexdigest() == expected
+
+        with allure.step("A complete partial file needs no body at all (416)"):
+            (tmp_path / "again.log.part").write_bytes(content.encode())
+            api.download_file(file, tmp_path / "again.log")
+            assert (tmp_path / "again.log").stat().st_size == file.size
+
+        with allure.step("Memory-mapped download"):
+            buffer = api.download_file_to_mmap(file)
+            try:
+                assert hashlib.sha256(buffer[:]).hexdigest() == expected
+            finally:
+                buffer.close()
@@ -0,0 +1,55 @@
+import allure
+
+from src.api.gists import GistsAPI
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+
+
+@allure.title("Fake server paginates public gists with Link headers")
+def test_fake_server_link_pagination(fake_gists_api):
+    with allure.step("First page carries rel=next and rel=last"):
+        resp = fake_gists_api.list_public_gists(per_page=20)
+        assert len(resp.json()) == 20, f"Expected 20 gists, got {len(resp.json())}"
+        assert "next" in resp.links and "last" in resp.links, f"Unexpected Link header: {resp.headers.get('Link')}"
+
+    with allure.step("expected_status stays positional, page is keyword-only"):
+        second = fake_gists_api.list_public_gists(None, 20, 200, page=2).json()
+        assert len(second) == 20 and not {g["id"] for g in second} & {g["id"] for g in resp.json()}
+
+    with allure.step("Lazy iterator walks every page, with and without prefetch"):
+        ids = [g["id"] for g in fake_gists_api.iter_public_gists(per_page=20)]
+        prefetched = [g["id"] for g in fake_gists_api.iter_public_gists(per_page=7, prefetch=True)]
+        assert len(ids) == len(set(ids)) >= 45, f"Expected at least 45 distinct gists, got {len(ids)}"
+        assert prefetched == ids, "Prefetching iterator should yield the same gists in the same order"
+
+
+@allure.title("Fake server answers 304 to a matching If-None-Match")
+def test_fake_server_etag(fake_gists_api, fake_server):
+    gist = fake_gists_api.create_gist({"files": {"a.txt": {"content": "etag"}}}).json()
+    etag = fake_gists_api.get_gist(gist["id"]).headers["ETag"]
+    fake_gists_api.client.get(
+        url=f"/gists/{gist['id']}",
+        headers={"If-None-Match": etag},
+        expected_status=304,
+    )
+    fake_gists_api.delete_gist(gist["id"])
+
+
+@allure.title("Fake server emulates primary and secondary rate limits")
+def test_fake_server_rate_limits():
+    options = FakeServerOptions(seed_public=1, rate_limit=3, secondary_rate_limit=1)
+    with FakeGistsServer(options) as server:
+        client = HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer t"}, retries_total=0)
+        api = GistsAPI(client)
+
+        with allure.step("Second write within the secondary window is rejected with Retry-After"):
+            api.create_gist({"files": {"a.txt": {"content": "1"}}})
+            resp = api.create_gist({"files": {"b.txt": {"content": "2"}}}, expected_status=403)
+            assert int(resp.headers["Retry-After"]) > 0, "Secondary limit response should carry Retry-After"
+
+        with allure.step("Primary budget is reported and enforced"):
+            resp = api.list_public_gists()
+            assert resp.headers["X-RateLimit-Remaining"] == "1", resp.headers
+            api.list_public_gists()
+            resp = api.list_public_gists(expected_status=403)
+            assert resp.headers["X-RateLimit-Remaining"] == "0", resp.headers
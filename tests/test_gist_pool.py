@@ -0,0 +1,115 @@
+import threading
+
+import allure
+import pytest
+
+from src.api.gists import GistsAPI
+from src.utils.gist_pool import BASELINE_CONTENT, GistPool, GistPoolExhausted
+
+
+class _FailingCreates(GistsAPI):
+    """GistsAPI whose create_gist raises after `succeed` successful calls, recording the created ids."""
+
+    def __init__(self, api: GistsAPI, succeed: int) -> None:
+        super().__init__(api.client)
+        self.succeed = succeed
+        self.created: list[str] = []
+
+    def create_gist(self, payload, expected_status=201):
+        if len(self.created) == self.succeed:
+            raise ConnectionError("create_gist failed")
+        resp = super().create_gist(payload, expected_status)
+        self.created.append(resp.json()["id"])
+        return resp
+
+
+def _exists(api: GistsAPI, gist_id: str) -> bool:
+    return api.get_gist(gist_id, expected_status=None).status_code == 200
+
+
+@allure.title("Pool with the fail policy raises when empty, the wait policy blocks until a release")
+def test_gist_pool_overflow_policies(fake_gists_api):
+    with GistPool(fake_gists_api, size=1, overflow="fail") as pool:
+        gist = pool.acquire()
+        with pytest.raises(GistPoolExhausted):
+            pool.acquire()
+        pool.release(gist)
+        assert pool.acquire()["id"] == gist["id"]
+
+    with GistPool(fake_gists_api, size=1, overflow="wait", wait_timeout=0.1) as pool:
+        gist = pool.acquire()
+        with allure.step("Nothing released within wait_timeout"):
+            with pytest.raises(GistPoolExhausted):
+                pool.acquire()
+        with allure.step("A release from another thread wakes the waiting acquire"):
+            pool.wait_timeout = 10
+            releaser = threading.Timer(0.1, pool.release, args=(gist,))
+            releaser.start()
+            assert pool.acquire()["id"] == gist["id"]
+            releaser.join()
+
+    with GistPool(fake_gists_api, size=1, overflow="create") as pool:
+        pooled = pool.acquire()
+        extra = pool.acquire()
+        assert extra["id"] != pooled["id"]
+        with allure.step("An overflow gist is deleted on release instead of joining the pool"):
+            pool.release(extra)
+            pool.release(pooled)
+            assert pool.idle_count == 1
+        pool.close()
+        assert not _exists(fake_gists_api, extra["id"]) and not _exists(fake_gists_api, pooled["id"])
+
+
+@allure.title("Released gists are reset to their baseline; dirty ones are replaced")
+def test_gist_pool_reset_and_replace(fake_gists_api):
+    with GistPool(fake_gists_api, size=1, overflow="fail") as pool:
+        gist = pool.acquire()
+        (filename,) = gist["files"]
+        fake_gists_api.update_gist(
+            gist["id"],
+            {"description": "changed", "files": {filename: {"content": "changed"}, "extra.txt": {"content": "x"}}},
+        )
+
+        with allure.step("Description and content are restored and added files removed"):
+            pool.release(gist)
+            reset = fake_gists_api.get_gist(pool.acquire()["id"]).json()
+            assert reset["id"] == gist["id"] and reset["description"] == gist["description"]
+            assert list(reset["files"]) == [filename]
+            assert reset["files"][filename]["content"] == BASELINE_CONTENT
+
+        with allure.step("A dirty gist is deleted and a fresh one takes its place"):
+            pool.release(reset, dirty=True)
+            pool.overflow, pool.wait_timeout = "wait", 10
+            replacement = pool.acquire()
+            assert replacement["id"] != gist["id"] and _exists(fake_gists_api, replacement["id"])
+            assert not _exists(fake_gists_api, gist["id"])
+
+
+@allure.title("A failing fill() in __enter__ deletes the gists already created")
+def test_gist_pool_enter_cleans_up_on_failure(fake_gists_api):
+    api = _FailingCreates(fake_gists_api, succeed=2)
+    pool = GistPool(api, size=4, max_workers=1)
+    with pytest.raises(ConnectionError):
+        with pool:
+            pass
+    assert len(api.created) == 2 and pool.idle_count == 0
+    assert not any(_exists(fake_gists_api, gist_id) for gist_id in api.created)
+
+
+@allure.title("A gist released after close() is deleted synchronously instead of being reset")
+def test_gist_pool_release_after_close(fake_gists_api):
+    pool = GistPool(fake_gists_api, size=1, overflow="create").fill()
+    pooled, extra = pool.acquire(), pool.acquire()
+    pool.close()
+    assert not _exists(fake_gists_api, pooled["id"]) and not _exists(fake_gists_api, extra["id"])
+
+    with allure.step("Releasing a gist created by acquire() after close() deletes it"):
+        late = pool.acquire()
+        assert _exists(fake_gists_api, late["id"])
+        pool.release(late)
+        assert not _exists(fake_gists_api, late["id"])
+
+    with allure.step("Releasing already deleted gists, dirty or not, does not raise"):
+        pool.release(pooled)
+        pool.release(extra, dirty=True)
+        assert pool.idle_count == 0
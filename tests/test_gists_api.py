@@ -1,7 +1,3 @@
-import random
-import time
-import uuid
-
 import allure
 
 from src.api.gists import GistsAPI
@@ -22,12 +18,12 @@ def test_create_and_get_gist(gists_api, temp_gist):
 
 
 @allure.title("Update an existing Gist")
-def test_update_gist(gists_api, temp_gist):
+def test_update_gist(gists_api, temp_gist, unique_suffix):
     gist_id = temp_gist["id"]
     assert gist_id, "Expected a valid gist ID"
 
     filename = list(temp_gist["files"].keys())[0]
-    new_desc = f"updated-{int(time.time())}"
+    new_desc = f"updated-{unique_suffix()}"
     new_content = "Updated content via automated test"
 
     with allure.step("Update gist description and content"):
@@ -100,8 +96,8 @@ def test_list_public_gists(gists_api):
 
 
 @allure.title("List public gists returns particular number of gists")
-def test_list_public_gists_per_page(gists_api):
-    expected_gists_number = random.randint(1, 100)
+def test_list_public_gists_per_page(gists_api, test_rng):
+    expected_gists_number = test_rng.randint(1, 100)
 
     with allure.step("List public gists"):
         resp = gists_api.list_public_gists(per_page=expected_gists_number)
@@ -111,16 +107,16 @@ def test_list_public_gists_per_page(gists_api):
 
 
 @allure.title("Gist commits contain two versions after an update")
-def test_gist_commits(gists_api, temp_gist):
-    gist_id = temp_gist["id"]
+def test_gist_commits(gists_api, fresh_gist, unique_suffix):
+    gist_id = fresh_gist["id"]
     assert gist_id, "Expected a valid gist ID"
 
-    filename = list(temp_gist["files"].keys())[0]
+    filename = list(fresh_gist["files"].keys())[0]
 
     with allure.step("Perform an update to create a second commit"):
         gists_api.update_gist(
             gist_id,
-            payload={"files": {filename: {"content": f"bump-{int(time.time())}"}}},
+            payload={"files": {filename: {"content": f"bump-{unique_suffix()}"}}},
         )
 
     with allure.step("List gist commits"):
@@ -141,12 +137,16 @@ def test_gist_forks(gists_api, forked_gist):
             item.get("id") == fork_id for item in gists_api.list_gist_forks(source_id).json()
         ),
         timeout=10,
+        poll_interval=0.5,
+        backoff=2,
+        max_interval=3,
+        jitter=0.2,
     )
 
 
 @allure.title("Get unknown gist returns 404")
-def test_get_nonexistent_gist_returns_404(gists_api):
-    non_existent = uuid.uuid4().hex
+def test_get_nonexistent_gist_returns_404(gists_api, unique_suffix):
+    non_existent = unique_suffix(32)
     with allure.step("Request non-existent gist and expect 404"):
         gists_api.get_gist(non_existent, expected_status=404)
 
@@ -0,0 +1,52 @@
+import allure
+
+from src.api.gists import GistsAPI
+from src.http_client import BatchError, HttpClient, RequestSpec
+
+
+@allure.title("Batch fans requests out concurrently, keeps order and reports partial failures")
+def test_batch_partial_failures(fake_server):
+    client = HttpClient(
+        base_url=fake_server.base_url,
+        default_headers={"Authorization": "Bearer fake-token"},
+        pool_maxsize=8,
+    )
+    api = GistsAPI(client)
+    ids = [g["id"] for g in api.list_public_gists(per_page=30).json()]
+    urls = [f"/gists/{gist_id}" for gist_id in ids] + ["/gists/does-not-exist"]
+
+    with allure.step("Fetch all gists on 8 threads"):
+        result = client.map("GET", urls, max_workers=8, expected_status=200)
+
+    with allure.step("Successful responses stay in input order, the missing gist is reported"):
+        assert len(result) == len(urls)
+        assert [r.json()["id"] for r in result.responses[:-1]] == ids
+        assert [item.spec.url for item in result.failures] == ["/gists/does-not-exist"]
+        try:
+            result.raise_for_failures()
+        except BatchError as e:
+            assert "1 of 31 batched requests failed" in str(e), str(e)
+        else:
+            raise AssertionError("raise_for_failures should raise for a failed item")
+
+
+@allure.title("Per-request cookies and headers never leak into the shared session")
+def test_per_request_cookies_are_isolated(fake_server):
+    client = HttpClient(base_url=fake_server.base_url, default_cookies={"shared": "1"})
+    specs = [
+        RequestSpec(
+            method="GET",
+            url="/gists/public",
+            cookies={"worker": str(i)},
+            headers={"X-Worker": str(i)},
+            expected_status=200,
+        )
+        for i in range(20)
+    ]
+    result = client.batch(specs, max_workers=10).raise_for_failures()
+
+    for i, resp in enumerate(result.responses):
+        assert resp.request.headers["Cookie"] == f"shared=1; worker={i}", resp.request.headers["Cookie"]
+        assert resp.request.headers["X-Worker"] == str(i)
+    assert dict(client.session.cookies) == {"shared": "1"}
+    assert "X-Worker" not in client.session.headers
@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import allure
+
+ROOT = Path(__file__).resolve().parent.parent
+# generous for slow CI machines; the lean path takes ~0.1s locally
+BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "0.5"))
+# must not be loaded by the core client: reporting, settings and async/storage stacks are lazy
+HEAVY_MODULES = ("allure", "allure_commons", "dotenv", "asyncio", "httpx", "sqlite3", "pytest")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from src.api.gists import GistsAPI
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True, timeout=60
+    ).stdout
+    return json.loads(out)
+
+
+@allure.title("`from src.api.gists import GistsAPI` stays lean and within its startup budget")
+def test_core_import_budget():
+    runs = [_probe() for _ in range(3)]
+    with allure.step("No reporting, settings or async stacks on the core import path"):
+        loaded = set(runs[0]["modules"])
+        assert not loaded & set(HEAVY_MODULES), f"Core import loads {sorted(loaded & set(HEAVY_MODULES))}"
+    with allure.step(f"Best of 3 imports under {BUDGET_SECONDS}s"):
+        best = min(run["elapsed"] for run in runs)
+        allure.attach(json.dumps([run["elapsed"] for run in runs]), name="import seconds")
+        assert best < BUDGET_SECONDS, f"Importing GistsAPI took {best:.3f}s, budget {BUDGET_SECONDS}s"
@@ -0,0 +1,80 @@
+import io
+import json
+import tracemalloc
+
+import allure
+import pytest
+import requests
+
+from src.api.gists import GistsAPI
+from src.api.pagination import page_items
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+from src.utils.json_stream import iter_json_array
+
+FIELDS = ("id", "updated_at", "files")
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@allure.title("Incremental decoder yields the same items for any chunking and rejects bad input")
+def test_iter_json_array_chunking():
+    items = [{"id": "ä€😀", "n": 12.5e3, "ok": True, "files": {"a": [1, None]}}, 42, "x,]", [], -7]
+    data = json.dumps(items, ensure_ascii=False).encode()
+
+    with allure.step("Elements, numbers and multi-byte characters split across chunks"):
+        for size in (1, 2, 3, 7, len(data)):
+            assert list(iter_json_array(_chunks(data, size))) == items, f"chunk size {size}"
+        assert list(iter_json_array([b" [ ] "])) == []
+
+    with allure.step("Projection keeps only the requested keys"):
+        assert next(iter_json_array([data], fields=("id", "missing"))) == {"id": "ä€😀"}
+
+    with allure.step("Truncated, non-array and trailing data raise ValueError"):
+        for bad in (data[:-1], b'{"a": 1}', data + b"[]", b"[1 2]"):
+            with pytest.raises(ValueError):
+                list(iter_json_array(_chunks(bad, 4)))
+
+
+@allure.title("Streamed list pages match buffered ones and release their connections")
+def test_streamed_pagination():
+    with FakeGistsServer(FakeServerOptions(seed_public=120)) as server:
+        api = GistsAPI(HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer t"}))
+
+        with allure.step("Streaming, with and without prefetch, yields the projected buffered items"):
+            buffered = list(api.iter_public_gists(per_page=100, fields=FIELDS))
+            assert len(buffered) == 120 and all(set(item) == set(FIELDS) for item in buffered)
+            assert list(api.iter_public_gists(per_page=100, stream=True, fields=FIELDS)) == buffered
+            assert list(api.iter_public_gists(per_page=30, stream=True, prefetch=True, fields=FIELDS)) == buffered
+
+        with allure.step("Abandoning a streamed iterator releases its connection"):
+            items = api.iter_public_gists(per_page=100, stream=True, prefetch=True)
+            next(items)
+            items.close()
+            assert next(api.iter_public_gists(per_page=1, stream=True))["id"] == buffered[0]["id"]
+
+
+@allure.title("Streaming a page keeps peak memory well below buffering it")
+def test_streamed_page_peak_memory():
+    page = [
+        {"id": f"{n:032x}", "updated_at": "2024-01-01T00:00:00Z", "description": "d" * 2000, "files": {"a.txt": {}}}
+        for n in range(500)
+    ]
+    body = json.dumps(page).encode()
+
+    def peak(stream: bool) -> int:
+        resp = requests.Response()
+        resp.status_code, resp.raw = 200, io.BytesIO(body)
+        tracemalloc.start()
+        try:
+            for _ in page_items(resp, stream=stream, fields=("id",)):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    peaks = {"buffered": peak(False), "streamed": peak(True)}
+    allure.attach(json.dumps(peaks), name="peak bytes")
+    assert peaks["streamed"] * 4 < peaks["buffered"], peaks
@@ -0,0 +1,30 @@
+import allure
+
+from src.api.gists import GistsAPI
+from src.http_client import HttpClient
+from src.loadgen import SCENARIOS, LoadProfile, run_load
+
+
+@allure.title("Load profile schedules the expected number of arrivals")
+def test_load_profile_arrivals():
+    profile = LoadProfile(rps=100, ramp_up=2, hold=3, ramp_down=2)
+    offsets = list(profile.arrivals())
+    assert len(offsets) == 500, f"Expected 500 arrivals, got {len(offsets)}"
+    assert offsets == sorted(offsets), "Arrivals must be scheduled in order"
+    assert 0 <= offsets[0] and offsets[-1] <= profile.duration, f"Arrivals outside [0, {profile.duration}]"
+
+
+@allure.title("Load run against the fake server reports per-endpoint latency")
+def test_run_load_against_fake_server(fake_server):
+    def api_factory() -> GistsAPI:
+        client = HttpClient(base_url=fake_server.base_url, default_headers={"Authorization": "Bearer load"})
+        return GistsAPI(client)
+
+    report = run_load(api_factory, SCENARIOS, {"crud": 1, "list_public": 1}, LoadProfile(rps=20, hold=1), seed=1)
+
+    assert report["totals"]["iterations"] == 20, report["totals"]
+    assert report["totals"]["errors"] == 0, report["endpoints"]
+    for endpoint in ("create_gist", "get_gist", "update_gist", "delete_gist", "list_public_gists"):
+        stats = report["endpoints"].get(endpoint)
+        assert stats and stats["count"] > 0, f"No calls recorded for {endpoint}"
+        assert stats["corrected_latency"]["p99"] >= stats["latency"]["p50"] > 0, stats
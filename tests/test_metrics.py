@@ -0,0 +1,79 @@
+import time
+
+import allure
+
+from src.api.gists import GistsAPI
+from src.http_client import HttpClient
+from src.metrics import RequestMetrics, url_template
+
+
+@allure.title("Request hooks receive per-phase timings grouped by URL template")
+def test_request_metrics_phases(fake_server):
+    metrics = RequestMetrics()
+    client = HttpClient(
+        base_url=fake_server.base_url,
+        default_headers={"Authorization": "Bearer fake-token"},
+        hooks=[metrics],
+    )
+    api = GistsAPI(client)
+
+    with allure.step("Create, read twice and delete a gist"):
+        gist = api.create_gist({"files": {"m.txt": {"content": "metrics"}}}).json()
+        api.get_gist(gist["id"])
+        api.get_gist(gist["id"])
+        api.delete_gist(gist["id"])
+
+    with allure.step("Concrete gist ids collapse into one endpoint"):
+        data = metrics.to_dict()
+        assert set(data) >= {"POST /gists", "GET /gists/{id}", "DELETE /gists/{id}"}, f"Unexpected endpoints: {list(data)}"
+        get = data["GET /gists/{id}"]
+        assert get["statuses"] == {"200": 2}, f"Unexpected statuses: {get['statuses']}"
+        assert get["phases"]["total"]["count"] == 2
+        assert get["phases"]["ttfb"]["count"] == 2, "TTFB should be measured for every response"
+        assert data["POST /gists"]["phases"]["connect"]["count"] == 1, "Only the first request opens a connection"
+
+    with allure.step("Prometheus exposition contains histogram buckets and counters"):
+        text = metrics.to_prometheus()
+        assert 'http_client_request_phase_seconds_bucket{method="GET",endpoint="/gists/{id}",phase="total",le="+Inf"} 2' in text
+        assert 'http_client_requests_total{method="DELETE",endpoint="/gists/{id}",status="204"} 1' in text
+
+
+@allure.title("URL templates cover gist sub-resources and revisions")
+def test_url_templates():
+    sha = "a" * 40
+    assert url_template("https://api.github.com/gists/abc123/star") == "/gists/{id}/star"
+    assert url_template(f"https://api.github.com/gists/abc123/{sha}") == "/gists/{id}/{sha}"
+    assert url_template("https://api.github.com/gists/public?per_page=10") == "/gists/public"
+    assert url_template("https://api.github.com/users/octocat/gists") == "/users/{username}/gists"
+
+
+@allure.title("Streamed bodies are timed until the response is closed; pool waits count as queue_wait")
+def test_request_metrics_stream_and_pool_wait(fake_server):
+    timings = []
+    client = HttpClient(
+        base_url=fake_server.base_url,
+        default_headers={"Authorization": "Bearer fake-token"},
+        hooks=[timings.append],
+        pool_maxsize=1,
+        pool_block=True,
+    )
+
+    with allure.step("A stream=True response is reported once, when closed, with the time spent reading it"):
+        resp = client.get("/gists/public", stream=True, expected_status=200)
+        assert timings == []
+        for _ in resp.iter_content(chunk_size=4096):
+            time.sleep(0.02)
+        resp.close()
+        resp.close()
+        (streamed,) = timings
+        assert streamed.download >= 0.02 and streamed.total >= streamed.download, streamed
+
+    with allure.step("With one blocking pooled connection the second of two concurrent requests waits for it"):
+        timings.clear()
+        fake_server.options.latency = 0.2
+        try:
+            client.map("GET", ["/gists/public", "/gists/public"], max_workers=2, expected_status=200).raise_for_failures()
+        finally:
+            fake_server.options.latency = 0.0
+        waits = sorted(t.queue_wait for t in timings)
+        assert waits[0] < 0.05 and waits[1] >= 0.15, waits
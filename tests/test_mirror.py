@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+import allure
+
+from src.api.gists import GistsAPI
+from src.fake_server import FakeGistsServer, FakeServerOptions, GistStore
+from src.http_client import HttpClient
+from src.mirror import GistMirror
+
+
+def _ticking_clock():
+    """Store clock advancing one second per write, so every gist gets its own `updated_at`."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ticks = count()
+    return lambda: (start + timedelta(seconds=next(ticks))).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@allure.title("Mirror syncs incrementally from the high-water mark and answers local queries")
+def test_incremental_mirror(tmp_path):
+    with FakeGistsServer(FakeServerOptions(seed_public=0), store=GistStore(clock=_ticking_clock())) as server:
+        api = GistsAPI(HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer mirror"}))
+        ids = [
+            api.create_gist({"description": f"mirror {i}", "files": {f"f{i}.py": {"content": f"print({i})"}}}).json()["id"]
+            for i in range(25)
+        ]
+
+        with GistMirror(api, tmp_path / "gists.db", max_workers=4, per_page=10) as mirror:
+            with allure.step("First sync downloads every gist body"):
+                first = mirror.sync()
+                assert (first.listed, first.fetched, first.failed) == (25, 25, {}), first
+                assert first.high_water is not None and mirror.count() == 25
+
+            with allure.step("Next sync lists only gists at or after the high-water mark"):
+                api.update_gist(ids[3], {"files": {"f3.py": {"content": "print('changed')"}}})
+                second = mirror.sync()
+                assert second.since == first.high_water
+                # the last created gist (stamped with the high-water mark) and the updated one
+                assert (second.listed, second.fetched, second.unchanged) == (2, 1, 1), second
+                assert second.high_water > first.high_water
+                assert mirror.get(ids[3]).files["f3.py"].content == "print('changed')"
+
+            with allure.step("Full sync prunes deleted gists"):
+                api.delete_gist(ids[0])
+                full = mirror.sync(full=True)
+                assert full.pruned == 1 and mirror.get(ids[0]) is None
+
+            with allure.step("Local queries use the stored metadata and files"):
+                assert len(mirror.query(owner="fake-user")) == 24
+                assert len(mirror.query(description_like="mirror 1%")) == 11
+                assert ids[3] in [g.id for g in mirror.query(updated_since=second.high_water)]
+                assert len(mirror.query(language="Text", limit=5)) == 5
+
+
+@allure.title("Mirrors of different scopes share a database without pruning each other")
+def test_mirror_scopes_share_database(tmp_path):
+    with FakeGistsServer(FakeServerOptions(seed_public=3)) as server:
+        api = GistsAPI(HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer mirror"}))
+        own = api.create_gist({"files": {"own.txt": {"content": "mine"}}}).json()["id"]
+        path = tmp_path / "gists.db"
+
+        with GistMirror(api, path, username="octocat") as octocat, GistMirror(api, path) as authenticated:
+            assert octocat.sync().fetched == 3 and authenticated.sync().fetched == 1
+            with allure.step("A full sync prunes only gists of its own scope"):
+                assert authenticated.sync(full=True).pruned == 0 and octocat.sync(full=True).pruned == 0
+                api.delete_gist(own)
+                assert authenticated.sync(full=True).pruned == 1
+                assert (octocat.count(), authenticated.count()) == (3, 0)
+                assert len(octocat.query(owner="octocat")) == 3 and authenticated.get(own) is None
@@ -0,0 +1,47 @@
+import allure
+
+from src.api.gists import GistsAPI
+from src.api.models import Gist
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+from src.utils import json_codec
+
+
+@allure.title("Typed API returns slotted models with lazily loaded file content")
+def test_typed_models_lazy_content():
+    with FakeGistsServer(FakeServerOptions(seed_public=3, inline_limit=16)) as server:
+        api = GistsAPI(HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer models"}))
+        content = "x" * 100
+
+        with allure.step("Created gist: truncated inline content is completed from raw_url on access"):
+            gist = api.typed.create_gist({"description": "typed", "files": {"big.txt": {"content": content}}})
+            assert isinstance(gist, Gist) and not hasattr(gist, "__dict__"), "Models should be slotted"
+            file = gist.files["big.txt"]
+            assert file.truncated and not file.content_loaded
+            assert file.content == content and file.content_loaded
+
+        with allure.step("Listed gists carry no content until it is requested"):
+            listed = api.typed.list_gists_for_authenticated_user()
+            item = next(g for g in listed if g.id == gist.id)
+            assert item.owner == "fake-user" and item.files["big.txt"].size == 100
+            assert not item.files["big.txt"].content_loaded
+            assert item.files["big.txt"].content == content
+
+        with allure.step("Commits map to their model"):
+            api.update_gist(gist.id, {"files": {"big.txt": {"content": "v2"}}})
+            commits = api.typed.list_gist_commits(gist.id)
+            assert [c.user for c in commits] == ["fake-user", "fake-user"]
+            assert len({c.version for c in commits}) == 2
+
+
+@allure.title("Responses decode their JSON body once, with either backend")
+def test_parse_once(fake_gists_api):
+    previous = json_codec.backend()
+    for backend in json_codec.BACKENDS:
+        json_codec.set_backend(backend)
+        try:
+            resp = fake_gists_api.list_public_gists(per_page=5)
+            assert resp.json() is resp.json(), f"{backend}: body was decoded twice"
+            assert len(resp.json()) == 5
+        finally:
+            json_codec.set_backend(previous)
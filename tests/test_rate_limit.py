@@ -0,0 +1,124 @@
+import time
+from email.utils import formatdate
+
+import allure
+import pytest
+
+from src.api.gists import GistsAPI
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+from src.rate_limit import CORE, SECONDARY, RateLimitScheduler, parse_retry_after
+
+
+def _limit_headers(remaining: int, reset_in: int) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time()) + reset_in),
+    }
+
+
+@allure.title("Core pacing spreads X-RateLimit-Remaining until X-RateLimit-Reset")
+def test_core_pacing_follows_headers():
+    scheduler = RateLimitScheduler(burst=1)
+    assert scheduler.acquire("GET") == 0 and scheduler.acquire("GET") == 0, "No pacing before any headers"
+
+    with allure.step("50 requests left for ~10s: one every ~0.2s after the burst"):
+        scheduler.update("GET", 200, _limit_headers(50, reset_in=11))
+        budget = scheduler.budgets()[CORE]
+        assert (budget.remaining, budget.limit) == (50, 5000)
+        assert 50 / 11 <= budget.rate <= 50 / 10, budget
+        scheduler.acquire("GET")
+        assert 0.15 < scheduler.acquire("GET") <= 0.25
+
+    with allure.step("An exhausted budget blocks core requests until the reset"):
+        headers = _limit_headers(0, reset_in=30)
+        scheduler.update("GET", 200, headers)
+        budget = scheduler.budgets()[CORE]
+        assert budget.rate == 0
+        assert budget.blocked_until == pytest.approx(int(headers["X-RateLimit-Reset"]), abs=1)
+
+
+@allure.title("Once the budget is exhausted acquire() sleeps until X-RateLimit-Reset, then sends again")
+def test_exhausted_budget_waits_for_reset():
+    with allure.step("Remaining 0 blocks the core bucket until the reset"):
+        scheduler = RateLimitScheduler(burst=2)
+        headers = _limit_headers(0, reset_in=1)
+        reset = int(headers["X-RateLimit-Reset"])
+        started = time.time()
+        scheduler.update("GET", 200, headers)
+        assert scheduler.acquire("GET") == pytest.approx(reset - started, abs=0.05)
+        assert time.time() >= reset - 0.01
+        assert scheduler.acquire("GET") == 0 and scheduler.acquire("POST") == 0
+
+    with allure.step("HttpClient against a fake server with 3 requests per second"):
+        options = FakeServerOptions(seed_public=1, rate_limit=3, rate_limit_window=1)
+        with FakeGistsServer(options) as server:
+            client = HttpClient(
+                base_url=server.base_url,
+                default_headers={"Authorization": "Bearer limits"},
+                retries_total=0,
+                rate_limiter=RateLimitScheduler(burst=2),
+            )
+            api = GistsAPI(client)
+            for _ in range(3):
+                resp = api.list_public_gists()
+            assert resp.headers["X-RateLimit-Remaining"] == "0"
+            reset = int(resp.headers["X-RateLimit-Reset"])
+            for _ in range(3):
+                assert api.list_public_gists().status_code == 200
+            assert time.time() >= reset - 0.01
+
+
+@allure.title("Mutating methods also draw from the secondary bucket")
+def test_mutating_methods_use_secondary_bucket():
+    scheduler = RateLimitScheduler(secondary_per_minute=600, secondary_burst=1)
+    for method in ("POST", "PATCH", "PUT", "DELETE"):
+        assert RateLimitScheduler.buckets_for(method) == (CORE, SECONDARY)
+    assert RateLimitScheduler.buckets_for("GET") == (CORE,)
+
+    assert scheduler.acquire("POST") == 0
+    assert scheduler.acquire("GET") == 0, "Reads are not paced by the secondary bucket"
+    assert 0.05 < scheduler.acquire("delete") <= 0.1
+
+
+@allure.title("403/429 with Retry-After blocks later acquires of the throttled bucket")
+def test_retry_after_blocks_bucket():
+    scheduler = RateLimitScheduler()
+
+    with allure.step("A throttled write pauses writes only"):
+        scheduler.update("POST", 403, {"Retry-After": "30"})
+        budgets = scheduler.budgets()
+        assert budgets[SECONDARY].blocked_until == pytest.approx(time.time() + 30, abs=1)
+        assert budgets[CORE].blocked_until is None
+
+    with allure.step("A throttled read pauses the core bucket, which every request draws from"):
+        scheduler.update("GET", 429, {"Retry-After": "0.2"})
+        assert 0.1 < scheduler.acquire("GET") <= 0.2
+        assert scheduler.acquire("GET") == 0
+
+    with allure.step("Retry-After without a throttling status is ignored; HTTP dates are accepted"):
+        scheduler.update("GET", 200, {"Retry-After": "30"})
+        assert scheduler.budgets()[CORE].blocked_until is None
+        assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+
+
+@allure.title("Client feeds the fake server's rate-limit headers and secondary throttling into the scheduler")
+def test_scheduler_with_fake_server():
+    options = FakeServerOptions(seed_public=1, rate_limit=50, secondary_rate_limit=1)
+    with FakeGistsServer(options) as server:
+        scheduler = RateLimitScheduler()
+        client = HttpClient(
+            base_url=server.base_url,
+            default_headers={"Authorization": "Bearer limits"},
+            retries_total=0,
+            rate_limiter=scheduler,
+        )
+        api = GistsAPI(client)
+        resp = api.list_public_gists()
+        assert scheduler.budgets()[CORE].remaining == int(resp.headers["X-RateLimit-Remaining"])
+
+        api.create_gist({"files": {"a.txt": {"content": "1"}}})
+        resp = api.create_gist({"files": {"b.txt": {"content": "2"}}}, expected_status=403)
+        retry_after = int(resp.headers["Retry-After"])
+        assert scheduler.budgets()[SECONDARY].blocked_until == pytest.approx(time.time() + retry_after, abs=1)
@@ -0,0 +1,64 @@
+import allure
+
+from src.api.gists import GistsAPI
+from src.http_client import HttpClient
+from src.reporting import AllureReporter, AttachmentPolicy
+
+
+def _client(fake_server, reporter: AllureReporter) -> GistsAPI:
+    client = HttpClient(
+        base_url=fake_server.base_url,
+        default_headers={"Authorization": "Bearer fake-token"},
+        reporter=reporter,
+    )
+    return GistsAPI(client)
+
+
+@allure.title("Per-endpoint policies: off, sampled and on_failure captures")
+def test_attachment_policies(fake_server, monkeypatch):
+    attached = []
+    monkeypatch.setattr(AllureReporter, "_attach", staticmethod(lambda texts, capture: attached.append(texts)))
+    reporter = AllureReporter(
+        default=AttachmentPolicy(mode="on_failure"),
+        endpoints={"GET /gists/public": AttachmentPolicy(mode="off")},
+    )
+    api = _client(fake_server, reporter)
+
+    with allure.step("Disabled endpoint captures nothing, even in bulk"):
+        for _ in range(5):
+            api.list_public_gists(per_page=100)
+        assert reporter.pending_count() == 0 and not attached
+
+    with allure.step("on_failure captures are dropped for passing tests and attached for failing ones"):
+        gist_id = api.list_public_gists(per_page=1).json()[0]["id"]
+        api.get_gist(gist_id)
+        reporter.flush(failed=False)
+        assert not attached
+        api.get_gist(gist_id)
+        reporter.flush(failed=True)
+        assert len(attached) == 1 and f"GET {fake_server.base_url}/gists/{gist_id}" in attached[0][0]
+
+    with allure.step("An unexpected status is attached immediately, whatever the policy"):
+        api.get_gist("0000unknown", expected_status=None)
+        assert not attached[1:]
+        try:
+            api.get_gist("0000unknown")
+        except AssertionError:
+            pass
+        assert len(attached) == 2 and attached[1][1].startswith("Status: 404")
+
+
+@allure.title("Deferred attachments are truncated to the size cap")
+def test_deferred_attachments_truncated(fake_server, monkeypatch):
+    attached = []
+    monkeypatch.setattr(AllureReporter, "_attach", staticmethod(lambda texts, capture: attached.append(texts)))
+    reporter = AllureReporter(default=AttachmentPolicy(mode="deferred", max_body_bytes=512))
+    api = _client(fake_server, reporter)
+
+    api.list_public_gists(per_page=30)
+    assert reporter.pending_count() == 1 and not attached
+    reporter.flush(failed=False)
+
+    response_text = attached[0][1]
+    assert "[truncated," in response_text, response_text[-200:]
+    assert len(response_text) < 2048
@@ -0,0 +1,117 @@
+import time
+
+import allure
+import pytest
+
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+from src.metrics import RequestMetrics
+from src.rate_limit import RateLimitScheduler
+from src.retry import CircuitBreakers, CircuitOpenError, RetryBudget, retry_delay
+
+
+def _client(server: FakeGistsServer, metrics: RequestMetrics, **kw) -> HttpClient:
+    return HttpClient(
+        base_url=server.base_url,
+        default_headers={"Authorization": "Bearer retry"},
+        backoff_factor=0,
+        hooks=[metrics],
+        **kw,
+    )
+
+
+@allure.title("Writes are retried only when the server cannot have processed them")
+def test_retry_only_safe_requests():
+    metrics = RequestMetrics()
+    options = FakeServerOptions(seed_public=1, error_rate=1.0, error_status=503)
+    with FakeGistsServer(options) as server:
+        client = _client(server, metrics, circuit_breakers=CircuitBreakers(failure_threshold=100))
+        with allure.step("GET is retried on 503, POST is not"):
+            client.get("/gists/public", expected_status=503)
+            client.post("/gists", json={"files": {"a.txt": {"content": "a"}}}, expected_status=503)
+            stats = metrics.to_dict()
+            assert stats["GET /gists/public"]["retries"] == 3
+            assert stats["POST /gists"]["retries"] == 0
+
+        with allure.step("429 is retried for POST too"):
+            server.options.error_status = 429
+            client.post("/gists", json={"files": {"a.txt": {"content": "a"}}}, expected_status=429)
+            assert metrics.to_dict()["POST /gists"]["retries"] == 3
+
+
+@allure.title("Retry budget caps retries to a fraction of the traffic")
+def test_retry_budget():
+    metrics = RequestMetrics()
+    budget = RetryBudget(ratio=0.1, min_retries=2)
+    with FakeGistsServer(FakeServerOptions(seed_public=1, error_rate=1.0)) as server:
+        client = _client(server, metrics, retry_budget=budget, circuit_breakers=CircuitBreakers(failure_threshold=100))
+        for _ in range(5):
+            client.get("/gists/public", expected_status=503)
+    assert metrics.to_dict()["GET /gists/public"]["retries"] == 2
+    assert budget.stats()["retries"] == 2 and budget.stats()["exhausted"] == 5
+
+
+@allure.title("Circuit breaker fails fast per endpoint and recovers through a half-open probe")
+def test_circuit_breaker():
+    metrics = RequestMetrics()
+    breakers = CircuitBreakers(failure_threshold=3, recovery_time=0.3)
+    with FakeGistsServer(FakeServerOptions(seed_public=1, error_rate=1.0)) as server:
+        client = _client(server, metrics, retries_total=0, circuit_breakers=breakers)
+        for _ in range(3):
+            client.get("/gists/public", expected_status=503)
+        with allure.step("Open circuit rejects without a request"):
+            with pytest.raises(CircuitOpenError):
+                client.get("/gists/public")
+            assert breakers.states() == {"/gists/public": "open"}
+            assert metrics.to_dict()["GET /gists/public"]["circuit"] == "open"
+            assert 'http_client_circuit_state{method="GET",endpoint="/gists/public",state="open"} 1' in metrics.to_prometheus()
+            client.get("/gists/unknown-id", expected_status=503)  # other endpoints are unaffected
+
+        with allure.step("After the recovery time one probe closes the circuit again"):
+            server.options.error_rate = 0
+            time.sleep(0.35)
+            assert breakers.states()["/gists/public"] == "half_open"
+            client.get("/gists/public", expected_status=200)
+            assert breakers.states()["/gists/public"] == "closed"
+
+        with allure.step("reset() closes every circuit at once"):
+            server.options.error_rate = 1.0
+            for _ in range(3):
+                client.get("/gists/public", expected_status=503)
+            breakers.reset()
+            assert breakers.states() == {}
+            client.get("/gists/public", expected_status=503)
+
+
+@allure.title("A rate limiter failing while the circuit is half-open does not use up the probe")
+def test_circuit_probe_survives_rate_limiter_error():
+    class FailingOnce(RateLimitScheduler):
+        failed = False
+
+        def acquire(self, method: str) -> float:
+            if not self.failed:
+                self.failed = True
+                raise RuntimeError("rate limiter failed")
+            return super().acquire(method)
+
+    breakers = CircuitBreakers(failure_threshold=1, recovery_time=0.05)
+    with FakeGistsServer(FakeServerOptions(seed_public=1, error_rate=1.0)) as server:
+        client = _client(server, RequestMetrics(), retries_total=0, circuit_breakers=breakers)
+        client.get("/gists/public", expected_status=503)
+        server.options.error_rate = 0
+        time.sleep(0.1)
+        assert breakers.states()["/gists/public"] == "half_open"
+
+        client.rate_limiter = FailingOnce()
+        with pytest.raises(RuntimeError):
+            client.get("/gists/public")
+        client.get("/gists/public", expected_status=200)
+        assert breakers.states()["/gists/public"] == "closed"
+
+
+@allure.title("Retry delay honors Retry-After and the rate-limit reset")
+def test_retry_delay():
+    assert retry_delay({"Retry-After": "7"}) == 7
+    reset = retry_delay({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 30)})
+    assert 28 <= reset <= 30
+    assert retry_delay({"X-RateLimit-Remaining": "12", "X-RateLimit-Reset": "0"}) is None
@@ -0,0 +1,52 @@
+import allure
+
+from src.api.gists import GistsAPI
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient
+from src.metrics import RequestMetrics
+from src.revisions import ContentAddressedStore, RevisionCache
+
+
+@allure.title("Revision cache fetches each SHA once and walks history incrementally")
+def test_revision_cache(tmp_path):
+    with FakeGistsServer(FakeServerOptions(seed_public=0)) as server:
+        metrics = RequestMetrics()
+        client = HttpClient(base_url=server.base_url, default_headers={"Authorization": "Bearer rev"}, hooks=[metrics])
+        api = GistsAPI(client)
+        gist_id = api.create_gist({"files": {"a.txt": {"content": "v0\n"}}}).json()["id"]
+        for i in range(1, 5):
+            api.update_gist(gist_id, {"files": {"a.txt": {"content": f"v{i}\n"}}})
+
+        def requests_to(endpoint):
+            return sum(v["phases"]["total"]["count"] for k, v in metrics.to_dict().items() if k == f"GET {endpoint}")
+
+        cache = RevisionCache(api, tmp_path, max_workers=4, per_page=2)
+        with allure.step("First walk downloads every page and revision"):
+            revisions = list(cache.revisions(gist_id))
+            assert [r.files["a.txt"].content for r in revisions] == [f"v{i}\n" for i in range(4, -1, -1)]
+            assert requests_to("/gists/{id}/{sha}") == 5
+            assert requests_to("/gists/{id}/commits") == 3, "Expected 3 pages of 2 commits"
+
+        with allure.step("A new commit costs one history page and one revision"):
+            api.update_gist(gist_id, {"files": {"a.txt": {"content": "v5\n"}}})
+            history = RevisionCache(api, tmp_path, per_page=2).history(gist_id)
+            assert len(history) == 6 and requests_to("/gists/{id}/commits") == 4
+            list(cache.revisions(gist_id))
+            assert requests_to("/gists/{id}/{sha}") == 6
+
+        with allure.step("Diff of two cached revisions needs no network"):
+            diff = cache.diff(gist_id, history[1].version, history[0].version)
+            assert "-v4" in diff and "+v5" in diff
+            assert requests_to("/gists/{id}/{sha}") == 6
+
+
+@allure.title("Content-addressed store evicts least recently used blobs by size")
+def test_content_addressed_store_eviction(tmp_path):
+    store = ContentAddressedStore(tmp_path, max_bytes=3000)
+    for i in range(3):
+        store.put(f"{i:040x}", b"x" * 1000)
+    assert store.get(f"{0:040x}") is not None  # refresh the oldest blob
+    store.put(f"{3:040x}", b"x" * 1000)
+    assert store.total_bytes <= 3000
+    assert f"{0:040x}" in store and f"{1:040x}" not in store
+    assert ContentAddressedStore(tmp_path, max_bytes=3000).total_bytes == store.total_bytes
@@ -0,0 +1,49 @@
+import asyncio
+
+import allure
+
+from src.async_http_client import AsyncHttpClient
+from src.fake_server import FakeGistsServer, FakeServerOptions
+from src.http_client import HttpClient, RequestSpec
+from src.metrics import RequestMetrics
+
+
+@allure.title("Identical concurrent GETs share one request, in threads and in asyncio")
+def test_single_flight_coalescing():
+    metrics = RequestMetrics()
+    with FakeGistsServer(FakeServerOptions(seed_public=3, latency=0.4)) as server:
+        client = HttpClient(
+            base_url=server.base_url,
+            default_headers={"Authorization": "Bearer one"},
+            hooks=[metrics],
+            coalesce_gets=True,
+        )
+
+        with allure.step("Eight threads fetching the same page send one request"):
+            result = client.map("GET", ["/gists/public?per_page=2"] * 8, max_workers=8).raise_for_failures()
+            assert all(resp.json() == result.responses[0].json() for resp in result.responses)
+            assert metrics.to_dict()["GET /gists/public"]["statuses"] == {"200": 1}
+            assert client.single_flight.coalesced == 7
+
+        with allure.step("Different params or credentials are separate flights"):
+            result = client.batch(
+                [
+                    RequestSpec(method="GET", url="/gists/public?per_page=2"),
+                    RequestSpec(method="GET", url="/gists/public?per_page=2", headers={"Authorization": "Bearer two"}),
+                    RequestSpec(method="GET", url="/gists/public?per_page=1"),
+                ]
+            ).raise_for_failures()
+            assert [len(resp.json()) for resp in result.responses] == [2, 2, 1]
+            assert metrics.to_dict()["GET /gists/public"]["statuses"] == {"200": 4}
+
+        with allure.step("asyncio.gather of identical GETs sends one request"):
+
+            async def fetch_all():
+                async with AsyncHttpClient(
+                    base_url=server.base_url, default_headers={"Authorization": "Bearer one"}, coalesce_gets=True
+                ) as aclient:
+                    responses = await asyncio.gather(*(aclient.get("/gists/public", expected_status=200) for _ in range(8)))
+                    return aclient.single_flight, responses
+
+            flight, responses = asyncio.run(fetch_all())
+            assert flight.coalesced == 7 and len({id(resp) for resp in responses}) == 1
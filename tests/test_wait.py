@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import allure
+import pytest
+
+from src.utils.wait import BatchWaiter, async_wait_until_condition_reached, wait_until_condition_reached
+
+
+@allure.title("Wait does not overshoot its deadline by a poll interval")
+def test_wait_caps_final_sleep_at_deadline():
+    started = time.monotonic()
+    with pytest.raises(AssertionError, match="not met within 0.3 seconds"):
+        wait_until_condition_reached("never true", lambda: False, timeout=0.3, poll_interval=5)
+    elapsed = time.monotonic() - started
+    assert elapsed < 1, f"Wait overshot the 0.3s deadline: {elapsed:.2f}s"
+
+
+@allure.title("Wait backs off exponentially between polls")
+def test_wait_backoff():
+    polls = []
+
+    def condition():
+        polls.append(time.monotonic())
+        return len(polls) == 4
+
+    wait_until_condition_reached("fourth poll", condition, timeout=5, poll_interval=0.05, backoff=2)
+    gaps = [b - a for a, b in zip(polls, polls[1:])]
+    assert gaps[0] < gaps[1] < gaps[2], f"Expected growing poll gaps, got {gaps}"
+
+
+@allure.title("Async waits run concurrently on one event loop")
+def test_async_wait_many_concurrent():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        ready_at = loop.time() + 0.2
+
+        async def condition():
+            return loop.time() >= ready_at
+
+        return await asyncio.gather(
+            *(
+                async_wait_until_condition_reached(f"waiter {i}", condition, timeout=2, poll_interval=0.05, jitter=0.5)
+                for i in range(200)
+            )
+        )
+
+    started = time.monotonic()
+    results = asyncio.run(scenario())
+    assert all(results), "Every waiter should observe the condition"
+    assert time.monotonic() - started < 1.5, "200 async waits should not be serialized"
+
+
+@allure.title("Batch waiter resolves many conditions from one shared poll")
+def test_batch_waiter_shares_polls():
+    fetches = []
+    started = time.monotonic()
+
+    def fetch():
+        fetches.append(time.monotonic())
+        return time.monotonic() - started
+
+    with BatchWaiter(poll_interval=0.05) as waiter:
+        futures = [
+            waiter.register("clock", fetch, lambda elapsed, i=i: elapsed >= i * 0.02, timeout=2)
+            for i in range(20)
+        ]
+        never = waiter.register("clock", fetch, lambda elapsed: False, timeout=0.3, condition_summary="never")
+        results = [f.result(timeout=5) for f in futures]
+        with pytest.raises(AssertionError, match="Condition: never"):
+            never.result(timeout=5)
+
+    assert all(results), "Every condition should resolve"
+    assert len(fetches) < 20, f"Expected shared polls, got {len(fetches)} fetches for 21 conditions"